@@ -1,14 +1,21 @@
 import logging
 import math
+import os
 from abc import ABC, abstractmethod
-from datetime import datetime
-from typing import Type, List, Tuple, Any, Optional, Set, ClassVar, TypedDict
+from datetime import datetime, timedelta
+from typing import Type, List, Tuple, Any, Optional, Set, ClassVar, TypedDict, AsyncIterator
 
 from fastapi import status
 from fastapi.requests import Request
 from pydantic import BaseModel
 
 from app.http_response_exception import HTTPResponseException
+from app.models.pagination import TotalRecordsMode
+from app.models.search import SearchMode
+
+MAXIMUM_RECORDS_PER_PAGE: int = int(os.getenv("MAXIMUM_RECORDS_PER_PAGE", "100"))
+TOMBSTONE_RETENTION: timedelta = timedelta(days=30)
+CHANGES_SETTLING_TIME: timedelta = timedelta(seconds=5)
 
 
 class Data(TypedDict):
@@ -20,12 +27,15 @@ class Links(TypedDict):
     last_page: str
     previous_page: str
     next_page: str
+    previous_cursor: str
+    next_cursor: str
 
 
 class Meta(TypedDict):
-    current_page: int
-    last_page: int
-    total_records: int
+    current_page: Optional[int]
+    last_page: Optional[int]
+    total_records: Optional[int]
+    total_records_exact: bool
     records_per_page: int
     url: str
 
@@ -39,6 +49,19 @@ class DataList(Pagination):
     data: List[dict]
 
 
+class ChangeList(TypedDict):
+    data: List[dict]
+    deleted: List[str]
+    next_token: str
+    has_more: bool
+
+
+class BatchItem(TypedDict):
+    status_code: int
+    data: Optional[dict]
+    error: Optional[dict]
+
+
 class AbstractDatabase(ABC):
     """This class is an abstract class for all database management systems.
     """
@@ -119,31 +142,74 @@ class AbstractDatabase(ABC):
         return dict(filter(lambda items: items[1] is not None, raw_data.items()))
 
     @classmethod
-    async def _get_pagination(cls, request: Request, page: int, records_per_page: int,
-                              total_records: int) -> Pagination:
+    async def _get_pagination(cls, request: Request, page: Optional[int], records_per_page: int,
+                              total_records: Optional[int], total_records_exact: bool = True,
+                              has_next_page: Optional[bool] = None, previous_cursor: Optional[str] = None,
+                              next_cursor: Optional[str] = None) -> Pagination:
         """Get pagination.
 
+        A None page means the documents/records were listed in cursor mode, so only the first page link and
+        the cursor links are available. A None total records means the total records was not counted,
+        so the last page is unknown.
+
         :param request: HTTP request
         :param page: Page number
         :param records_per_page: Records per page
         :param total_records: Total records
+        :param total_records_exact: Whether the total records is exact
+        :param has_next_page: Whether there is a next page ( Default is computed from the total records,
+         or is False if the total records was not counted. )
+        :param previous_cursor: Cursor of the previous page
+        :param next_cursor: Cursor of the next page
         :return: Pagination
         """
-        last_page: int = math.ceil(total_records / records_per_page) if total_records > 0 else 1
         url: str = str(request.url).split("?")[0]
         link_parameters: str = "?page={}&records_per_page=" + str(records_per_page)
+        cursor_link_parameters: str = "?cursor={}&records_per_page=" + str(records_per_page)
+
+        if page is None:
+            return {
+                "links": {
+                    "first_page": url + link_parameters.format(1),
+                    "last_page": None,
+                    "previous_page":
+                        url + cursor_link_parameters.format(previous_cursor) if previous_cursor is not None else None,
+                    "next_page": url + cursor_link_parameters.format(next_cursor) if next_cursor is not None else None,
+                    "previous_cursor": previous_cursor,
+                    "next_cursor": next_cursor,
+                },
+                "meta": {
+                    "current_page": None,
+                    "last_page": None,
+                    "total_records": total_records,
+                    "total_records_exact": total_records_exact,
+                    "records_per_page": records_per_page,
+                    "url": url
+                }
+            }
+
+        last_page: Optional[int] = None
+
+        if total_records is not None:
+            last_page = math.ceil(total_records / records_per_page) if total_records > 0 else 1
+
+        if has_next_page is None:
+            has_next_page = last_page is not None and page < last_page
 
         return {
             "links": {
                 "first_page": url + link_parameters.format(1),
-                "last_page": url + link_parameters.format(last_page),
+                "last_page": url + link_parameters.format(last_page) if last_page is not None else None,
                 "previous_page": url + link_parameters.format(page - 1) if page > 1 else None,
-                "next_page": url + link_parameters.format(page + 1) if page < last_page else None,
+                "next_page": url + link_parameters.format(page + 1) if has_next_page else None,
+                "previous_cursor": previous_cursor,
+                "next_cursor": next_cursor,
             },
             "meta": {
                 "current_page": page,
                 "last_page": last_page,
                 "total_records": total_records,
+                "total_records_exact": total_records_exact,
                 "records_per_page": records_per_page,
                 "url": url
             }
@@ -153,9 +219,14 @@ class AbstractDatabase(ABC):
     @abstractmethod
     async def list(cls, collection: Any, projection_model: Type[BaseModel], request: Request,
                    page: int, records_per_page: int, search_fields: Set[str], keyword: Optional[str] = None,
-                   sort: Optional[List[Tuple[str, int]]] = None) -> DataList:
+                   sort: Optional[List[Tuple[str, int]]] = None, cursor: Optional[str] = None,
+                   total: Optional[TotalRecordsMode] = None, search_mode: SearchMode = SearchMode.REGEX,
+                   sort_by_relevance: bool = False) -> DataList:
         """List documents/records.
 
+        If a cursor is specified, the documents/records will be listed in cursor mode by seeking from the cursor's
+        position instead of skipping the previous pages, and the page number will be ignored.
+
         :param collection: Collection/Table reference
         :param projection_model: Projection model
         :param request: HTTP request
@@ -164,19 +235,76 @@ class AbstractDatabase(ABC):
         :param search_fields: Search fields
         :param keyword: Keyword for searching data
         :param sort: Sort
+        :param cursor: Cursor of the page to list
+        :param total: How to count the total records
+        :param search_mode: Search mode ( The n-gram search mode requires the search fields to be n-gram fields. )
+        :param sort_by_relevance: Whether to sort by relevance score instead of the specified sort in text search mode
         :return: A list of documents/records
+        :raises HTTPResponseException: If there were some errors during the database operation,
+         the specified cursor was invalid, or sorting by relevance was requested in cursor mode.
+        """
+        pass
+
+    @classmethod
+    @abstractmethod
+    async def count(cls, collection: Any, search_fields: Set[str], keyword: Optional[str] = None,
+                    search_mode: SearchMode = SearchMode.REGEX) -> int:
+        """Count the documents/records that match the specified keyword.
+
+        :param collection: Collection/Table reference
+        :param search_fields: Search fields
+        :param keyword: Keyword for searching data
+        :param search_mode: Search mode ( The n-gram search mode requires the search fields to be n-gram fields. )
+        :return: Number of documents/records
+        :raises HTTPResponseException: If there were some errors during the database operation.
+        """
+        pass
+
+    @classmethod
+    @abstractmethod
+    async def stream(cls, collection: Any, projection_model: Type[BaseModel], search_fields: Set[str],
+                     keyword: Optional[str] = None, sort: Optional[List[Tuple[str, int]]] = None,
+                     search_mode: SearchMode = SearchMode.REGEX, batch_size: int = 1000) -> AsyncIterator[dict]:
+        """Stream documents/records without pagination, a batch at a time.
+
+        :param collection: Collection/Table reference
+        :param projection_model: Projection model
+        :param search_fields: Search fields
+        :param keyword: Keyword for searching data
+        :param sort: Sort
+        :param search_mode: Search mode ( The n-gram search mode requires the search fields to be n-gram fields. )
+        :param batch_size: Number of documents/records in a batch
+        :return: Documents/Records
         :raises HTTPResponseException: If there were some errors during the database operation.
         """
         pass
 
     @classmethod
     @abstractmethod
-    async def create(cls, collection: Any, information: dict, projection_model: Type[BaseModel]) -> Data:
+    async def changes(cls, collection: Any, projection_model: Type[BaseModel], token: Optional[str],
+                      records_per_page: int) -> ChangeList:
+        """Get the documents/records that have been created, updated, or deleted since a sync token.
+
+        :param collection: Collection/Table reference
+        :param projection_model: Projection model
+        :param token: Sync token ( Default is None which gets all documents/records. )
+        :param records_per_page: Maximum number of changed documents/records and deleted IDs each
+        :return: Changed documents/records, deleted IDs, and the next sync token
+        :raises HTTPResponseException: If there were some errors during the database operation,
+         or the specified sync token was invalid or expired.
+        """
+        pass
+
+    @classmethod
+    @abstractmethod
+    async def create(cls, collection: Any, information: dict, projection_model: Type[BaseModel],
+                     read_back: bool = False) -> Data:
         """Create a document/record.
 
         :param collection: Collection/Table reference
         :param information: Information to create
         :param projection_model: Projection model
+        :param read_back: Whether to read the created document/record back from the database
         :return: Created document/record
         :raises HTTPResponseException: If there were some errors during the database operation.
         """
@@ -184,12 +312,29 @@ class AbstractDatabase(ABC):
 
     @classmethod
     @abstractmethod
-    async def get(cls, collection: Any, identifier: Any, projection_model: Type[BaseModel]) -> Data:
+    async def create_many(cls, collection: Any, informations: List[dict],
+                          projection_model: Type[BaseModel]) -> List[BatchItem]:
+        """Create documents/records. A document/record that could not be created does not stop creating the others.
+
+        :param collection: Collection/Table reference
+        :param informations: A list of information to create
+        :param projection_model: Projection model
+        :return: A list of each document's/record's result in the same order as the specified information
+        :raises HTTPResponseException: If there were some errors during the database operation
+         that were not caused by any specific document/record.
+        """
+        pass
+
+    @classmethod
+    @abstractmethod
+    async def get(cls, collection: Any, identifier: Any, projection_model: Type[BaseModel],
+                  conditions: Optional[dict] = None) -> Data:
         """Get a document/record by identifier.
 
         :param collection: Collection/Table reference
         :param identifier: Identifier
         :param projection_model: Projection model
+        :param conditions: Additional conditions that the document/record must match
         :return: Document/Record
         :raises HTTPResponseException: If there were some errors during the database operation
          or the specified document/record was not found.
@@ -199,7 +344,7 @@ class AbstractDatabase(ABC):
     @classmethod
     @abstractmethod
     async def update(cls, collection: Any, identifier: Any, information: dict,
-                     projection_model: Type[BaseModel]) -> Data:
+                     projection_model: Type[BaseModel], conditions: Optional[dict] = None) -> Data:
         """Update a document/record. Skip all fields that have None value.
 
         The updated_at field will be updated if only there are some changed fields.
@@ -208,18 +353,22 @@ class AbstractDatabase(ABC):
         :param identifier: Identifier
         :param information: Information to update
         :param projection_model: Projection model
+        :param conditions: Additional conditions that the document/record must match
         :return: Updated document/record
-        :raises HTTPResponseException: If there were some errors during the database operation.
+        :raises HTTPResponseException: If there were some errors during the database operation
+         or the specified document/record was not found.
         """
         pass
 
     @classmethod
     @abstractmethod
-    async def delete(cls, collection: Any, identifier: Any) -> None:
+    async def delete(cls, collection: Any, identifier: Any, conditions: Optional[dict] = None) -> None:
         """Delete a document/record.
 
         :param collection: Collection/Table reference
         :param identifier: Identifier
-        :raises HTTPResponseException: If there were some errors during the database operation.
+        :param conditions: Additional conditions that the document/record must match
+        :raises HTTPResponseException: If there were some errors during the database operation
+         or the specified document/record was not found.
         """
         pass
@@ -0,0 +1,87 @@
+import os
+from typing import List, Type, Optional, Any
+
+from fastapi import status
+from pydantic import BaseModel, ValidationError
+
+from app.abstract_database import AbstractDatabase
+
+MAXIMUM_BATCH_SIZE: int = int(os.getenv("MAXIMUM_BATCH_SIZE", "100"))
+
+
+async def __get_validation_error_description(validation_error: ValidationError) -> str:
+    """Get a validation error description.
+
+    :param validation_error: Validation error
+    :return: Validation error description
+    """
+    return "; ".join(map(lambda error: ".".join(map(str, error.get("loc"))) + ": " + error.get("msg"),
+                         validation_error.errors()
+                         ))
+
+
+async def __get_invalid_item_result(index: int, error_description: str) -> dict:
+    """Get the result of an invalid item.
+
+    :param index: Item index
+    :param error_description: Error description
+    :return: Invalid item result
+    """
+    return {
+        "index": index,
+        "status_code": status.HTTP_422_UNPROCESSABLE_ENTITY,
+        "data": None,
+        "error": {
+            "error_code": "invalid_item",
+            "error_description": error_description
+        }
+    }
+
+
+async def create_batch(database: Type[AbstractDatabase], collection: Any, items: List[Any],
+                       creation_model: Type[BaseModel], projection_model: Type[BaseModel],
+                       additional_information: Optional[dict] = None) -> dict:
+    """Validate and create a batch of items.
+
+    Each item is validated on its own, so an invalid item, including an item that is not an object, gets its own
+    error result and does not fail the batch.
+    The valid items are created together with one bulk operation.
+
+    :param database: Database management system class
+    :param collection: Collection/Table reference
+    :param items: Items
+    :param creation_model: Creation model
+    :param projection_model: Projection model
+    :param additional_information: Additional information to create with every item
+    :return: Each item's result in the same order as the specified items
+    :raises HTTPResponseException: If there were some errors during the database operation
+        that were not caused by any specific item.
+    """
+    results: List[Optional[dict]] = [None] * len(items)
+    indexes: List[int] = []
+    informations: List[dict] = []
+
+    for index, item in enumerate(items):
+        if not isinstance(item, dict):
+            results[index] = await __get_invalid_item_result(index, "The item must be an object.")
+            continue
+
+        try:
+            information: dict = creation_model.parse_obj(item).dict()
+        except ValidationError as validation_error:
+            results[index] = await __get_invalid_item_result(
+                index, await __get_validation_error_description(validation_error)
+            )
+            continue
+
+        if additional_information is not None:
+            information.update(additional_information)
+
+        indexes.append(index)
+        informations.append(information)
+
+    if bool(informations):
+        for index, result in zip(indexes, await database.create_many(collection, informations, projection_model)):
+            results[index] = {"index": index, **result}
+
+    return {"data": results}
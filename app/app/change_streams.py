@@ -0,0 +1,109 @@
+import asyncio
+import logging
+from typing import Any, Optional, Callable, Awaitable
+
+from pymongo.errors import PyMongoError, OperationFailure
+
+CHANGE_STREAM_RETRY_DELAY: float = 1.0
+UNRESUMABLE_ERROR_CODES: set = {260, 280, 286}
+
+
+class ChangeStreamListener:
+    """This class handles tailing the change stream of a collection in the background.
+
+    Every change is handed over to a change handler as soon as the database reports it. The resume token of the latest
+    read position is kept in process, so an interrupted change stream is resumed right after that position. The resume
+    token is not shared with any other application instance, because each instance has to read every change itself.
+
+    Whenever some changes may have been missed, a gap handler is called before the listener reads the following
+    changes, e.g. the change stream was interrupted, or it was opened without any resume token because the listener
+    started, the change stream could not be resumed, or it was invalidated.
+    """
+    __collection: Any
+    __change_handler: Callable[[dict], Awaitable[None]]
+    __gap_handler: Callable[[], Awaitable[None]]
+    __token: Optional[dict]
+    __task: Optional[asyncio.Task]
+
+    def __init__(self, collection: Any, change_handler: Callable[[dict], Awaitable[None]],
+                 gap_handler: Callable[[], Awaitable[None]]) -> None:
+        """Initialize this class.
+
+        :param collection: Reference of the collection to listen to
+        :param change_handler: Function that handles a change event
+        :param gap_handler: Function that handles a gap in the change events
+        """
+        self.__collection = collection
+        self.__change_handler = change_handler
+        self.__gap_handler = gap_handler
+        self.__token = None
+        self.__task = None
+
+    async def start(self) -> None:
+        """Start listening to the change stream in the background.
+        """
+        self.__task = asyncio.ensure_future(self.__listen())
+
+    async def stop(self) -> None:
+        """Stop listening to the change stream.
+        """
+        if self.__task is None:
+            return
+
+        self.__task.cancel()
+
+        await asyncio.gather(self.__task, return_exceptions=True)
+
+        self.__task = None
+
+    async def __listen(self) -> None:
+        """Read the change stream until this listener is stopped, and reopen it after every error.
+        """
+        while True:
+            try:
+                await self.__read()
+            except asyncio.CancelledError:
+                raise
+            except PyMongoError as error:
+                logging.error(f"The {self.__collection.name} change stream was interrupted. {error.__str__()}")
+
+                if isinstance(error, OperationFailure) and error.code in UNRESUMABLE_ERROR_CODES:
+                    self.__token = None
+                elif self.__token is not None:
+                    await self.__gap_handler()
+
+                await asyncio.sleep(CHANGE_STREAM_RETRY_DELAY)
+
+    async def __read(self) -> None:
+        """Read the change stream from the latest resume token until the change stream is closed.
+
+        Only the fields that identify a changed document are read, so a change event stays small however large
+        the changed document is. A change stream that is opened without any resume token reports the changes from the
+        time it was opened, so the gap handler is called once it has been opened.
+
+        :raises PyMongoError: If the change stream could not be read.
+        """
+        stream: Any = self.__collection.watch(
+            pipeline=[{"$project": {"operationType": True, "documentKey": True}}],
+            resume_after=self.__token
+        )
+        gap_handled: bool = self.__token is not None
+
+        try:
+            while stream.alive:
+                change: Optional[dict] = await stream.try_next()
+
+                if not gap_handled:
+                    await self.__gap_handler()
+
+                    gap_handled = True
+
+                if change is not None and change.get("operationType") == "invalidate":
+                    self.__token = None
+                else:
+                    if change is not None:
+                        await self.__change_handler(change)
+
+                    self.__token = stream.resume_token
+        finally:
+            await stream.close()
@@ -0,0 +1,110 @@
+import hashlib
+import time
+from collections import OrderedDict
+from typing import Optional, Tuple
+
+
+class ClaimsCache:
+    """This class handles caching the verified claims of access tokens in process.
+
+    A client reuses an access token until it expires, so the claims that were verified once are served again without
+    verifying the token's signature. An access token is cached under its hash, so the cache does not keep any usable
+    access token. Every entry expires at the access token's expiration time, and an entry whose access token is not
+    valid yet is not served. The least recently used entry is evicted when the cache is full.
+    """
+    __maximum_size: int
+    __entries: "OrderedDict[bytes, Tuple[float, float, dict]]"
+    __hits: int
+    __misses: int
+    __evictions: int
+    __expirations: int
+
+    def __init__(self, maximum_size: int) -> None:
+        """Initialize this class.
+
+        :param maximum_size: Maximum number of cached access tokens
+        """
+        self.__maximum_size = maximum_size
+        self.__entries = OrderedDict()
+        self.__hits = 0
+        self.__misses = 0
+        self.__evictions = 0
+        self.__expirations = 0
+
+    @property
+    def statistics(self) -> dict:
+        """Get the cache's statistics.
+
+        :return: Numbers of cached access tokens, hits, misses, evictions, and expirations, and the hit rate
+        """
+        lookups: int = self.__hits + self.__misses
+
+        return {
+            "size": len(self.__entries),
+            "hits": self.__hits,
+            "misses": self.__misses,
+            "evictions": self.__evictions,
+            "expirations": self.__expirations,
+            "hit_rate": self.__hits / lookups if lookups > 0 else 0.0
+        }
+
+    @staticmethod
+    def __get_key(access_token: str) -> bytes:
+        """Get the key of an access token.
+
+        :param access_token: Access token
+        :return: Hash of the access token
+        """
+        return hashlib.blake2b(access_token.encode(), digest_size=32).digest()
+
+    def get(self, access_token: str) -> Optional[dict]:
+        """Get the cached claims of an access token.
+
+        :param access_token: Access token
+        :return: A copy of the verified claims ( This will be None if the access token was not cached, has expired,
+         or is not valid yet. )
+        """
+        key: bytes = self.__get_key(access_token)
+        entry: Optional[Tuple[float, float, dict]] = self.__entries.get(key)
+        current_time: float = time.time()
+
+        if entry is not None and entry[0] <= current_time:
+            del self.__entries[key]
+
+            self.__expirations += 1
+            entry = None
+
+        if entry is None or entry[1] > current_time:
+            self.__misses += 1
+
+            return None
+
+        self.__entries.move_to_end(key)
+
+        self.__hits += 1
+
+        return dict(entry[2])
+
+    def put(self, access_token: str, claims: dict) -> None:
+        """Cache the verified claims of an access token until the access token expires.
+
+        :param access_token: Access token
+        :param claims: Verified claims which have exp and nbf claims
+        """
+        if self.__maximum_size <= 0:
+            return
+
+        key: bytes = self.__get_key(access_token)
+        self.__entries[key] = (float(claims.get("exp")), float(claims.get("nbf")), dict(claims))
+
+        self.__entries.move_to_end(key)
+
+        while len(self.__entries) > self.__maximum_size:
+            self.__entries.popitem(last=False)
+
+            self.__evictions += 1
+
+    def clear(self) -> None:
+        """Drop all cached claims.
+        """
+        self.__entries.clear()
@@ -0,0 +1,75 @@
+import base64
+import binascii
+import json
+from datetime import datetime
+from enum import Enum
+from typing import List, Any, Tuple, Dict
+
+from bson import json_util, ObjectId
+from bson.errors import BSONError
+
+FIELD_TYPES: Dict[str, type] = {
+    "_id": ObjectId,
+    "created_at": datetime,
+    "updated_at": datetime,
+    "deleted_at": datetime,
+    "tombstone_id": ObjectId
+}
+SCALAR_TYPES: tuple = (str, int, float, type(None))
+
+
+class CursorDirection(str, Enum):
+    """Cursor direction enumeration
+    """
+    NEXT = "next"
+    PREVIOUS = "previous"
+
+
+def encode_cursor(sort_fields: List[str], values: List[Any], direction: CursorDirection) -> str:
+    """Encode a keyset position into an opaque cursor.
+
+    :param sort_fields: Sort field names including the tie-breaker field
+    :param values: Values of the sort fields of the document at the position
+    :param direction: Direction to read from the position
+    :return: Opaque cursor
+    """
+    position: str = json_util.dumps({"f": sort_fields, "v": values, "d": direction.value},
+                                    json_options=json_util.CANONICAL_JSON_OPTIONS
+                                    )
+
+    return base64.urlsafe_b64encode(position.encode()).decode().rstrip("=")
+
+
+def __is_valid_value(field: str, value: Any) -> bool:
+    """Check whether a position's value has the type of its sort field, so it cannot be read as a query operator.
+
+    :param field: Sort field name
+    :param value: Value at the position
+    :return: Whether the value has the sort field's type, or is a scalar value if the sort field has no known type
+    """
+    return isinstance(value, FIELD_TYPES.get(field, SCALAR_TYPES))
+
+
+def decode_cursor(cursor: str, sort_fields: List[str]) -> Tuple[List[Any], CursorDirection]:
+    """Decode an opaque cursor into a keyset position.
+
+    :param cursor: Opaque cursor
+    :param sort_fields: Expected sort field names including the tie-breaker field
+    :return: Values of the sort fields and the direction to read from the position
+    :raises ValueError: If the specified cursor was malformed, was created for other sort fields, or had a value
+     whose type was not its sort field's type.
+    """
+    try:
+        position: dict = json_util.loads(base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)))
+        values: List[Any] = position["v"]
+        direction: CursorDirection = CursorDirection(position["d"])
+
+        if position["f"] != sort_fields or not isinstance(values, list) or len(values) != len(sort_fields):
+            raise ValueError("The cursor does not match the sort fields.")
+
+        if not all(__is_valid_value(field, value) for field, value in zip(sort_fields, values)):
+            raise ValueError("The cursor's values do not match the sort fields' types.")
+
+        return values, direction
+    except (binascii.Error, json.JSONDecodeError, UnicodeDecodeError, BSONError, KeyError, TypeError) as error:
+        raise ValueError(f"The cursor is malformed. {error.__str__()}")
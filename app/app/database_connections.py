@@ -1,4 +1,5 @@
 import os
+from typing import Optional
 
 from app.environment import get_file_environment
 from app.mongo import Mongo
@@ -10,6 +11,18 @@ class DatabaseConnections:
     """
     main_database: Mongo
 
+    @staticmethod
+    async def __get_write_buffer_delay(environment_name: str) -> Optional[float]:
+        """Get a write buffer delay in seconds from an environment variable in milliseconds.
+
+        :param environment_name: Environment variable name
+        :return: Write buffer delay ( This will be None if the environment variable was not set. )
+        :raises ValueError: If the environment variable value was not a number.
+        """
+        delay: Optional[str] = os.getenv(environment_name)
+
+        return None if delay is None else float(delay) / 1000
+
     async def connect(self) -> None:
         """Open the database connections.
 
@@ -20,7 +33,14 @@ class DatabaseConnections:
                                        int(os.getenv("MONGO_MAIN_PORT")),
                                        os.getenv("MONGO_MAIN_DATABASE_NAME"),
                                        await get_file_environment("MONGO_MAIN_DATABASE_USERNAME_FILE"),
-                                       await get_file_environment("MONGO_MAIN_DATABASE_PASSWORD_FILE")
+                                       await get_file_environment("MONGO_MAIN_DATABASE_PASSWORD_FILE"),
+                                       await self.__get_write_buffer_delay("MONGO_MAIN_WRITE_BUFFER_DELAY"),
+                                       int(os.getenv("MONGO_MAIN_WRITE_BUFFER_SIZE", "100")),
+                                       int(os.getenv("MONGO_MAIN_DOCUMENT_CACHE_SIZE", "0")),
+                                       float(os.getenv("MONGO_MAIN_DOCUMENT_CACHE_TTL", "60")),
+                                       int(os.getenv("MONGO_MAIN_LIST_CACHE_SIZE", "0")),
+                                       float(os.getenv("MONGO_MAIN_LIST_CACHE_TTL", "1")),
+                                       os.getenv("MONGO_MAIN_WATCH_CHANGES", "false").lower() == "true"
                                        )
         except (ValueError, TypeError) as error:
             raise ConnectionError(error.__str__())
@@ -0,0 +1,129 @@
+import time
+from collections import OrderedDict
+from typing import Any, Optional, Tuple, Type, Dict
+
+from pydantic import BaseModel
+
+
+class DocumentCache:
+    """This class handles caching the documents of a collection in process.
+
+    The least recently used document is evicted when the cache is full, and every document expires after the time to
+    live. A document is cached once per projection model under its primary key, so invalidating the primary key
+    drops all of its projections. Every invalidation changes the cache's version, so a document that was read before
+    an invalidation is not cached after it.
+    """
+    __maximum_size: int
+    __time_to_live: float
+    __entries: "OrderedDict[Any, Tuple[float, Dict[Type[BaseModel], dict]]]"
+    __version: int
+    __hits: int
+    __misses: int
+    __evictions: int
+    __expirations: int
+
+    def __init__(self, maximum_size: int, time_to_live: float) -> None:
+        """Initialize this class.
+
+        :param maximum_size: Maximum number of cached primary keys
+        :param time_to_live: Time in seconds that a cached document can be served
+        """
+        self.__maximum_size = maximum_size
+        self.__time_to_live = time_to_live
+        self.__entries = OrderedDict()
+        self.__version = 0
+        self.__hits = 0
+        self.__misses = 0
+        self.__evictions = 0
+        self.__expirations = 0
+
+    @property
+    def version(self) -> int:
+        """Get the cache's version which changes on every invalidation.
+
+        :return: Version
+        """
+        return self.__version
+
+    @property
+    def statistics(self) -> dict:
+        """Get the cache's statistics.
+
+        :return: Numbers of cached primary keys, hits, misses, evictions, and expirations
+        """
+        return {
+            "size": len(self.__entries),
+            "hits": self.__hits,
+            "misses": self.__misses,
+            "evictions": self.__evictions,
+            "expirations": self.__expirations
+        }
+
+    def get(self, key: Any, projection_model: Type[BaseModel]) -> Optional[dict]:
+        """Get a cached document.
+
+        :param key: Primary key
+        :param projection_model: Projection model
+        :return: A copy of the cached document ( This will be None if the document was not cached or was expired. )
+        """
+        entry: Optional[Tuple[float, Dict[Type[BaseModel], dict]]] = self.__entries.get(key)
+
+        if entry is not None and entry[0] <= time.monotonic():
+            del self.__entries[key]
+
+            self.__expirations += 1
+            entry = None
+
+        document: Optional[dict] = None if entry is None else entry[1].get(projection_model)
+
+        if document is None:
+            self.__misses += 1
+
+            return None
+
+        self.__entries.move_to_end(key)
+
+        self.__hits += 1
+
+        return dict(document)
+
+    def put(self, key: Any, projection_model: Type[BaseModel], document: dict, version: int) -> None:
+        """Cache a document if the cache has not been invalidated since the document was read.
+
+        :param key: Primary key
+        :param projection_model: Projection model
+        :param document: Document
+        :param version: Cache's version before the document was read
+        """
+        if version != self.__version:
+            return
+
+        entry: Optional[Tuple[float, Dict[Type[BaseModel], dict]]] = self.__entries.get(key)
+
+        if entry is None:
+            entry = self.__entries[key] = (time.monotonic() + self.__time_to_live, {})
+
+        entry[1][projection_model] = dict(document)
+
+        self.__entries.move_to_end(key)
+
+        while len(self.__entries) > self.__maximum_size:
+            self.__entries.popitem(last=False)
+
+            self.__evictions += 1
+
+    def invalidate(self, key: Any) -> None:
+        """Drop all cached projections of a document.
+
+        :param key: Primary key
+        """
+        self.__version += 1
+
+        self.__entries.pop(key, None)
+
+    def clear(self) -> None:
+        """Drop all cached documents.
+        """
+        self.__version += 1
+
+        self.__entries.clear()
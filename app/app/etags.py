@@ -0,0 +1,141 @@
+import hashlib
+import re
+from datetime import datetime, timezone, timedelta
+from typing import List, Optional
+
+import orjson
+from fastapi import status
+from fastapi.responses import Response
+
+from app.http_response_exception import HTTPResponseException
+
+
+EPOCH: datetime = datetime(1970, 1, 1, tzinfo=timezone.utc)
+
+
+def __get_entity_tags(header: str) -> List[str]:
+    """Get the entity tags of an If-Match or If-None-Match header.
+
+    :param header: Header value
+    :return: Entity tags
+    """
+    return [tag.strip() for tag in header.split(",")]
+
+
+def __get_opaque_tags(header: str) -> List[str]:
+    """Get the opaque tags of an If-Match or If-None-Match header's entity tags, so they can be compared weakly.
+
+    :param header: Header value
+    :return: Opaque tags
+    """
+    return [tag[2:] if tag.startswith("W/") else tag for tag in __get_entity_tags(header)]
+
+
+def __get_updated_time(document: dict) -> datetime:
+    """Get a converted document's stored updated time.
+
+    A stored time is in UTC without any timezone. A converted string keeps the stored time in milliseconds, and
+    another string has the stored time in seconds with the local timezone's offset, so the string's offset is ignored.
+
+    :param document: Converted document which has an updated_at field
+    :return: Updated time in UTC
+    """
+    updated_at: str = document.get("updated_at")
+    stored_value: Optional[datetime] = getattr(updated_at, "stored_value", None)
+
+    if stored_value is None:
+        return datetime.fromisoformat(updated_at).replace(tzinfo=timezone.utc)
+
+    return stored_value.replace(tzinfo=timezone.utc) if stored_value.tzinfo is None \
+        else stored_value.astimezone(timezone.utc)
+
+
+def get_document_etag(document: dict) -> str:
+    """Get a strong entity tag of a document from its ID and stored updated time in milliseconds, so every update
+    gets another entity tag.
+
+    :param document: Converted document which has _id and updated_at fields
+    :return: Strong entity tag
+    """
+    milliseconds: int = (__get_updated_time(document) - EPOCH) // timedelta(milliseconds=1)
+
+    return f'"{document.get("_id")}-{milliseconds}"'
+
+
+def get_list_etag(pagination: dict) -> str:
+    """Get a weak entity tag of a page from the page's latest updated time and the total records.
+
+    The listed documents' IDs and the page links are hashed as well, so a page whose documents were moved by
+    a deletion or whose next page appeared gets another entity tag even if its total records were not counted.
+
+    :param pagination: Page of converted documents which have _id and updated_at fields
+    :return: Weak entity tag
+    """
+    documents: List[dict] = pagination.get("data")
+    digest: str = hashlib.blake2b(orjson.dumps([
+        max((__get_updated_time(document).timestamp() for document in documents), default=None),
+        pagination.get("meta").get("total_records"),
+        [document.get("_id") for document in documents],
+        pagination.get("links")
+    ], default=str), digest_size=16).hexdigest()
+
+    return f'W/"{digest}"'
+
+
+def is_not_modified(etag: str, if_none_match: Optional[str]) -> bool:
+    """Check whether an If-None-Match header matches an entity tag with the weak comparison.
+
+    :param etag: Current entity tag
+    :param if_none_match: If-None-Match header
+    :return: Whether the client's representation is not modified
+    """
+    if if_none_match is None:
+        return False
+
+    opaque_tags: List[str] = __get_opaque_tags(if_none_match)
+
+    return "*" in opaque_tags or __get_opaque_tags(etag)[0] in opaque_tags
+
+
+def get_not_modified_response(etag: str) -> Response:
+    """Get a not modified response without any body.
+
+    :param etag: Current entity tag
+    :return: Not modified response
+    """
+    return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers={"ETag": etag})
+
+
+def get_etag_conditions(identifier: str, if_match: Optional[str]) -> dict:
+    """Get the conditions that match a document only if its current entity tag matches an If-Match header
+    with the strong comparison.
+
+    An entity tag has the document's stored updated time in milliseconds, so the conditions match the document's
+    exact updated time. A write conditioned on them is atomic, so no write can be lost between checking the entity
+    tag and writing.
+
+    :param identifier: Document's identifier
+    :param if_match: If-Match header
+    :return: Conditions ( This will be empty if there is no If-Match header or it matches any entity tag. )
+    :raises HTTPResponseException: If no entity tag of the If-Match header was the document's entity tag.
+    """
+    if if_match is None:
+        return {}
+
+    entity_tags: List[str] = __get_entity_tags(if_match)
+
+    if "*" in entity_tags:
+        return {}
+
+    updated_times: List[datetime] = []
+
+    for entity_tag in entity_tags:
+        matched_tag: Optional[re.Match] = re.fullmatch(r'"([0-9a-f]{24})-(\d+)"', entity_tag)
+
+        if matched_tag is not None and matched_tag.group(1) == identifier:
+            updated_times.append(EPOCH + timedelta(milliseconds=int(matched_tag.group(2))))
+
+    if not bool(updated_times):
+        raise HTTPResponseException(status_code=status.HTTP_412_PRECONDITION_FAILED)
+
+    return {"updated_at": updated_times[0] if len(updated_times) == 1 else {"$in": updated_times}}
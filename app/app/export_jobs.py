@@ -0,0 +1,293 @@
+import asyncio
+import logging
+import os
+from datetime import datetime, timedelta
+from typing import Type, Any, Set, List, Tuple, AsyncIterator, Optional
+
+from bson import ObjectId
+from gridfs.errors import NoFile
+from pydantic import BaseModel
+from pymongo import ReturnDocument
+from pymongo.errors import PyMongoError
+
+from app.abstract_database import AbstractDatabase
+from app.http_response_exception import HTTPResponseException
+from app.models.export import ExportJobStatus
+from app.models.search import SearchMode
+from app.models.streaming import ExportFormat
+from app.streaming import encode_export
+
+MAXIMUM_EXPORT_WORKERS: int = int(os.getenv("MAXIMUM_EXPORT_WORKERS", "2"))
+EXPORT_PROGRESS_INTERVAL: float = 1.0
+EXPORT_LEASE_TIME: float = EXPORT_PROGRESS_INTERVAL * 10
+EXPORT_SWEEP_INTERVAL: float = 60.0
+EXPORT_RETENTION: float = float(os.getenv("EXPORT_RETENTION", "86400"))
+
+
+class ExportJobs:
+    """This class handles running the export jobs of a collection in the background.
+
+    Each job exports the documents that match its keyword into a file in a GridFS bucket chunk by chunk. Submitted jobs
+    wait in a queue for a bounded pool of workers, so only a few exports read the database at a time however many
+    jobs are submitted. A job is claimed atomically before it runs, so it runs once even if several application
+    instances share the job collection.
+
+    A running job renews its lease by updating its updated time every progress interval. A sweeper queues the pending
+    jobs and the running jobs whose lease has expired, e.g. their application instance was killed, so they are claimed
+    again by any application instance. It also deletes the finished jobs and their files after the retention time.
+    """
+    __database: Type[AbstractDatabase]
+    __collection: Any
+    __jobs: Any
+    __bucket: Any
+    __projection_model: Type[BaseModel]
+    __search_fields: Set[str]
+    __sort: List[Tuple[str, int]]
+    __maximum_workers: int
+    __queue: asyncio.Queue
+    __workers: List[asyncio.Task]
+    __sweeper: Optional[asyncio.Task]
+
+    def __init__(self, database: Type[AbstractDatabase], collection: Any, jobs: Any, bucket: Any,
+                 projection_model: Type[BaseModel], search_fields: Set[str], sort: List[Tuple[str, int]],
+                 maximum_workers: int = MAXIMUM_EXPORT_WORKERS) -> None:
+        """Initialize this class.
+
+        :param database: Database class
+        :param collection: Reference of the collection to export
+        :param jobs: Reference of the export job collection
+        :param bucket: Reference of the GridFS bucket of the export files
+        :param projection_model: Projection model of the exported documents
+        :param search_fields: Search fields
+        :param sort: Sort of the exported documents
+        :param maximum_workers: Maximum number of jobs that run at a time
+        """
+        self.__database = database
+        self.__collection = collection
+        self.__jobs = jobs
+        self.__bucket = bucket
+        self.__projection_model = projection_model
+        self.__search_fields = search_fields
+        self.__sort = sort
+        self.__maximum_workers = maximum_workers
+        self.__queue = asyncio.Queue()
+        self.__workers = []
+        self.__sweeper = None
+
+    async def start(self) -> None:
+        """Start the workers and the sweeper which queues the jobs that were submitted before this application started.
+        """
+        self.__workers = [asyncio.ensure_future(self.__work()) for _ in range(self.__maximum_workers)]
+        self.__sweeper = asyncio.ensure_future(self.__sweep_periodically())
+
+    async def stop(self) -> None:
+        """Stop the sweeper and the workers. A running job is put back to the pending status, so it runs again later.
+        """
+        tasks: List[asyncio.Task] = self.__workers if self.__sweeper is None else [self.__sweeper, *self.__workers]
+
+        for task in tasks:
+            task.cancel()
+
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+        self.__workers = []
+        self.__sweeper = None
+
+    async def submit(self, job_id: ObjectId) -> None:
+        """Queue a pending job.
+
+        :param job_id: Job ID
+        """
+        self.__queue.put_nowait(job_id)
+
+    @staticmethod
+    def __get_claimable_conditions() -> dict:
+        """Get the conditions that match the pending jobs and the running jobs whose lease has expired.
+
+        :return: Claimable conditions
+        """
+        return {"$or": [
+            {"status": ExportJobStatus.PENDING},
+            {"status": ExportJobStatus.RUNNING,
+             "updated_at": {"$lt": datetime.utcnow() - timedelta(seconds=EXPORT_LEASE_TIME)}
+             }
+        ]}
+
+    async def __sweep_periodically(self) -> None:
+        """Sweep the jobs every sweep interval until the sweeper is stopped.
+        """
+        while True:
+            try:
+                await self.__queue_claimable_jobs()
+                await self.__delete_expired_jobs()
+            except PyMongoError as error:
+                logging.error(f"Could not sweep the export jobs. {error.__str__()}")
+
+            await asyncio.sleep(EXPORT_SWEEP_INTERVAL)
+
+    async def __queue_claimable_jobs(self) -> None:
+        """Queue the pending jobs and the running jobs whose lease has expired.
+
+        :raises PyMongoError: If the jobs could not be read.
+        """
+        async for job in self.__jobs.find(self.__get_claimable_conditions(), projection={"_id": True}):
+            await self.submit(job.get("_id"))
+
+    async def __delete_file(self, file_id: Optional[ObjectId]) -> None:
+        """Delete a file, including the chunks of a file whose upload did not finish.
+
+        :param file_id: File ID
+        :raises PyMongoError: If the file could not be deleted.
+        """
+        if file_id is None:
+            return
+
+        try:
+            await self.__bucket.delete(file_id)
+        except NoFile:
+            pass
+
+    async def __delete_expired_jobs(self) -> None:
+        """Delete the finished jobs and their files after the retention time. A file is deleted before its job, so
+        a file whose deletion was interrupted is deleted by the next sweep.
+
+        :raises PyMongoError: If the jobs or their files could not be deleted.
+        """
+        async for job in self.__jobs.find(
+                {"status": {"$in": [ExportJobStatus.COMPLETED, ExportJobStatus.FAILED]},
+                 "updated_at": {"$lt": datetime.utcnow() - timedelta(seconds=EXPORT_RETENTION)}},
+                projection={"file_id": True}
+        ):
+            await self.__delete_file(job.get("file_id"))
+            await self.__jobs.delete_one({"_id": job.get("_id")})
+
+    async def __work(self) -> None:
+        """Run the queued jobs one by one.
+        """
+        while True:
+            job_id: ObjectId = await self.__queue.get()
+
+            try:
+                await self.__run(job_id)
+            except asyncio.CancelledError:
+                raise
+            except Exception as error:
+                logging.exception(f"Export job {job_id} stopped unexpectedly. {error.__str__()}")
+            finally:
+                self.__queue.task_done()
+
+    async def __update(self, job_id: ObjectId, upload_id: ObjectId, information: dict) -> None:
+        """Update a job unless it has been claimed again since it was claimed with the specified upload ID.
+
+        :param job_id: Job ID
+        :param upload_id: ID of the file that the claim uploads
+        :param information: Information to update
+        :raises PyMongoError: If the job could not be updated.
+        """
+        await self.__jobs.update_one({"_id": job_id, "upload_id": upload_id},
+                                     {"$set": information, "$currentDate": {"updated_at": True}}
+                                     )
+
+    async def __count(self, documents: AsyncIterator[dict], progress: dict) -> AsyncIterator[dict]:
+        """Count the documents that have been read into the specified progress.
+
+        :param documents: Documents
+        :param progress: Progress whose processed_records value is counted
+        :return: Documents
+        """
+        async for document in documents:
+            progress["processed_records"] += 1
+
+            yield document
+
+    async def __renew_lease(self, job_id: ObjectId, upload_id: ObjectId, progress: dict) -> None:
+        """Renew a running job's lease and report its progress every progress interval until it is stopped.
+
+        :param job_id: Job ID
+        :param upload_id: ID of the file that the claim uploads
+        :param progress: Progress
+        """
+        while True:
+            await asyncio.sleep(EXPORT_PROGRESS_INTERVAL)
+
+            try:
+                await self.__update(job_id, upload_id, progress)
+            except PyMongoError as error:
+                logging.error(f"Could not renew export job {job_id}'s lease. {error.__str__()}")
+
+    @staticmethod
+    async def __stop_lease(lease: asyncio.Task) -> None:
+        """Stop renewing a job's lease.
+
+        :param lease: Task that renews the job's lease
+        """
+        lease.cancel()
+
+        await asyncio.gather(lease, return_exceptions=True)
+
+    async def __run(self, job_id: ObjectId) -> None:
+        """Claim and run a pending job or a running job whose lease has expired.
+
+        The claimed job gets a new file ID, and the chunks of the file that a previous claim did not finish are
+        deleted.
+
+        :param job_id: Job ID
+        :raises PyMongoError: If the job could not be claimed or its status could not be updated.
+        """
+        file_id: ObjectId = ObjectId()
+        job: Optional[dict] = await self.__jobs.find_one_and_update(
+            {"_id": job_id, **self.__get_claimable_conditions()},
+            {"$set": {"status": ExportJobStatus.RUNNING, "processed_records": 0, "upload_id": file_id},
+             "$currentDate": {"updated_at": True}},
+            return_document=ReturnDocument.BEFORE
+        )
+
+        if job is None:
+            return
+
+        await self.__delete_file(job.get("upload_id"))
+
+        export_format: ExportFormat = ExportFormat(job.get("format"))
+        search_mode: SearchMode = SearchMode(job.get("search_mode"))
+        progress: dict = {"processed_records": 0}
+        file: Any = self.__bucket.open_upload_stream_with_id(file_id, f"{job_id}.{export_format.value}",
+                                                             metadata={"job_id": job_id}
+                                                             )
+        lease: asyncio.Task = asyncio.ensure_future(self.__renew_lease(job_id, file_id, progress))
+
+        try:
+            await self.__update(job_id, file_id, {
+                "total_records": await self.__database.count(self.__collection, self.__search_fields,
+                                                             job.get("keyword"), search_mode
+                                                             )
+            })
+
+            documents: AsyncIterator[dict] = self.__count(self.__database.stream(self.__collection,
+                                                                                 self.__projection_model,
+                                                                                 self.__search_fields,
+                                                                                 job.get("keyword"),
+                                                                                 self.__sort,
+                                                                                 search_mode
+                                                                                 ), progress)
+
+            async for chunk in encode_export(documents, export_format, self.__projection_model):
+                await file.write(chunk)
+
+            await file.close()
+        except asyncio.CancelledError:
+            await self.__stop_lease(lease)
+            await file.abort()
+            await self.__update(job_id, file_id, {"status": ExportJobStatus.PENDING, "processed_records": 0})
+
+            raise
+        except (HTTPResponseException, PyMongoError) as error:
+            logging.error(f"Export job {job_id} failed. {error.__str__()}")
+
+            await self.__stop_lease(lease)
+            await file.abort()
+            await self.__update(job_id, file_id, {"status": ExportJobStatus.FAILED})
+
+            return
+
+        await self.__stop_lease(lease)
+        await self.__update(job_id, file_id, {"status": ExportJobStatus.COMPLETED, "file_id": file_id, **progress})
@@ -0,0 +1,71 @@
+from enum import Enum
+from typing import Any, Optional, Union
+
+import orjson
+from fastapi import status
+from fastapi.responses import Response
+
+
+class ResponseMode(str, Enum):
+    """Response mode enumeration
+    """
+    VALIDATED = "validated"
+    TRUSTED = "trusted"
+
+
+class TrustedJSONResponse(Response):
+    """This class handles encoding a JSON response with orjson.
+
+    FastAPI returns a response object as is, so the content is not validated against the route's response model
+    again. The content must already be shaped like the response model, e.g. by a compiled projection.
+    """
+    media_type = "application/json"
+
+    def render(self, content: Any) -> bytes:
+        """Encode the specified content.
+
+        :param content: Content
+        :return: Encoded content
+        """
+        return orjson.dumps(content, default=str)
+
+
+class JsonResponses:
+    """This class handles choosing how a route's response content is validated and encoded.
+    """
+    __default_mode: ResponseMode = ResponseMode.VALIDATED
+
+    @classmethod
+    def set_default_mode(cls, mode: ResponseMode) -> None:
+        """Set the response mode of the routes that do not specify their own response mode.
+
+        :param mode: Response mode
+        """
+        cls.__default_mode = mode
+
+    @classmethod
+    async def get_response(cls, content: dict, status_code: int = status.HTTP_200_OK,
+                           mode: Optional[ResponseMode] = None,
+                           response: Optional[Response] = None) -> Union[dict, Response]:
+        """Get a response of the specified content.
+
+        In validated mode, the content is returned as is, so FastAPI will validate it against the route's response
+        model and encode it with the standard JSON encoder. In trusted mode, the content is encoded with orjson
+        without being validated again, so the headers that were set on the route's injected response are copied
+        into the trusted response as FastAPI copies them into a validated response.
+
+        :param content: Content
+        :param status_code: Status code of a trusted response
+        :param mode: Response mode ( Default is the default response mode. )
+        :param response: Route's injected response whose headers are sent with the content
+        :return: Content or response
+        """
+        if (cls.__default_mode if mode is None else mode) == ResponseMode.TRUSTED:
+            trusted_response: TrustedJSONResponse = TrustedJSONResponse(content, status_code=status_code)
+
+            if response is not None:
+                trusted_response.headers.raw.extend(response.headers.raw)
+
+            return trusted_response
+
+        return content
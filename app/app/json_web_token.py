@@ -1,19 +1,28 @@
+import asyncio
 import base64
 import logging
 import os
-from typing import List, Union, Set
+from datetime import datetime
+from email.utils import parsedate_to_datetime
+from typing import List, Union, Set, Dict, Optional, Tuple
 
 import jwt
 from cryptography.hazmat.backends import default_backend
-from cryptography.hazmat.primitives import serialization
-from cryptography.hazmat.primitives.asymmetric.rsa import RSAPublicNumbers
+from cryptography.hazmat.primitives.asymmetric.rsa import RSAPublicNumbers, RSAPublicKey
 from fastapi import status
 from httpx import AsyncClient, Response, ConnectTimeout, HTTPError, InvalidURL, CookieConflict, StreamError
 from jwt import ExpiredSignatureError, InvalidSignatureError, InvalidIssuerError, InvalidIssuedAtError, \
-    MissingRequiredClaimError, DecodeError, ImmatureSignatureError, InvalidAudienceError
+    MissingRequiredClaimError, DecodeError, ImmatureSignatureError, InvalidAudienceError, InvalidAlgorithmError
 
+from app.claims_cache import ClaimsCache
 from app.http_response_exception import HTTPResponseException
-from app.models.authorization import UserRole
+from app.models.authorization import UserRole, AccessTokenClaims
+
+DEFAULT_REFRESH_INTERVAL: float = 3600.0
+MINIMUM_REFRESH_INTERVAL: float = 300.0
+MAXIMUM_REFRESH_INTERVAL: float = 86400.0
+REFRESH_RETRY_DELAY: float = 60.0
+MINIMUM_REFETCH_INTERVAL: float = 60.0
 
 
 class JsonWebTokenException(Exception):
@@ -23,9 +32,19 @@ class JsonWebTokenException(Exception):
 class JsonWebToken:
     """JSON Web Token class
 
+    The issuer and the public keys are refreshed in the background as often as the Azure AD responses' cache headers
+    allow, so rotated signing keys are picked up without restarting. An access token signed by an unknown key
+    triggers a refetch as well, but every concurrent request joins the same refetch, and a refetch is not started
+    again within the minimum refetch interval, so invalid access tokens cannot flood Azure AD with requests.
     """
     __issuer: str
-    __public_keys: List[dict] = {}
+    __public_keys: Dict[str, RSAPublicKey] = {}
+    __algorithms: List[str] = ["RS256"]
+    __claims_cache: ClaimsCache = ClaimsCache(0)
+    __client: Optional[AsyncClient] = None
+    __refresh_task: Optional[asyncio.Future] = None
+    __refresh_loop: Optional[asyncio.Future] = None
+    __refreshed_at: float = float("-inf")
     __expired_token: dict = {
         "error_code": "expired_token",
         "error_description": "The access token has expired."
@@ -41,68 +60,240 @@ class JsonWebToken:
         return int.from_bytes(bytes=base64.urlsafe_b64decode(key.encode() + b"=="), byteorder="big")
 
     @classmethod
-    async def __get_azure_configuration(cls, url: str) -> dict:
+    async def __get_cache_lifetime(cls, response: Response) -> float:
+        """Get the time that a response can be cached for from its Cache-Control, Age, Expires, and Date headers.
+
+        :param response: Response
+        :return: Time in seconds between the minimum and maximum refresh intervals
+        """
+        directives: Dict[str, str] = {}
+
+        for directive in response.headers.get("Cache-Control", "").split(","):
+            name, _, value = directive.strip().partition("=")
+            directives[name.lower()] = value.strip('"')
+
+        lifetime: float = DEFAULT_REFRESH_INTERVAL
+
+        try:
+            if "no-store" in directives or "no-cache" in directives:
+                lifetime = 0
+            elif directives.get("max-age", "").isdigit():
+                lifetime = int(directives.get("max-age")) - int(response.headers.get("Age", "0"))
+            elif "Expires" in response.headers:
+                date: Optional[str] = response.headers.get("Date")
+                lifetime = (parsedate_to_datetime(response.headers.get("Expires"))
+                            - (datetime.now().astimezone() if date is None else parsedate_to_datetime(date))
+                            ).total_seconds()
+        except (TypeError, ValueError):
+            lifetime = 0
+
+        return min(max(lifetime, MINIMUM_REFRESH_INTERVAL), MAXIMUM_REFRESH_INTERVAL)
+
+    @classmethod
+    async def __get_azure_configuration(cls, url: str) -> Tuple[dict, float]:
         """Get an Azure configuration.
 
         :param url: Configuration URL
-        :return: Azure configuration
+        :return: Azure configuration and the time in seconds that it can be cached for
         :raises JsonWebTokenException: If found an exception.
         """
         try:
-            async with AsyncClient() as client:
-                response: Response = await client.get(url)
+            response: Response = await cls.__client.get(url)
 
-                if response.status_code == status.HTTP_404_NOT_FOUND:
-                    raise JsonWebTokenException(
-                        f"Could not open {url}, please help to contact the system administrator."
-                    )
+            if response.status_code != status.HTTP_200_OK:
+                raise JsonWebTokenException(
+                    f"Could not open {url}, please help to contact the system administrator."
+                )
 
-                return response.json()
+            return response.json(), await cls.__get_cache_lifetime(response)
         except ConnectTimeout as connection_timeout:
             raise JsonWebTokenException(f"Timed out while requesting {connection_timeout.request.url}.")
         except HTTPError as connection_error:
             raise JsonWebTokenException(
                 f"Found an error when requesting {connection_error.request.url}. {connection_error.__str__()}"
             )
-        except (InvalidURL, CookieConflict, StreamError) as error:
+        except (InvalidURL, CookieConflict, StreamError, ValueError) as error:
             raise JsonWebTokenException(error.__str__())
 
     @classmethod
-    async def __get_public_key(cls, kid: str) -> bytes:
-        """Get a public key.
+    async def __load_public_keys(cls, keys: List[dict]) -> Dict[str, RSAPublicKey]:
+        """Load the RSA public keys of a JSON Web Key Set once, so they can verify access tokens without being
+        constructed again.
+
+        :param keys: JSON Web Keys
+        :return: Loaded public keys by key ID
+        """
+        return {
+            key.get("kid"): RSAPublicNumbers(
+                e=await cls.__get_rsa_number(key.get("e")),
+                n=await cls.__get_rsa_number(key.get("n"))
+            ).public_key(default_backend())
+            for key in keys if key.get("kty") == "RSA"
+        }
+
+    @classmethod
+    async def __fetch_configurations(cls) -> float:
+        """Fetch the issuer and the public keys.
+
+        The cached claims are dropped if a public key was removed, so an access token signed by a revoked key is
+        verified again.
+
+        :return: Time in seconds that the configurations can be cached for
+        :raises JsonWebTokenException: If found an exception.
+        """
+        configuration, configuration_lifetime = await cls.__get_azure_configuration(
+            f"{os.getenv('AZURE_AD_AUTHORITY')}/v2.0/.well-known/openid-configuration")
+        key_set, key_set_lifetime = await cls.__get_azure_configuration(configuration.get("jwks_uri"))
+        keys: Optional[List[dict]] = key_set.get("keys")
+
+        if not isinstance(keys, list):
+            raise JsonWebTokenException(f"Could not find any keys in {configuration.get('jwks_uri')}.")
+
+        public_keys: Dict[str, RSAPublicKey] = await cls.__load_public_keys(keys)
+
+        if not set(cls.__public_keys).issubset(public_keys):
+            cls.__claims_cache.clear()
+
+        cls.__issuer = configuration.get("issuer")
+        cls.__public_keys = public_keys
+
+        return min(configuration_lifetime, key_set_lifetime)
+
+    @classmethod
+    async def __refresh(cls) -> float:
+        """Refresh the issuer and the public keys, or join the refresh that is in flight.
+
+        :return: Time in seconds that the configurations can be cached for
+        :raises JsonWebTokenException: If found an exception.
+        """
+        task: Optional[asyncio.Future] = cls.__refresh_task
+
+        if task is None or task.done():
+            cls.__refreshed_at = asyncio.get_event_loop().time()
+            task = cls.__refresh_task = asyncio.ensure_future(cls.__fetch_configurations())
+
+        try:
+            return await asyncio.shield(task)
+        finally:
+            if cls.__refresh_task is task and task.done():
+                cls.__refresh_task = None
+
+    @classmethod
+    async def __refresh_periodically(cls, delay: float) -> None:
+        """Refresh the issuer and the public keys whenever the cached configurations expire.
+
+        :param delay: Time in seconds until the first refresh
+        """
+        while True:
+            await asyncio.sleep(delay)
+
+            try:
+                delay = await cls.__refresh()
+            except JsonWebTokenException as error:
+                logging.error(f"Could not refresh the JSON Web Key Set. {error.__str__()}")
+
+                delay = REFRESH_RETRY_DELAY
+
+    @classmethod
+    async def __refetch_public_keys(cls) -> None:
+        """Refetch the public keys for an unknown key ID, unless they were fetched within the minimum refetch interval.
+        """
+        task: Optional[asyncio.Future] = cls.__refresh_task
+
+        if (task is None or task.done()) \
+                and asyncio.get_event_loop().time() - cls.__refreshed_at < MINIMUM_REFETCH_INTERVAL:
+            return
+
+        try:
+            await cls.__refresh()
+        except JsonWebTokenException as error:
+            logging.error(f"Could not refetch the JSON Web Key Set. {error.__str__()}")
+
+    @classmethod
+    async def __get_public_key(cls, kid: Optional[str]) -> RSAPublicKey:
+        """Get a public key, and refetch the public keys if there was no public key of the specified key ID.
 
         :param kid: Key ID which is used to match a specific public key
         :return: Public key
+        :raises HTTPResponseException: If there was no public key of the specified key ID.
         """
-        public_key: bytes = b""
+        public_key: Optional[RSAPublicKey] = cls.__public_keys.get(kid)
 
-        for key in cls.__public_keys:
-            if key.get("kid") == kid:
-                public_key = RSAPublicNumbers(
-                    e=await cls.__get_rsa_number(key.get("e")),
-                    n=await cls.__get_rsa_number(key.get("n"))
-                ).public_key(default_backend()).public_bytes(
-                    encoding=serialization.Encoding.PEM,
-                    format=serialization.PublicFormat.SubjectPublicKeyInfo
-                )
-                break
+        if public_key is None and kid is not None:
+            await cls.__refetch_public_keys()
+
+            public_key = cls.__public_keys.get(kid)
+
+        if public_key is None:
+            raise HTTPResponseException(status_code=status.HTTP_401_UNAUTHORIZED)
 
         return public_key
 
     @classmethod
     async def set_up(cls) -> None:
-        """Set up all configurations for validating an access token.
+        """Set up all configurations for validating an access token, and start refreshing them in the background.
 
         :raises JsonWebTokenException: If found an exception.
         """
-        configuration: dict = await cls.__get_azure_configuration(
-            f"{os.getenv('AZURE_AD_AUTHORITY')}/v2.0/.well-known/openid-configuration")
-        cls.__issuer = configuration.get("issuer")
-        cls.__public_keys = (await cls.__get_azure_configuration(configuration.get("jwks_uri"))).get("keys")
+        await cls.__stop_refreshing()
+
+        if cls.__client is None:
+            cls.__client = AsyncClient()
+
+        cls.__claims_cache = ClaimsCache(int(os.getenv("ACCESS_TOKEN_CACHE_SIZE", "10000")))
+        cls.__refresh_loop = asyncio.ensure_future(cls.__refresh_periodically(await cls.__refresh()))
+
+    @classmethod
+    async def __stop_refreshing(cls) -> None:
+        """Stop refreshing the configurations in the background.
+        """
+        for task in [cls.__refresh_loop, cls.__refresh_task]:
+            if task is not None:
+                task.cancel()
+
+                await asyncio.gather(task, return_exceptions=True)
+
+        cls.__refresh_loop = cls.__refresh_task = None
+
+    @classmethod
+    async def tear_down(cls) -> None:
+        """Stop refreshing the configurations, and close the HTTP client.
+        """
+        await cls.__stop_refreshing()
+
+        if cls.__client is not None:
+            await cls.__client.aclose()
+
+            cls.__client = None
+
+    @classmethod
+    async def get_claims_cache_statistics(cls) -> dict:
+        """Get the statistics of the verified claims cache.
+
+        :return: Numbers of cached access tokens, hits, misses, evictions, and expirations, and the hit rate
+        """
+        return cls.__claims_cache.statistics
 
     @classmethod
     async def __decode_access_token(cls, access_token: str) -> dict:
-        """Decode an access token.
+        """Decode an access token, and verify it only if its claims were not verified before.
+
+        :param access_token: Access token
+        :return: Access token claims
+        :raises HTTPResponseException: If the specified access token was invalid.
+        """
+        claims: Optional[dict] = cls.__claims_cache.get(access_token)
+
+        if claims is None:
+            claims = await cls.__verify_access_token(access_token)
+
+            cls.__claims_cache.put(access_token, claims)
+
+        return claims
+
+    @classmethod
+    async def __verify_access_token(cls, access_token: str) -> dict:
+        """Verify an access token's signature and claims.
 
         :param access_token: Access token
         :return: Access token claims
@@ -113,7 +304,7 @@ class JsonWebToken:
 
             return jwt.decode(jwt=access_token,
                               key=await cls.__get_public_key(header.get("kid")),
-                              algorithms=[header.get("alg")],
+                              algorithms=cls.__algorithms,
                               audience=os.getenv("AZURE_AD_AUDIENCE"),
                               issuer=cls.__issuer,
                               options={
@@ -130,7 +321,7 @@ class JsonWebToken:
         except ExpiredSignatureError:
             raise HTTPResponseException(status_code=status.HTTP_401_UNAUTHORIZED, detail=cls.__expired_token)
         except (MissingRequiredClaimError, ImmatureSignatureError, InvalidIssuedAtError, InvalidAudienceError,
-                InvalidIssuerError, InvalidSignatureError, DecodeError):
+                InvalidIssuerError, InvalidSignatureError, InvalidAlgorithmError, DecodeError):
             raise HTTPResponseException(status_code=status.HTTP_401_UNAUTHORIZED)
         except ValueError as value_error:
             logging.error(value_error.__str__())
@@ -159,36 +350,67 @@ class JsonWebToken:
         return [] if roles is None else roles
 
     @classmethod
-    async def get_user_identifier(cls, access_token: str, accepted_roles: Set[UserRole] = None) -> str:
-        """Get the user identifier from the specified access token.
+    async def get_claims(cls, access_token: str) -> AccessTokenClaims:
+        """Get the claims from the specified access token.
 
         :param access_token: Access token
-        :param accepted_roles: Accepted user roles
-        :return: User identifier
+        :return: Access token claims
         :raises HTTPResponseException: If the specified access token was invalid.
         """
         decoded_access_token: dict = await cls.__decode_access_token(access_token=access_token)
 
-        if "access_as_user" not in await cls.__get_scopes(decoded_access_token):
+        return AccessTokenClaims(oid=decoded_access_token.get("oid"),
+                                 scopes=await cls.__get_scopes(decoded_access_token),
+                                 roles=await cls.__get_roles(decoded_access_token)
+                                 )
+
+    @classmethod
+    async def validate_user_claims(cls, claims: AccessTokenClaims, accepted_roles: Set[UserRole] = None) -> None:
+        """Validate the claims of a user access token.
+
+        :param claims: Access token claims
+        :param accepted_roles: Accepted user roles
+        :raises HTTPResponseException: If the access token was not a user access token with any accepted role.
+        """
+        if "access_as_user" not in claims.scopes:
             raise HTTPResponseException(status_code=status.HTTP_403_FORBIDDEN)
 
-        if accepted_roles is not None \
-                and set(map(lambda x: x.value, accepted_roles)).isdisjoint(await cls.__get_roles(decoded_access_token)):
+        if accepted_roles is not None and set(map(lambda x: x.value, accepted_roles)).isdisjoint(claims.roles):
             raise HTTPResponseException(status_code=status.HTTP_403_FORBIDDEN)
 
-        return decoded_access_token.get("oid")
+    @classmethod
+    async def validate_application_claims(cls, claims: AccessTokenClaims) -> None:
+        """Validate the claims of an application access token, which can be a user access token as well.
+
+        :param claims: Access token claims
+        :raises HTTPResponseException: If the access token was neither a user nor an application access token.
+        """
+        if bool(claims.scopes):
+            return
+
+        if "access_as_application" not in claims.roles:
+            raise HTTPResponseException(status_code=status.HTTP_403_FORBIDDEN)
 
     @classmethod
-    async def validate_application_access_token(cls, access_token: str) -> None:
-        """Validate an application access token.
+    async def get_user_identifier(cls, access_token: str, accepted_roles: Set[UserRole] = None) -> str:
+        """Get the user identifier from the specified access token.
 
         :param access_token: Access token
+        :param accepted_roles: Accepted user roles
+        :return: User identifier
         :raises HTTPResponseException: If the specified access token was invalid.
         """
-        decoded_access_token: dict = await cls.__decode_access_token(access_token=access_token)
+        claims: AccessTokenClaims = await cls.get_claims(access_token)
 
-        if decoded_access_token.get("scp") is not None:
-            return
+        await cls.validate_user_claims(claims, accepted_roles)
 
-        if "access_as_application" not in await cls.__get_roles(decoded_access_token):
-            raise HTTPResponseException(status_code=status.HTTP_403_FORBIDDEN)
+        return claims.oid
+
+    @classmethod
+    async def validate_application_access_token(cls, access_token: str) -> None:
+        """Validate an application access token.
+
+        :param access_token: Access token
+        :raises HTTPResponseException: If the specified access token was invalid.
+        """
+        await cls.validate_application_claims(await cls.get_claims(access_token))
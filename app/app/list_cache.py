@@ -0,0 +1,110 @@
+import time
+from collections import OrderedDict
+from typing import Any, Optional, Tuple
+
+
+class ListCache:
+    """This class handles caching the listed pages of a collection in process for a short time.
+
+    Every write to the collection changes the cache's generation, and a page is served only by the generation that it
+    was read in, so a write hides all pages that were listed before it at once. A page that is not hidden by any write
+    is still served for the time to live only, which bounds how stale it can be when the collection is changed
+    elsewhere. The least recently used page is evicted when the cache is full.
+    """
+    __maximum_size: int
+    __time_to_live: float
+    __entries: "OrderedDict[Any, Tuple[float, int, dict]]"
+    __generation: int
+    __hits: int
+    __misses: int
+    __evictions: int
+    __expirations: int
+
+    def __init__(self, maximum_size: int, time_to_live: float) -> None:
+        """Initialize this class.
+
+        :param maximum_size: Maximum number of cached pages
+        :param time_to_live: Time in seconds that a cached page can be served
+        """
+        self.__maximum_size = maximum_size
+        self.__time_to_live = time_to_live
+        self.__entries = OrderedDict()
+        self.__generation = 0
+        self.__hits = 0
+        self.__misses = 0
+        self.__evictions = 0
+        self.__expirations = 0
+
+    @property
+    def generation(self) -> int:
+        """Get the cache's generation which changes on every write to the collection.
+
+        :return: Generation
+        """
+        return self.__generation
+
+    @property
+    def statistics(self) -> dict:
+        """Get the cache's statistics.
+
+        :return: Numbers of cached pages, hits, misses, evictions, and expirations
+        """
+        return {
+            "size": len(self.__entries),
+            "hits": self.__hits,
+            "misses": self.__misses,
+            "evictions": self.__evictions,
+            "expirations": self.__expirations
+        }
+
+    def get(self, key: Any) -> Optional[dict]:
+        """Get a cached page.
+
+        :param key: Listing arguments
+        :return: A copy of the cached page whose documents can be changed by the caller ( This will be None
+         if the page was not cached, was expired, or was listed before the latest write. )
+        """
+        entry: Optional[Tuple[float, int, dict]] = self.__entries.get(key)
+
+        if entry is not None and (entry[0] <= time.monotonic() or entry[1] != self.__generation):
+            del self.__entries[key]
+
+            self.__expirations += 1
+            entry = None
+
+        if entry is None:
+            self.__misses += 1
+
+            return None
+
+        self.__entries.move_to_end(key)
+
+        self.__hits += 1
+
+        return {**entry[2], "data": [dict(document) for document in entry[2].get("data")]}
+
+    def put(self, key: Any, page: dict, generation: int) -> None:
+        """Cache a page if the collection has not been written since the page was read.
+
+        :param key: Listing arguments
+        :param page: Page
+        :param generation: Cache's generation before the page was read
+        """
+        if generation != self.__generation:
+            return
+
+        self.__entries[key] = (time.monotonic() + self.__time_to_live, generation,
+                               {**page, "data": [dict(document) for document in page.get("data")]}
+                               )
+
+        self.__entries.move_to_end(key)
+
+        while len(self.__entries) > self.__maximum_size:
+            self.__entries.popitem(last=False)
+
+            self.__evictions += 1
+
+    def invalidate(self) -> None:
+        """Hide all cached pages by changing the cache's generation.
+        """
+        self.__generation += 1
@@ -1,7 +1,7 @@
 import logging
 import os
 
-from fastapi import FastAPI
+from fastapi import FastAPI, Depends
 from fastapi.openapi.docs import get_swagger_ui_html
 from starlette.middleware.cors import CORSMiddleware
 from starlette.requests import Request
@@ -11,9 +11,11 @@ from starlette.templating import Jinja2Templates
 
 from app.database_connections import databases
 from app.documentation import get_accepted_user_roles_sentence
+from app.json_responses import JsonResponses, ResponseMode
 from app.json_web_token import JsonWebToken, JsonWebTokenException
 from app.models.authorization import UserRole
 from app.routers.apis import api_router
+from app.security import application_permission
 
 api_prefix: str = os.getenv("API_PREFIX")
 swagger_favicon_url: str = "https://fastapi.tiangolo.com/img/favicon.png"
@@ -40,6 +42,8 @@ app: FastAPI = FastAPI(
     openapi_url=api_prefix + "/openapi.json",
 )
 
+JsonResponses.set_default_mode(ResponseMode(os.getenv("JSON_RESPONSE_MODE", ResponseMode.VALIDATED)))
+
 app.mount("/assets", StaticFiles(directory="/app/assets"), name="assets")
 
 app.add_middleware(
@@ -94,6 +98,23 @@ async def get_error_codes_template(request: Request):
     )
 
 
+@app.get(
+    api_prefix + "/cache-statistics",
+    include_in_schema=False,
+    dependencies=[Depends(application_permission)]
+)
+async def get_cache_statistics() -> dict:
+    """Get the statistics of this application instance's in-process caches.
+
+    :return: Statistics of the verified claims cache, the document caches, and the list caches
+    """
+    return {
+        "claims": await JsonWebToken.get_claims_cache_statistics(),
+        "documents": await databases.main_database.get_document_cache_statistics(),
+        "lists": await databases.main_database.get_list_cache_statistics()
+    }
+
+
 @app.on_event("startup")
 async def start_up() -> None:
     """Execute this function before this application starts up.
@@ -112,4 +133,5 @@ async def start_up() -> None:
 async def shut_down() -> None:
     """Execute this function before this application is shutting down.
     """
+    await JsonWebToken.tear_down()
     await databases.disconnect()
@@ -1,5 +1,6 @@
 import os
 from enum import Enum
+from typing import List, Optional
 
 from pydantic import Field, AnyHttpUrl, SecretStr
 from pydantic.main import BaseModel
@@ -11,6 +12,12 @@ class UserRole(str, Enum):
     CONTACT_REPORT_VIEWER = "contacts_report_viewer"
 
 
+class AccessTokenClaims(BaseModel):
+    oid: Optional[str] = Field(None, title="Object ID", description="The signed-in user's identifier.")
+    scopes: List[str] = Field([], title="Scopes", description="The scopes that were consented to the client.")
+    roles: List[str] = Field([], title="Roles", description="The roles that were assigned to the user or client.")
+
+
 class AuthorizationCodeData(BaseModel):
     authorization_url: str = Field(...,
                                    title="Authorization URL",
@@ -0,0 +1,9 @@
+from pydantic import BaseModel, Field
+
+from app.models.exception import Error
+
+
+class BatchItemResult(BaseModel):
+    index: int = Field(..., title="Item index", description="The item's index in the request body.", example=0)
+    status_code: int = Field(..., title="Status code", description="The item's own status code.", example=201)
+    error: Error = Field(None, title="Error", description="This value will be null if the item was created.")
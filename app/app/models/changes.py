@@ -0,0 +1,12 @@
+from typing import List
+
+from pydantic import BaseModel, Field
+
+
+class Changes(BaseModel):
+    deleted: List[str] = Field(..., title="Deleted item IDs",
+                               description="IDs of the items that have been deleted since the sync token.")
+    next_token: str = Field(..., title="Next sync token",
+                            description="Send this token as the since parameter to get the later changes.")
+    has_more: bool = Field(..., title="More changes",
+                           description="Whether more changes can be got with the next sync token right away.")
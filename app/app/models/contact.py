@@ -2,6 +2,8 @@ from typing import List
 
 from pydantic import BaseModel, Field, EmailStr
 
+from app.models.batch import BatchItemResult
+from app.models.changes import Changes
 from app.models.pagination import Pagination
 from app.types.datetime import DatetimeStr
 from app.types.object_id import ObjectIdStr
@@ -27,3 +29,16 @@ class ContactData(BaseModel):
 
 class ContactList(Pagination):
     data: List[ContactResponse]
+
+
+class ContactChanges(Changes):
+    data: List[ContactResponse] = Field(..., title="Created or updated contacts")
+
+
+class ContactBatchItemResult(BatchItemResult):
+    data: ContactResponse = Field(None, title="Created contact",
+                                  description="This value will be null if the item was not created.")
+
+
+class ContactBatchResponse(BaseModel):
+    data: List[ContactBatchItemResult]
@@ -0,0 +1,47 @@
+from enum import Enum
+from typing import Optional
+
+from pydantic import BaseModel, Field
+
+from app.models.streaming import ExportFormat
+from app.types.datetime import DatetimeStr
+from app.types.object_id import ObjectIdStr
+
+
+class ExportJobStatus(str, Enum):
+    """Export job status enumeration
+    """
+    PENDING = "pending"
+    RUNNING = "running"
+    COMPLETED = "completed"
+    FAILED = "failed"
+
+
+class ExportJobCreation(BaseModel):
+    format: ExportFormat = Field(ExportFormat.CSV, title="Export format")
+    keyword: Optional[str] = Field(None, title="Keyword", example="condominium",
+                                   description="Keyword for searching the exported items")
+    regex: bool = Field(False, title="Regular expression search",
+                        description="Match the keyword as a regular expression instead of a case-insensitive "
+                                    "substring; a regular expression search cannot use an index.")
+
+
+class ExportJobResponse(ExportJobCreation):
+    id: ObjectIdStr = Field(..., title="Export job ID", example="5f43825c66f4c0e20cd17dc3", alias="_id")
+    status: ExportJobStatus = Field(..., title="Status", example=ExportJobStatus.RUNNING)
+    processed_records: int = Field(..., title="Processed records", example=2500)
+    total_records: Optional[int] = Field(..., title="Total records", example=10000,
+                                         description="This value will be null until the job starts.")
+    created_at: DatetimeStr = Field(..., title="Created time", example="2020-10-05T23:00:12+07:00")
+    updated_at: DatetimeStr = Field(..., title="Updated time", example="2020-10-05T23:00:12+07:00")
+
+
+class ExportJobFile(BaseModel):
+    id: ObjectIdStr = Field(..., title="Export job ID", alias="_id")
+    format: ExportFormat = Field(..., title="Export format")
+    status: ExportJobStatus = Field(..., title="Status")
+    file_id: Optional[ObjectIdStr] = Field(..., title="Export file ID")
+
+
+class ExportJobData(BaseModel):
+    data: ExportJobResponse
@@ -1,17 +1,38 @@
+from enum import Enum
+from typing import Optional
+
 from pydantic import BaseModel, Field
 
 
+class TotalRecordsMode(str, Enum):
+    """Total records mode enumeration
+    """
+    EXACT = "exact"
+    ESTIMATED = "estimated"
+    NONE = "none"
+
+
 class Links(BaseModel):
     first_page: str = Field(..., title="First page link")
-    last_page: str = Field(..., title="Last page link")
+    last_page: Optional[str] = Field(..., title="Last page link",
+                                     description="This value will be null in cursor mode or if the total records "
+                                                 "was not counted.")
     previous_page: str = Field(None, title="Previous page link")
     next_page: str = Field(None, title="Next page link")
+    previous_cursor: str = Field(None, title="Previous page cursor")
+    next_cursor: str = Field(None, title="Next page cursor")
 
 
 class Meta(BaseModel):
-    current_page: int = Field(..., title="Current page", example=1)
-    last_page: int = Field(..., title="Last page", example=2)
-    total_records: int = Field(..., title="Total records", example=12)
+    current_page: Optional[int] = Field(..., title="Current page", example=1,
+                                        description="This value will be null in cursor mode.")
+    last_page: Optional[int] = Field(..., title="Last page", example=2,
+                                     description="This value will be null in cursor mode or if the total records "
+                                                 "was not counted.")
+    total_records: Optional[int] = Field(..., title="Total records", example=12,
+                                         description="This value will be null if the total records was not counted.")
+    total_records_exact: bool = Field(..., title="Exact total records", example=True,
+                                      description="Whether the total records is an exact count.")
     records_per_page: int = Field(..., title="Records per page", example=10)
     url: str = Field(..., title="URL")
 
@@ -2,6 +2,8 @@ from typing import List, Optional, Any
 
 from pydantic import BaseModel, Field, validator
 
+from app.models.batch import BatchItemResult
+from app.models.changes import Changes
 from app.models.pagination import Pagination
 from app.models.user import UserRelationship
 from app.types.datetime import DatetimeStr
@@ -47,3 +49,16 @@ class PostData(BaseModel):
 
 class PostList(Pagination):
     data: List[PostResponse]
+
+
+class PostChanges(Changes):
+    data: List[PostResponse] = Field(..., title="Created or updated posts")
+
+
+class PostBatchItemResult(BatchItemResult):
+    data: PostResponse = Field(None, title="Created post",
+                               description="This value will be null if the item was not created.")
+
+
+class PostBatchResponse(BaseModel):
+    data: List[PostBatchItemResult]
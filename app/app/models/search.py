@@ -0,0 +1,9 @@
+from enum import Enum
+
+
+class SearchMode(str, Enum):
+    """Search mode enumeration
+    """
+    REGEX = "regex"
+    TEXT = "text"
+    NGRAM = "ngram"
@@ -0,0 +1,15 @@
+from enum import Enum
+
+
+class StreamFormat(str, Enum):
+    """Stream format enumeration
+    """
+    JSON = "json"
+    NDJSON = "ndjson"
+
+
+class ExportFormat(str, Enum):
+    """Export format enumeration
+    """
+    CSV = "csv"
+    NDJSON = "ndjson"
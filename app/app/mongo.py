@@ -1,16 +1,35 @@
-from typing import Type, List, Tuple, Any, Optional, Set
+import asyncio
+import logging
+import re
+from datetime import datetime
+from functools import partial
+from typing import Type, List, Tuple, Any, Optional, Set, AsyncIterator
 
 import pymongo
 from bson import ObjectId
 from fastapi import status
 from fastapi.requests import Request
-from motor.motor_asyncio import AsyncIOMotorClient, AsyncIOMotorCollection, AsyncIOMotorCursor
+from gridfs.errors import NoFile
+from motor.motor_asyncio import AsyncIOMotorClient, AsyncIOMotorClientSession, AsyncIOMotorCollection, \
+    AsyncIOMotorCursor, AsyncIOMotorGridFSBucket, AsyncIOMotorGridOut
 from pydantic import BaseModel
-from pymongo.errors import PyMongoError
-from pymongo.results import InsertOneResult, UpdateResult, DeleteResult
+from pymongo import ReturnDocument
+from pymongo.errors import PyMongoError, BulkWriteError
+from pymongo.results import DeleteResult
 
-from app.abstract_database import AbstractDatabase, DataList, Data
+from app.abstract_database import AbstractDatabase, DataList, Data, BatchItem, ChangeList, TOMBSTONE_RETENTION, \
+    CHANGES_SETTLING_TIME
+from app.change_streams import ChangeStreamListener
+from app.cursors import CursorDirection, encode_cursor, decode_cursor
+from app.document_cache import DocumentCache
 from app.http_response_exception import HTTPResponseException
+from app.list_cache import ListCache
+from app.models.pagination import TotalRecordsMode
+from app.models.search import SearchMode
+from app.ngrams import NGRAM_FIELD, get_ngrams, get_document_ngrams
+from app.projections import CompiledProjection, get_compiled_projection
+from app.responses import get_response_detail
+from app.write_buffer import WriteBuffer
 
 
 class Mongo(AbstractDatabase):
@@ -18,8 +37,26 @@ class Mongo(AbstractDatabase):
     """
     __database: str
     __client: AsyncIOMotorClient
+    __write_buffer_delay: Optional[float]
+    __write_buffer_size: int
+    __document_cache_size: int
+    __document_cache_ttl: float
+    __list_cache_size: int
+    __list_cache_ttl: float
+    __watch_changes: bool
+    _ngram_fields: dict = {}
+    _write_buffers: dict = {}
+    _document_caches: dict = {}
+    _list_caches: dict = {}
+    _change_stream_listeners: dict = {}
+    _tombstones: dict = {}
+    __change_token_fields: List[str] = ["updated_at", "_id", "deleted_at", "tombstone_id"]
+    __last_object_id: ObjectId = ObjectId("f" * 24)
 
-    def __init__(self, host: str, port: int, database: str, username: str, password: str):
+    def __init__(self, host: str, port: int, database: str, username: str, password: str,
+                 write_buffer_delay: Optional[float] = None, write_buffer_size: int = 100,
+                 document_cache_size: int = 0, document_cache_ttl: float = 60, list_cache_size: int = 0,
+                 list_cache_ttl: float = 1, watch_changes: bool = False):
         """Open a database connection.
 
         :param host: Host
@@ -27,10 +64,28 @@ class Mongo(AbstractDatabase):
         :param database: Database name
         :param username: Username
         :param password: Password
+        :param write_buffer_delay: Maximum time in seconds that a buffered insert waits for other inserts
+         ( Default is None which disables the write buffers. )
+        :param write_buffer_size: Maximum number of documents in a buffered bulk insert
+        :param document_cache_size: Maximum number of cached documents of each cached collection
+         ( Default is 0 which disables the document caches. )
+        :param document_cache_ttl: Time in seconds that a cached document can be served
+        :param list_cache_size: Maximum number of cached pages of each cached collection
+         ( Default is 0 which disables the list caches. )
+        :param list_cache_ttl: Time in seconds that a cached page can be served
+        :param watch_changes: Whether to invalidate the in-process caches by the change streams of the cached
+         collections ( The database must be a replica set. )
         """
         super().__init__(host, port, database, username, password)
 
         self.__database = database
+        self.__write_buffer_delay = write_buffer_delay
+        self.__write_buffer_size = write_buffer_size
+        self.__document_cache_size = document_cache_size
+        self.__document_cache_ttl = document_cache_ttl
+        self.__list_cache_size = list_cache_size
+        self.__list_cache_ttl = list_cache_ttl
+        self.__watch_changes = watch_changes
         self.__client = AsyncIOMotorClient(host=host,
                                            port=port,
                                            username=username,
@@ -39,20 +94,100 @@ class Mongo(AbstractDatabase):
                                            )
 
     async def disconnect(self) -> None:
-        """Close the database connection.
+        """Stop all change stream listeners, flush all write buffers, and close the database connection.
         """
+        for change_stream_listener in self._change_stream_listeners.values():
+            await change_stream_listener.stop()
+
+        for write_buffer in self._write_buffers.values():
+            await write_buffer.close()
+
         await self.__client.close()
 
-    async def set_collection(self, collection: str, primary_key: str = "_id") -> AsyncIOMotorCollection:
+    async def set_collection(self, collection: str, primary_key: str = "_id",
+                             ngram_fields: Optional[Set[str]] = None,
+                             buffer_writes: bool = False, cache_documents: bool = False,
+                             cache_lists: bool = False, keep_tombstones: bool = False) -> AsyncIOMotorCollection:
         """Set a collection reference.
 
+        If n-gram fields are specified, the n-grams of these fields will be maintained in the ngrams field of every
+        created document, so these fields can be searched by substring in n-gram search mode.
+
+        If writes are buffered and the write buffers are enabled, created documents will be group-committed
+        with the other documents that are created at about the same time.
+
+        If documents are cached and the document caches are enabled, documents that are got by identifier will be
+        cached in process until they are updated, deleted, evicted, or expired. If lists are cached and the list
+        caches are enabled, listed pages will be cached in process until any document of the collection is written
+        or the pages are expired. If changes are watched as well, a document that is written through another
+        application instance will invalidate this instance's caches as soon as the collection's change stream
+        reports it.
+
+        If tombstones are kept, a tombstone will be kept in the tombstone collection for every deleted document
+        for a while, so the deletion can be got as a change.
+
         :param collection: Collection name
         :param primary_key: Primary key name
+        :param ngram_fields: N-gram fields
+        :param buffer_writes: Whether to buffer the created documents
+        :param cache_documents: Whether to cache the documents that are got by identifier
+        :param cache_lists: Whether to cache the listed pages
+        :param keep_tombstones: Whether to keep a tombstone for every deleted document
         :return: Collection reference
         """
         await self._set_primary_key_pair(collection, primary_key)
 
-        return self.__client[self.__database][collection]
+        if ngram_fields is not None:
+            self._ngram_fields[collection] = ngram_fields
+
+        reference: AsyncIOMotorCollection = self.__client[self.__database][collection]
+
+        if buffer_writes and self.__write_buffer_delay is not None:
+            self._write_buffers[collection] = WriteBuffer(reference, self.__write_buffer_delay,
+                                                          self.__write_buffer_size
+                                                          )
+
+        if cache_documents and self.__document_cache_size > 0:
+            self._document_caches[collection] = DocumentCache(self.__document_cache_size, self.__document_cache_ttl)
+
+        if keep_tombstones:
+            self._tombstones[collection] = self.__client[self.__database]["tombstone"]
+
+        if cache_lists and self.__list_cache_size > 0:
+            self._list_caches[collection] = ListCache(self.__list_cache_size, self.__list_cache_ttl)
+
+        if (collection in self._document_caches or collection in self._list_caches) and self.__watch_changes \
+                and collection not in self._change_stream_listeners:
+            self._change_stream_listeners[collection] = ChangeStreamListener(
+                reference,
+                partial(self.__handle_change, reference),
+                partial(self.__clear_caches, reference)
+            )
+
+            await self._change_stream_listeners[collection].start()
+
+        return reference
+
+    async def set_bucket(self, bucket: str) -> AsyncIOMotorGridFSBucket:
+        """Set a GridFS bucket reference.
+
+        :param bucket: Bucket name
+        :return: Bucket reference
+        """
+        return AsyncIOMotorGridFSBucket(self.__client[self.__database], bucket_name=bucket)
+
+    @classmethod
+    async def _get_current_time(cls) -> datetime:
+        """Get current time in UTC timezone which is truncated to milliseconds as MongoDB stores it.
+
+        A created or updated document that is returned without being read back will have the same time as the stored
+        document.
+
+        :return: Current time in UTC timezone
+        """
+        current_time: datetime = await super()._get_current_time()
+
+        return current_time.replace(microsecond=current_time.microsecond // 1000 * 1000)
 
     @classmethod
     async def __get_regex_filters(cls, keyword: str, search_fields: set) -> dict:
@@ -76,18 +211,245 @@ class Mongo(AbstractDatabase):
         return filters
 
     @classmethod
-    async def __get_projection(cls, projection_model: Type[BaseModel]) -> dict:
-        """Get a projection.
+    async def __get_ngram_filters(cls, keyword: str, search_fields: set) -> dict:
+        """Get n-gram filters which look the keyword's n-grams up in the ngrams field's index.
 
-        :param projection_model: Projection model
-        :return: Projection
+        Having all n-grams does not mean having the keyword, so the candidates are filtered again by the keyword
+        as a literal substring. A keyword which is shorter than the n-gram size can be filtered by substring only.
+
+        :param keyword: Keyword
+        :param search_fields: Search fields
+        :return: N-gram filters
+        """
+        ngrams: Set[str] = get_ngrams(keyword)
+        substring_filters: dict = await cls.__get_regex_filters(re.escape(keyword), search_fields)
+
+        if not bool(ngrams):
+            return substring_filters
+
+        return {"$and": [{NGRAM_FIELD: {"$all": sorted(ngrams)}}, substring_filters]}
+
+    @classmethod
+    async def __get_text_filters(cls, keyword: str) -> dict:
+        """Get text search filters which use the collection's text index.
+
+        :param keyword: Keyword
+        :return: Text search filters
+        """
+        return {"$text": {"$search": keyword}}
+
+    @classmethod
+    async def __project(cls, document: dict, projection: dict) -> dict:
+        """Project a document in process the same way as the database projects it with an inclusion projection.
+
+        :param document: Document
+        :param projection: Inclusion projection
+        :return: Projected document
         """
-        projection: dict = dict.fromkeys(projection_model.__fields__.keys(), True)
+        projected_document: dict = {}
 
-        if "id" not in projection:
-            projection["_id"] = False
+        if projection.get("_id", True) and "_id" in document:
+            projected_document["_id"] = document["_id"]
 
-        return projection
+        for field, value in document.items():
+            if field != "_id" and projection.get(field) is True:
+                projected_document[field] = value
+
+        return projected_document
+
+    @classmethod
+    async def __find_documents(cls, collection: AsyncIOMotorCollection, length: int, **kwargs: Any) -> List[dict]:
+        """Find documents.
+
+        :param collection: Collection reference
+        :param length: Maximum number of documents
+        :param kwargs: Other find arguments
+        :return: A list of documents
+        :raises PyMongoError: If there were some errors during the database operation.
+        """
+        documents: AsyncIOMotorCursor = collection.find(limit=length, **kwargs)
+
+        return await documents.to_list(length=length)
+
+    @classmethod
+    async def __get_search_filters(cls, search_fields: Set[str], keyword: Optional[str],
+                                   search_mode: SearchMode) -> dict:
+        """Get search filters of the specified search mode.
+
+        :param search_fields: Search fields
+        :param keyword: Keyword
+        :param search_mode: Search mode
+        :return: Search filters
+        """
+        if keyword is None:
+            return {}
+
+        if search_mode == SearchMode.TEXT:
+            return await cls.__get_text_filters(keyword)
+
+        if search_mode == SearchMode.NGRAM:
+            return await cls.__get_ngram_filters(keyword, search_fields)
+
+        return await cls.__get_regex_filters(keyword, search_fields)
+
+    @classmethod
+    async def __convert_documents(cls, compiled_projection: CompiledProjection, projection: dict,
+                                  documents: List[dict]) -> List[dict]:
+        """Convert listed documents and remove the fields that were projected only for listing them,
+        so the documents are shaped exactly like their projection model.
+
+        :param compiled_projection: Compiled projection of the projection model
+        :param projection: Projection including the fields for listing
+        :param documents: Listed documents
+        :return: Converted documents
+        """
+        listing_fields: List[str] = [field for field in projection if not compiled_projection.includes(field)]
+
+        for document in documents:
+            for field in listing_fields:
+                document.pop(field, None)
+
+            compiled_projection.convert(document)
+
+        return documents
+
+    @classmethod
+    async def __get_keyset_sort(cls, sort: List[Tuple[str, int]]) -> List[Tuple[str, int]]:
+        """Get a keyset sort which is the specified sort plus the _id field as a tie-breaker.
+
+        :param sort: Sort
+        :return: Keyset sort
+        """
+        if "_id" in map(lambda item: item[0], sort):
+            return sort
+
+        return sort + [("_id", sort[-1][1])]
+
+    @classmethod
+    async def __get_keyset_filters(cls, keyset_sort: List[Tuple[str, int]], values: List[Any],
+                                   direction: CursorDirection) -> dict:
+        """Get filters that match the documents after the specified keyset position in the specified direction.
+
+        :param keyset_sort: Keyset sort
+        :param values: Values of the keyset sort fields at the position
+        :param direction: Direction to read from the position
+        :return: Keyset filters
+        """
+        or_conditions: list = []
+
+        for index, (field, order) in enumerate(keyset_sort):
+            ascending: bool = (order == pymongo.ASCENDING) == (direction == CursorDirection.NEXT)
+            condition: dict = {keyset_sort[i][0]: values[i] for i in range(index)}
+            condition[field] = {"$gt" if ascending else "$lt": values[index]}
+
+            or_conditions.append(condition)
+
+        return {"$or": or_conditions}
+
+    @classmethod
+    async def __get_cursor(cls, keyset_sort: List[Tuple[str, int]], document: dict,
+                           direction: CursorDirection) -> str:
+        """Get a cursor at the position of the specified document.
+
+        :param keyset_sort: Keyset sort
+        :param document: Document
+        :param direction: Direction to read from the position
+        :return: Cursor
+        """
+        return encode_cursor(sort_fields=[field for field, _ in keyset_sort],
+                             values=[document.get(field) for field, _ in keyset_sort],
+                             direction=direction
+                             )
+
+    @classmethod
+    async def __count_documents(cls, collection: AsyncIOMotorCollection, query: dict,
+                                total: TotalRecordsMode) -> Tuple[Optional[int], bool]:
+        """Count documents that match the specified query following the specified total records mode.
+
+        An estimated count is read from the collection's metadata, so it can be used only when there is no query.
+        Otherwise, the documents will be counted exactly.
+
+        :param collection: Collection reference
+        :param query: Query
+        :param total: How to count the total records
+        :return: Total records and whether the total records is exact
+        """
+        if total == TotalRecordsMode.NONE:
+            return None, False
+
+        if total == TotalRecordsMode.ESTIMATED and not bool(query):
+            return await collection.estimated_document_count(), False
+
+        return await collection.count_documents(query), True
+
+    @classmethod
+    async def __get_update_pipeline(cls, updated_information: dict, current_time: datetime) -> List[dict]:
+        """Get an update pipeline that sets the updated information and sets the updated_at field to the current time
+        if only some fields are changed.
+
+        The updated_at field is moved at least one millisecond forward, so two updates within the same millisecond
+        still give the document different entity tags.
+
+        All values are wrapped with $literal, so a string value that starts with $ will not be read as a field path.
+
+        :param updated_information: Updated information
+        :param current_time: Current time
+        :return: Update pipeline
+        """
+        changed_conditions: List[dict] = [{"$ne": ["$" + field, {"$literal": value}]}
+                                          for field, value in updated_information.items()
+                                          ]
+
+        updated_time: dict = {"$max": [current_time, {"$add": ["$updated_at", 1]}]}
+
+        return [
+            {"$set": {"updated_at": {"$cond": [{"$or": changed_conditions}, updated_time, "$updated_at"]}}},
+            {"$set": {field: {"$literal": value} for field, value in updated_information.items()}}
+        ]
+
+    @classmethod
+    async def __update_ngram_document(cls, collection: AsyncIOMotorCollection, filters: dict,
+                                      updated_information: dict, ngram_fields: Set[str],
+                                      projection: dict) -> Optional[dict]:
+        """Update a document whose n-gram fields are changed and recompute its n-grams.
+
+        The n-grams are computed in process from the stored n-gram fields and the updated information, like they are
+        computed on creation. The update only matches while the other n-gram fields are still the read ones, so it is
+        retried with the new values if another write changed them in the meantime.
+
+        :param collection: Collection reference
+        :param filters: Filters that the document must match
+        :param updated_information: Updated information
+        :param ngram_fields: N-gram fields
+        :param projection: Projection
+        :return: Updated document ( This will be None if the document was not found. )
+        :raises PyMongoError: If there were some errors during the database operation.
+        """
+        other_fields: Set[str] = ngram_fields - updated_information.keys()
+
+        while True:
+            stored_document: Optional[dict] = await collection.find_one(
+                filters, projection={"_id": True, **{field: True for field in other_fields}}
+            )
+
+            if stored_document is None:
+                return None
+
+            pipeline: List[dict] = await cls.__get_update_pipeline(updated_information,
+                                                                   await cls._get_current_time()
+                                                                   )
+            pipeline.append({"$set": {NGRAM_FIELD: {"$literal": get_document_ngrams(
+                {**stored_document, **updated_information}, ngram_fields
+            )}}})
+            document: Optional[dict] = await collection.find_one_and_update(
+                {**filters, **{field: stored_document.get(field) for field in other_fields}},
+                pipeline,
+                projection=projection,
+                return_document=ReturnDocument.AFTER
+            )
+
+            if document is not None:
+                return document
 
     @classmethod
     async def _get_primary_key_pair(cls, collection: AsyncIOMotorCollection, identifier: str) -> dict:
@@ -101,12 +463,124 @@ class Mongo(AbstractDatabase):
 
         return {primary_key: ObjectId(identifier) if primary_key == "_id" else identifier}
 
+    @classmethod
+    async def __get_cache_key(cls, collection: AsyncIOMotorCollection, identifier: Any) -> tuple:
+        """Get the document cache key of a document which is its primary key pair.
+
+        :param collection: Collection reference
+        :param identifier: Identifier
+        :return: Document cache key
+        """
+        return tuple((await cls._get_primary_key_pair(collection, identifier)).items())
+
+    @classmethod
+    async def __invalidate_cache(cls, collection: AsyncIOMotorCollection, identifier: Any) -> None:
+        """Drop a document from its collection's document cache if the collection's documents are cached.
+
+        :param collection: Collection reference
+        :param identifier: Identifier
+        """
+        document_cache: Optional[DocumentCache] = cls._document_caches.get(collection.name)
+
+        if document_cache is not None:
+            document_cache.invalidate(await cls.__get_cache_key(collection, identifier))
+
+    @classmethod
+    async def __invalidate_lists(cls, collection: AsyncIOMotorCollection) -> None:
+        """Hide all listed pages of a written collection if the collection's pages are cached.
+
+        :param collection: Collection reference
+        """
+        list_cache: Optional[ListCache] = cls._list_caches.get(collection.name)
+
+        if list_cache is not None:
+            list_cache.invalidate()
+
+    @classmethod
+    async def __handle_change(cls, collection: AsyncIOMotorCollection, change: dict) -> None:
+        """Drop a changed document and all listed pages from its collection's in-process caches.
+
+        A change event identifies a document by its _id field only, so all of the collection's cached documents are
+        dropped if the collection has another primary key.
+
+        :param collection: Collection reference
+        :param change: Change event
+        """
+        if change.get("operationType") == "insert":
+            await cls.__invalidate_lists(collection)
+        elif change.get("operationType") in {"update", "replace", "delete"} \
+                and cls._primary_key[collection.name] == "_id":
+            await cls.__invalidate_cache(collection, change.get("documentKey").get("_id"))
+            await cls.__invalidate_lists(collection)
+        else:
+            await cls.__clear_caches(collection)
+
+    @classmethod
+    async def __clear_caches(cls, collection: AsyncIOMotorCollection) -> None:
+        """Drop all cached documents and listed pages of a collection.
+
+        :param collection: Collection reference
+        """
+        document_cache: Optional[DocumentCache] = cls._document_caches.get(collection.name)
+
+        if document_cache is not None:
+            document_cache.clear()
+
+        await cls.__invalidate_lists(collection)
+
+    @classmethod
+    async def get_document_cache_statistics(cls) -> dict:
+        """Get the statistics of all document caches.
+
+        :return: Each cached collection's numbers of cached documents, hits, misses, evictions, and expirations
+        """
+        return {collection: document_cache.statistics for collection, document_cache in cls._document_caches.items()}
+
+    @classmethod
+    async def get_list_cache_statistics(cls) -> dict:
+        """Get the statistics of all list caches.
+
+        :return: Each cached collection's numbers of cached pages, hits, misses, evictions, and expirations
+        """
+        return {collection: list_cache.statistics for collection, list_cache in cls._list_caches.items()}
+
+    @classmethod
+    async def __get_filters(cls, collection: AsyncIOMotorCollection, identifier: Any,
+                            conditions: Optional[dict] = None) -> dict:
+        """Get filters that match a document by identifier and the specified additional conditions.
+
+        :param collection: Collection reference
+        :param identifier: Identifier
+        :param conditions: Additional conditions
+        :return: Filters
+        """
+        filters: dict = await cls._get_primary_key_pair(collection, identifier)
+
+        if conditions is not None:
+            filters.update(conditions)
+
+        return filters
+
     @classmethod
     async def list(cls, collection: AsyncIOMotorCollection, projection_model: Type[BaseModel], request: Request,
                    page: int, records_per_page: int, search_fields: Set[str], keyword: Optional[str] = None,
-                   sort: Optional[List[Tuple[str, int]]] = None) -> DataList:
+                   sort: Optional[List[Tuple[str, int]]] = None, cursor: Optional[str] = None,
+                   total: Optional[TotalRecordsMode] = None, search_mode: SearchMode = SearchMode.REGEX,
+                   sort_by_relevance: bool = False) -> DataList:
         """List documents.
 
+        The _id field is always appended to the sort as a tie-breaker, so the specified sort plus _id can be used
+        as a keyset. If a cursor is specified, the documents will be listed in cursor mode by seeking the keyset index
+        from the cursor's position, so the cost of a page does not depend on how deep the page is.
+
+        The documents and the total records are fetched concurrently, so a page costs one round trip. If the
+        collection's pages are cached, a page that was listed with the same arguments since the collection was last
+        written will be served from memory.
+
+        In text search mode, the keyword is searched with the collection's text index instead of the search fields,
+        and the documents can be sorted by relevance score in page mode only. In n-gram search mode, the keyword is
+        searched as a case-insensitive substring of the search fields with the ngrams field's index.
+
         :param collection: Collection reference
         :param projection_model: Projection model
         :param request: HTTP request
@@ -115,117 +589,648 @@ class Mongo(AbstractDatabase):
         :param search_fields: Search fields
         :param keyword: Keyword for searching data
         :param sort: Sort ( Default is [("updated_at", pymongo.DESCENDING)]. )
+        :param cursor: Cursor of the page to list
+        :param total: How to count the total records ( Default is TotalRecordsMode.EXACT in page mode
+         and TotalRecordsMode.NONE in cursor mode. )
+        :param search_mode: Search mode
+        :param sort_by_relevance: Whether to sort by relevance score instead of the specified sort in text search mode
         :return: A list of documents
-        :raises HTTPResponseException: If there were some errors during the database operation.
+        :raises HTTPResponseException: If there were some errors during the database operation,
+         the specified cursor was invalid, or sorting by relevance was requested in cursor mode.
+        """
+        list_cache: Optional[ListCache] = cls._list_caches.get(collection.name)
+        cache_key: Any = None
+        cache_generation: int = 0
+
+        if list_cache is not None:
+            cache_key = (str(request.url).split("?")[0], projection_model, page, records_per_page,
+                         frozenset(search_fields), keyword, None if sort is None else tuple(sort), cursor, total,
+                         search_mode, sort_by_relevance
+                         )
+            cached_page: Optional[dict] = list_cache.get(cache_key)
+
+            if cached_page is not None:
+                return cached_page
+
+            cache_generation = list_cache.generation
+
+        pagination: DataList = await cls.__list_documents(collection, projection_model, request, page,
+                                                          records_per_page, search_fields, keyword, sort, cursor,
+                                                          total, search_mode, sort_by_relevance
+                                                          )
+
+        if list_cache is not None:
+            list_cache.put(cache_key, pagination, cache_generation)
+
+        return pagination
+
+    @classmethod
+    async def __list_documents(cls, collection: AsyncIOMotorCollection, projection_model: Type[BaseModel],
+                               request: Request, page: int, records_per_page: int, search_fields: Set[str],
+                               keyword: Optional[str], sort: Optional[List[Tuple[str, int]]], cursor: Optional[str],
+                               total: Optional[TotalRecordsMode], search_mode: SearchMode,
+                               sort_by_relevance: bool) -> DataList:
+        """List documents from the database.
+
+        :param collection: Collection reference
+        :param projection_model: Projection model
+        :param request: HTTP request
+        :param page: Page number
+        :param records_per_page: Records per page
+        :param search_fields: Search fields
+        :param keyword: Keyword for searching data
+        :param sort: Sort
+        :param cursor: Cursor of the page to list
+        :param total: How to count the total records
+        :param search_mode: Search mode
+        :param sort_by_relevance: Whether to sort by relevance score instead of the specified sort in text search mode
+        :return: A list of documents
+        :raises HTTPResponseException: If there were some errors during the database operation,
+         the specified cursor was invalid, or sorting by relevance was requested in cursor mode.
         """
         if sort is None:
             sort = [("updated_at", pymongo.DESCENDING)]
 
-        query: dict = {} if keyword is None else await cls.__get_regex_filters(keyword, search_fields)
+        query: dict = await cls.__get_search_filters(search_fields, keyword, search_mode)
+        relevance_sort: bool = keyword is not None and search_mode == SearchMode.TEXT and sort_by_relevance
+        keyset_sort: List[Tuple[str, int]] = await cls.__get_keyset_sort(sort)
+        compiled_projection: CompiledProjection = get_compiled_projection(projection_model)
+        projection: dict = dict(compiled_projection.projection)
+        projection.update(dict.fromkeys([field for field, _ in keyset_sort], True))
+
+        if relevance_sort:
+            if cursor is not None:
+                raise HTTPResponseException(
+                    status_code=status.HTTP_400_BAD_REQUEST,
+                    detail={
+                        "error_code": "unsupported_sort",
+                        "error_description": "Sorting by relevance is not supported in cursor mode."
+                    }
+                )
+
+            keyset_sort = [("score", {"$meta": "textScore"}), ("_id", pymongo.DESCENDING)]
+            projection["score"] = {"$meta": "textScore"}
+
+        if cursor is not None:
+            return await cls.__list_by_cursor(collection, compiled_projection, projection, request, records_per_page,
+                                              query, keyset_sort, cursor,
+                                              TotalRecordsMode.NONE if total is None else total
+                                              )
+
+        try:
+            data, (total_records, total_records_exact) = await asyncio.gather(
+                cls.__find_documents(collection, records_per_page + 1,
+                                     filter=query,
+                                     sort=keyset_sort,
+                                     skip=(page - 1) * records_per_page,
+                                     projection=projection
+                                     ),
+                cls.__count_documents(collection, query, TotalRecordsMode.EXACT if total is None else total)
+            )
+        except PyMongoError as database_server_error:
+            await cls._handle_database_server_error(database_server_error)
+
+        has_next_page: bool = len(data) > records_per_page
+        data = data[:records_per_page]
+        previous_cursor: Optional[str] = None
+        next_cursor: Optional[str] = None
+
+        if bool(data) and not relevance_sort:
+            if page > 1:
+                previous_cursor = await cls.__get_cursor(keyset_sort, data[0], CursorDirection.PREVIOUS)
+
+            if has_next_page:
+                next_cursor = await cls.__get_cursor(keyset_sort, data[-1], CursorDirection.NEXT)
+
+        pagination: dict = await cls._get_pagination(request, page, records_per_page, total_records,
+                                                     total_records_exact, has_next_page, previous_cursor, next_cursor
+                                                     )
+
+        pagination.update({"data": await cls.__convert_documents(compiled_projection, projection, data)})
+
+        return pagination
+
+    @classmethod
+    async def __list_by_cursor(cls, collection: AsyncIOMotorCollection, compiled_projection: CompiledProjection,
+                               projection: dict, request: Request, records_per_page: int, query: dict,
+                               keyset_sort: List[Tuple[str, int]], cursor: str, total: TotalRecordsMode) -> DataList:
+        """List documents by seeking from the specified cursor's position.
+
+        One more document than requested is read to know whether there is a page after this page.
+
+        :param collection: Collection reference
+        :param compiled_projection: Compiled projection of the projection model
+        :param projection: Projection including the keyset sort fields
+        :param request: HTTP request
+        :param records_per_page: Records per page
+        :param query: Query
+        :param keyset_sort: Keyset sort
+        :param cursor: Cursor
+        :param total: How to count the total records
+        :return: A list of documents
+        :raises HTTPResponseException: If there were some errors during the database operation
+         or the specified cursor was invalid.
+        """
+        try:
+            values, direction = decode_cursor(cursor, [field for field, _ in keyset_sort])
+        except ValueError:
+            raise HTTPResponseException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail={
+                    "error_code": "invalid_cursor",
+                    "error_description": "The specified cursor was invalid."
+                }
+            )
+
+        backward: bool = direction == CursorDirection.PREVIOUS
+        keyset_filters: dict = await cls.__get_keyset_filters(keyset_sort, values, direction)
 
         try:
-            documents: AsyncIOMotorCursor = collection.find(
-                filter=query,
-                sort=sort,
-                skip=(page - 1) * records_per_page,
-                limit=records_per_page,
-                projection=await cls.__get_projection(projection_model)
+            data, (total_records, total_records_exact) = await asyncio.gather(
+                cls.__find_documents(collection, records_per_page + 1,
+                                     filter={"$and": [query, keyset_filters]} if bool(query) else keyset_filters,
+                                     sort=[(field, -order) for field, order in keyset_sort] if backward
+                                     else keyset_sort,
+                                     projection=projection
+                                     ),
+                cls.__count_documents(collection, query, total)
             )
-            pagination: dict = await cls._get_pagination(request, page, records_per_page,
-                                                         await collection.count_documents(query)
-                                                         )
+        except PyMongoError as database_server_error:
+            await cls._handle_database_server_error(database_server_error)
+
+        has_more: bool = len(data) > records_per_page
+        data = data[:records_per_page]
+        previous_cursor: Optional[str] = None
+        next_cursor: Optional[str] = None
+
+        if backward:
+            data.reverse()
+
+        if bool(data):
+            if has_more or not backward:
+                previous_cursor = await cls.__get_cursor(keyset_sort, data[0], CursorDirection.PREVIOUS)
+
+            if has_more or backward:
+                next_cursor = await cls.__get_cursor(keyset_sort, data[-1], CursorDirection.NEXT)
+
+        pagination: dict = await cls._get_pagination(request, None, records_per_page, total_records,
+                                                     total_records_exact, next_cursor is not None, previous_cursor,
+                                                     next_cursor
+                                                     )
+
+        pagination.update({"data": await cls.__convert_documents(compiled_projection, projection, data)})
+
+        return pagination
+
+    @classmethod
+    async def count(cls, collection: AsyncIOMotorCollection, search_fields: Set[str], keyword: Optional[str] = None,
+                    search_mode: SearchMode = SearchMode.REGEX) -> int:
+        """Count the documents that match the specified keyword.
+
+        :param collection: Collection reference
+        :param search_fields: Search fields
+        :param keyword: Keyword for searching data
+        :param search_mode: Search mode
+        :return: Number of documents
+        :raises HTTPResponseException: If there were some errors during the database operation.
+        """
+        try:
+            return await collection.count_documents(await cls.__get_search_filters(search_fields, keyword,
+                                                                                   search_mode
+                                                                                   ))
+        except PyMongoError as database_server_error:
+            await cls._handle_database_server_error(database_server_error)
+
+    @classmethod
+    async def get_file(cls, bucket: AsyncIOMotorGridFSBucket, file_id: Any) -> AsyncIOMotorGridOut:
+        """Open a GridFS file for reading.
+
+        :param bucket: Bucket reference
+        :param file_id: File ID
+        :return: File
+        :raises HTTPResponseException: If there were some errors during the database operation
+         or the specified file was not found.
+        """
+        try:
+            return await bucket.open_download_stream(file_id)
+        except NoFile:
+            raise HTTPResponseException(status_code=status.HTTP_404_NOT_FOUND)
+        except PyMongoError as database_server_error:
+            await cls._handle_database_server_error(database_server_error)
+
+    @classmethod
+    async def stream(cls, collection: AsyncIOMotorCollection, projection_model: Type[BaseModel],
+                     search_fields: Set[str], keyword: Optional[str] = None,
+                     sort: Optional[List[Tuple[str, int]]] = None, search_mode: SearchMode = SearchMode.REGEX,
+                     batch_size: int = 1000) -> AsyncIterator[dict]:
+        """Stream documents without pagination.
+
+        The cursor fetches the documents in batches of the specified batch size, and only one batch is held
+        at a time, so memory stays constant however many documents there are.
+
+        :param collection: Collection reference
+        :param projection_model: Projection model
+        :param search_fields: Search fields
+        :param keyword: Keyword for searching data
+        :param sort: Sort ( Default is [("updated_at", pymongo.DESCENDING)]. )
+        :param search_mode: Search mode
+        :param batch_size: Number of documents in a batch
+        :return: Documents
+        :raises HTTPResponseException: If there were some errors during the database operation.
+        """
+        if sort is None:
+            sort = [("updated_at", pymongo.DESCENDING)]
+
+        compiled_projection: CompiledProjection = get_compiled_projection(projection_model)
+        documents: AsyncIOMotorCursor = collection.find(
+            filter=await cls.__get_search_filters(search_fields, keyword, search_mode),
+            sort=await cls.__get_keyset_sort(sort),
+            projection=compiled_projection.projection,
+            batch_size=batch_size
+        )
+
+        try:
+            async for document in documents:
+                yield compiled_projection.convert(document)
+        except PyMongoError as database_server_error:
+            await cls._handle_database_server_error(database_server_error)
+        finally:
+            await documents.close()
+
+    @classmethod
+    async def __find_changes(cls, collection: AsyncIOMotorCollection, time_field: str, conditions: dict,
+                             position: Optional[List[Any]], settled_time: datetime, length: int,
+                             projection: dict) -> Tuple[List[dict], List[Any], bool]:
+        """Find the documents whose time field is after a keyset position and is not after the settled time
+        in time order.
+
+        :param collection: Collection reference
+        :param time_field: Time field name
+        :param conditions: Additional conditions that the documents must match
+        :param position: Values of the time field and the _id field at the keyset position
+         ( Default is None which finds from the first document. )
+        :param settled_time: Settled time
+        :param length: Maximum number of documents
+        :param projection: Projection including the time field
+        :return: Found documents, the keyset position after them, and whether there are more documents
+        :raises PyMongoError: If there were some errors during the database operation.
+        """
+        keyset_sort: List[Tuple[str, int]] = [(time_field, pymongo.ASCENDING), ("_id", pymongo.ASCENDING)]
+        filters: List[dict] = [{time_field: {"$lte": settled_time}}]
+
+        if bool(conditions):
+            filters.append(conditions)
+
+        if position is not None:
+            filters.append(await cls.__get_keyset_filters(keyset_sort, position, CursorDirection.NEXT))
+
+        documents: List[dict] = await cls.__find_documents(collection, length + 1,
+                                                           filter={"$and": filters},
+                                                           sort=keyset_sort,
+                                                           projection=projection
+                                                           )
+        has_more: bool = len(documents) > length
+        documents = documents[:length]
+
+        if has_more:
+            position = [documents[-1].get(time_field), documents[-1].get("_id")]
+        elif position is None or position[0] < settled_time:
+            position = [settled_time, cls.__last_object_id]
+
+        return documents, position, has_more
 
-            pagination.update({"data": await documents.to_list(length=records_per_page)})
+    @classmethod
+    async def changes(cls, collection: AsyncIOMotorCollection, projection_model: Type[BaseModel],
+                      token: Optional[str], records_per_page: int) -> ChangeList:
+        """Get the documents that have been created or updated, and the IDs of the documents that have been deleted
+        since a sync token.
+
+        A sync token has a keyset position of the updated_at index and a keyset position of the tombstone
+        collection, so a consumer that sends every next token gets each change once in O(changes). Only the changes
+        that are older than the settling time are got, so a write whose time was taken before the token's position
+        but committed after the token was issued is not skipped. Without a sync token, all documents are got
+        without any deletion.
+
+        :param collection: Collection reference
+        :param projection_model: Projection model
+        :param token: Sync token ( Default is None which gets all documents. )
+        :param records_per_page: Maximum number of changed documents and deleted IDs each
+        :return: Changed documents, deleted IDs, and the next sync token
+        :raises HTTPResponseException: If there were some errors during the database operation,
+         or the specified sync token was invalid or expired.
+        """
+        current_time: datetime = await cls._get_current_time()
+        settled_time: datetime = current_time - CHANGES_SETTLING_TIME
+        document_position: Optional[List[Any]] = None
+        tombstone_position: Optional[List[Any]] = [settled_time, cls.__last_object_id]
+
+        if token is not None:
+            try:
+                values, _ = decode_cursor(token, cls.__change_token_fields)
+            except ValueError:
+                raise HTTPResponseException(
+                    status_code=status.HTTP_400_BAD_REQUEST,
+                    detail={
+                        "error_code": "invalid_sync_token",
+                        "error_description": "The specified sync token was invalid."
+                    }
+                )
+
+            values = [value.replace(tzinfo=None) if isinstance(value, datetime) else value for value in values]
+            document_position, tombstone_position = values[:2], values[2:]
+
+            if tombstone_position[0] < current_time - TOMBSTONE_RETENTION:
+                raise HTTPResponseException(
+                    status_code=status.HTTP_410_GONE,
+                    detail={
+                        "error_code": "expired_sync_token",
+                        "error_description": "The specified sync token was expired, please sync all items again."
+                    }
+                )
+
+        compiled_projection: CompiledProjection = get_compiled_projection(projection_model)
+        projection: dict = dict(compiled_projection.projection)
+        projection["updated_at"] = True
+        tombstones: Optional[AsyncIOMotorCollection] = cls._tombstones.get(collection.name)
+        deleted: List[dict] = []
+        has_more_deleted: bool = False
 
-            return pagination
+        try:
+            if tombstones is None:
+                tombstone_position = [settled_time, cls.__last_object_id]
+                documents, document_position, has_more_documents = await cls.__find_changes(
+                    collection, "updated_at", {}, document_position, settled_time, records_per_page, projection
+                )
+            else:
+                (documents, document_position, has_more_documents), (deleted, tombstone_position, has_more_deleted) \
+                    = await asyncio.gather(
+                        cls.__find_changes(collection, "updated_at", {}, document_position, settled_time,
+                                           records_per_page, projection
+                                           ),
+                        cls.__find_changes(tombstones, "deleted_at", {"collection": collection.name},
+                                           tombstone_position, settled_time, records_per_page,
+                                           {"document_id": True, "deleted_at": True}
+                                           )
+                    )
         except PyMongoError as database_server_error:
             await cls._handle_database_server_error(database_server_error)
 
+        return {
+            "data": await cls.__convert_documents(compiled_projection, projection, documents),
+            "deleted": [str(tombstone.get("document_id")) for tombstone in deleted],
+            "next_token": encode_cursor(sort_fields=cls.__change_token_fields,
+                                        values=document_position + tombstone_position,
+                                        direction=CursorDirection.NEXT
+                                        ),
+            "has_more": has_more_documents or has_more_deleted
+        }
+
     @classmethod
     async def create(cls, collection: AsyncIOMotorCollection, information: dict,
-                     projection_model: Type[BaseModel]) -> Data:
+                     projection_model: Type[BaseModel], read_back: bool = False) -> Data:
         """Create a document.
 
+        The created document is projected from the inserted information in process, so it does not need to be read
+        back from the database unless the database fills some fields on its own. If the collection's writes are
+        buffered, the document will be inserted with the collection's next bulk insert.
+
         :param collection: Collection reference
         :param information: Information to create
         :param projection_model: Projection model
+        :param read_back: Whether to read the created document back from the database
         :return: Created document
         :raises HTTPResponseException: If there were some errors during the database operation.
         """
         information["created_at"] = information["updated_at"] = await cls._get_current_time()
 
+        if collection.name in cls._ngram_fields:
+            information[NGRAM_FIELD] = get_document_ngrams(information, cls._ngram_fields[collection.name])
+
+        inserted_id: Any = None
+
         try:
-            result: InsertOneResult = await collection.insert_one(information)
+            if collection.name in cls._write_buffers:
+                inserted_id = await cls._write_buffers[collection.name].insert(information)
+            else:
+                inserted_id = (await collection.insert_one(information)).inserted_id
+        except PyMongoError as database_server_error:
+            await cls._handle_database_server_error(database_server_error)
+        finally:
+            await cls.__invalidate_lists(collection)
+
+        if read_back:
+            return await cls.get(collection, inserted_id, projection_model)
+
+        information["_id"] = inserted_id
 
-            return await cls.get(collection, result.inserted_id, projection_model)
+        compiled_projection: CompiledProjection = get_compiled_projection(projection_model)
+
+        return {"data": compiled_projection.convert(await cls.__project(information, compiled_projection.projection))}
+
+    @classmethod
+    async def create_many(cls, collection: AsyncIOMotorCollection, informations: List[dict],
+                          projection_model: Type[BaseModel]) -> List[BatchItem]:
+        """Create documents with one unordered bulk insert.
+
+        A document that could not be inserted does not stop inserting the other documents.
+
+        :param collection: Collection reference
+        :param informations: A list of information to create
+        :param projection_model: Projection model
+        :return: A list of each document's result in the same order as the specified information
+        :raises HTTPResponseException: If there were some errors during the database operation
+         that were not caused by any specific document.
+        """
+        current_time: datetime = await cls._get_current_time()
+        write_errors: dict = {}
+
+        for information in informations:
+            information["_id"] = ObjectId()
+            information["created_at"] = information["updated_at"] = current_time
+
+            if collection.name in cls._ngram_fields:
+                information[NGRAM_FIELD] = get_document_ngrams(information, cls._ngram_fields[collection.name])
+
+        try:
+            await collection.insert_many(informations, ordered=False)
+        except BulkWriteError as bulk_write_error:
+            write_errors = {write_error.get("index"): write_error
+                            for write_error in bulk_write_error.details.get("writeErrors", [])
+                            }
         except PyMongoError as database_server_error:
             await cls._handle_database_server_error(database_server_error)
+        finally:
+            await cls.__invalidate_lists(collection)
+
+        compiled_projection: CompiledProjection = get_compiled_projection(projection_model)
+        results: List[BatchItem] = []
+
+        for index, information in enumerate(informations):
+            if index not in write_errors:
+                results.append({"status_code": status.HTTP_201_CREATED,
+                                "data": compiled_projection.convert(
+                                    await cls.__project(information, compiled_projection.projection)
+                                ),
+                                "error": None
+                                })
+            elif write_errors[index].get("code") == 11000:
+                results.append({"status_code": status.HTTP_409_CONFLICT,
+                                "data": None,
+                                "error": {
+                                    "error_code": "duplicate_item",
+                                    "error_description": "The specified item already exists."
+                                }
+                                })
+            else:
+                logging.error(write_errors[index].get("errmsg"))
+                results.append({"status_code": status.HTTP_500_INTERNAL_SERVER_ERROR,
+                                "data": None,
+                                "error": get_response_detail(status.HTTP_500_INTERNAL_SERVER_ERROR)
+                                })
+
+        return results
 
     @classmethod
-    async def get(cls, collection: AsyncIOMotorCollection, identifier: Any, projection_model: Type[BaseModel]) -> Data:
+    async def get(cls, collection: AsyncIOMotorCollection, identifier: Any, projection_model: Type[BaseModel],
+                  conditions: Optional[dict] = None) -> Data:
         """Get a document by identifier.
 
         :param collection: Collection reference
         :param identifier: Identifier
         :param projection_model: Projection model
+        :param conditions: Additional conditions that the document must match
         :return: Document
         :raises HTTPResponseException: If there were some errors during the database operation
          or the specified document was not found.
         """
+        compiled_projection: CompiledProjection = get_compiled_projection(projection_model)
+        document_cache: Optional[DocumentCache] = None if conditions is not None \
+            else cls._document_caches.get(collection.name)
+        cache_key: Any = None
+        cache_version: int = 0
+
+        if document_cache is not None:
+            cache_key = await cls.__get_cache_key(collection, identifier)
+            cached_document: Optional[dict] = document_cache.get(cache_key, projection_model)
+
+            if cached_document is not None:
+                return {"data": cached_document}
+
+            cache_version = document_cache.version
+
         try:
-            document: dict = await collection.find_one(await cls._get_primary_key_pair(collection, identifier),
-                                                       projection=await cls.__get_projection(projection_model)
+            document: dict = await collection.find_one(await cls.__get_filters(collection, identifier, conditions),
+                                                       projection=compiled_projection.projection
                                                        )
 
             if document is None:
                 raise HTTPResponseException(status_code=status.HTTP_404_NOT_FOUND)
 
+            compiled_projection.convert(document)
+
+            if document_cache is not None:
+                document_cache.put(cache_key, projection_model, document, cache_version)
+
             return {"data": document}
         except PyMongoError as database_server_error:
             await cls._handle_database_server_error(database_server_error)
 
     @classmethod
     async def update(cls, collection: AsyncIOMotorCollection, identifier: Any, information: dict,
-                     projection_model: Type[BaseModel]) -> Data:
+                     projection_model: Type[BaseModel], conditions: Optional[dict] = None) -> Data:
         """Update a document. Skip all fields that have None value.
 
-        The updated_at field will be updated if only there are some changed fields.
+        The updated_at field will be updated if only there are some changed fields. The document is updated and read
+        back atomically in one round trip, so no reader can see the changed fields without the new updated_at value.
+        If some n-gram fields are changed, the n-grams are recomputed too.
 
         :param collection: Collection reference
         :param identifier: Identifier
         :param information: Information to update
         :param projection_model: Projection model
+        :param conditions: Additional conditions that the document must match
         :return: Updated document
-        :raises HTTPResponseException: If there were some errors during the database operation.
+        :raises HTTPResponseException: If there were some errors during the database operation
+         or the specified document was not found.
         """
-        updated_information: dict = dict(filter(lambda items: items[1] is not None, information.items()))
+        updated_information: dict = await cls._get_updated_information(information)
 
-        try:
-            if bool(updated_information):
-                primary_key_pair: dict = await cls._get_primary_key_pair(collection, identifier)
-                result: UpdateResult = await collection.update_one(primary_key_pair, {"$set": updated_information})
+        if not bool(updated_information):
+            return await cls.get(collection, identifier, projection_model, conditions)
 
-                if result.modified_count == 1:
-                    await collection.update_one(primary_key_pair,
-                                                {"$set": {"updated_at": await cls._get_current_time()}}
-                                                )
+        compiled_projection: CompiledProjection = get_compiled_projection(projection_model)
+        filters: dict = await cls.__get_filters(collection, identifier, conditions)
+        ngram_fields: Set[str] = cls._ngram_fields.get(collection.name, set())
 
-            return await cls.get(collection, identifier, projection_model)
+        try:
+            if bool(ngram_fields & updated_information.keys()):
+                document: Optional[dict] = await cls.__update_ngram_document(
+                    collection, filters, updated_information, ngram_fields, compiled_projection.projection
+                )
+            else:
+                document = await collection.find_one_and_update(
+                    filters,
+                    await cls.__get_update_pipeline(updated_information, await cls._get_current_time()),
+                    projection=compiled_projection.projection,
+                    return_document=ReturnDocument.AFTER
+                )
         except PyMongoError as database_server_error:
             await cls._handle_database_server_error(database_server_error)
+        finally:
+            await cls.__invalidate_cache(collection, identifier)
+            await cls.__invalidate_lists(collection)
+
+        if document is None:
+            raise HTTPResponseException(status_code=status.HTTP_404_NOT_FOUND)
+
+        return {"data": compiled_projection.convert(document)}
 
     @classmethod
-    async def delete(cls, collection: AsyncIOMotorCollection, identifier: Any) -> None:
+    async def __delete_document(cls, collection: AsyncIOMotorCollection, filters: dict,
+                                session: Optional[AsyncIOMotorClientSession] = None) -> None:
         """Delete a document.
 
+        :param collection: Collection reference
+        :param filters: Filters that the document must match
+        :param session: Client session ( Default is None which deletes without a session. )
+        :raises HTTPResponseException: If the specified document was not found.
+        :raises PyMongoError: If there were some errors during the database operation.
+        """
+        result: DeleteResult = await collection.delete_one(filters, session=session)
+
+        if result.deleted_count == 0:
+            raise HTTPResponseException(status_code=status.HTTP_404_NOT_FOUND)
+
+    @classmethod
+    async def delete(cls, collection: AsyncIOMotorCollection, identifier: Any,
+                     conditions: Optional[dict] = None) -> None:
+        """Delete a document and keep its tombstone if the collection keeps tombstones.
+
+        The document is deleted and its tombstone is inserted in one transaction, so a deletion is never committed
+        without its tombstone.
+
         :param collection: Collection reference
         :param identifier: Identifier
-        :raises HTTPResponseException: If there were some errors during the database operation.
+        :param conditions: Additional conditions that the document must match
+        :raises HTTPResponseException: If there were some errors during the database operation
+         or the specified document was not found.
         """
         try:
-            result: DeleteResult = await collection.delete_one(await cls._get_primary_key_pair(collection, identifier))
+            filters: dict = await cls.__get_filters(collection, identifier, conditions)
 
-            if result.deleted_count == 0:
-                raise HTTPResponseException(status_code=status.HTTP_404_NOT_FOUND)
+            if collection.name in cls._tombstones:
+                async with await collection.database.client.start_session() as session:
+                    async with session.start_transaction():
+                        await cls.__delete_document(collection, filters, session)
+                        await cls._tombstones[collection.name].insert_one({
+                            "collection": collection.name,
+                            "document_id": (await cls._get_primary_key_pair(collection, identifier)).popitem()[1],
+                            "deleted_at": await cls._get_current_time()
+                        }, session=session)
+            else:
+                await cls.__delete_document(collection, filters)
         except PyMongoError as database_server_error:
             await cls._handle_database_server_error(database_server_error)
+        finally:
+            await cls.__invalidate_cache(collection, identifier)
+            await cls.__invalidate_lists(collection)
@@ -0,0 +1,38 @@
+from typing import Set, List, Optional
+
+NGRAM_FIELD: str = "ngrams"
+NGRAM_SIZE: int = 3
+
+
+def get_ngrams(text: Optional[str], size: int = NGRAM_SIZE) -> Set[str]:
+    """Get the case-insensitive n-grams of the specified text.
+
+    :param text: Text
+    :param size: N-gram size
+    :return: N-grams ( This will be empty if the text is shorter than the n-gram size. )
+    """
+    if text is None:
+        return set()
+
+    text = text.lower()
+
+    return {text[index:index + size] for index in range(len(text) - size + 1)}
+
+
+def get_document_ngrams(document: dict, fields: Set[str], size: int = NGRAM_SIZE) -> List[str]:
+    """Get the n-grams of the specified fields of a document.
+
+    Each field is split separately, so there is no n-gram across two fields.
+
+    :param document: Document
+    :param fields: Fields
+    :param size: N-gram size
+    :return: Sorted n-grams
+    """
+    ngrams: Set[str] = set()
+
+    for field in fields:
+        value = document.get(field)
+        ngrams.update(get_ngrams(value if value is None else str(value), size))
+
+    return sorted(ngrams)
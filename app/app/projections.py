@@ -0,0 +1,84 @@
+from typing import Type, List, Tuple, Callable, Any, Dict
+
+from pydantic import BaseModel
+
+from app.types.datetime import DatetimeStr
+from app.types.object_id import ObjectIdStr
+
+__converter_types: Tuple[Type[str], ...] = (ObjectIdStr, DatetimeStr)
+
+
+class CompiledProjection:
+    """This class handles a projection model that is compiled into a database projection and a row converter.
+    """
+    projection: dict
+    __converters: List[Tuple[str, Callable[[Any], str]]]
+
+    def __init__(self, projection: dict, converters: List[Tuple[str, Callable[[Any], str]]]) -> None:
+        """Initialize this class.
+
+        :param projection: Inclusion projection
+        :param converters: Pairs of a document key and its value converter
+        """
+        self.projection = projection
+        self.__converters = converters
+
+    def includes(self, field: str) -> bool:
+        """Check whether the database includes a field in the documents that are projected with the projection.
+
+        :param field: Document field
+        :return: Whether the field is included
+        """
+        return self.projection.get(field, field == "_id") is True
+
+    def convert(self, document: dict) -> dict:
+        """Convert the ObjectId and datetime values of a document to their response strings in place.
+
+        The converted values are already valid, so the response model does not need to convert them again.
+
+        :param document: Document
+        :return: Converted document
+        """
+        for key, converter in self.__converters:
+            value: Any = document.get(key)
+
+            if value is not None:
+                document[key] = converter(value)
+
+        return document
+
+
+__compiled_projections: Dict[Type[BaseModel], CompiledProjection] = {}
+
+
+def __compile_projection(projection_model: Type[BaseModel]) -> CompiledProjection:
+    """Compile a projection model.
+
+    :param projection_model: Projection model
+    :return: Compiled projection
+    """
+    projection: dict = dict.fromkeys(projection_model.__fields__.keys(), True)
+    converters: List[Tuple[str, Callable[[Any], str]]] = []
+
+    if "id" not in projection:
+        projection["_id"] = False
+
+    for field in projection_model.__fields__.values():
+        if isinstance(field.outer_type_, type) and issubclass(field.outer_type_, __converter_types):
+            converters.append((field.alias, field.outer_type_.convert))
+
+    return CompiledProjection(projection, converters)
+
+
+def get_compiled_projection(projection_model: Type[BaseModel]) -> CompiledProjection:
+    """Get the compiled projection of a projection model. Each projection model is compiled once.
+
+    :param projection_model: Projection model
+    :return: Compiled projection
+    """
+    compiled_projection: CompiledProjection = __compiled_projections.get(projection_model)
+
+    if compiled_projection is None:
+        compiled_projection = __compiled_projections[projection_model] = __compile_projection(projection_model)
+
+    return compiled_projection
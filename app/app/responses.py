@@ -17,6 +17,10 @@ __response_details: dict = {
         "error_code": "item_not_found",
         "error_description": "The specified item was not found."
     },
+    status.HTTP_412_PRECONDITION_FAILED: {
+        "error_code": "precondition_failed",
+        "error_description": "The specified item has been changed since the specified entity tag was got."
+    },
     status.HTTP_500_INTERNAL_SERVER_ERROR: {
         "error_code": "internal_server_error",
         "error_description": "There is an internal server error, please try again or contact the system administrator."
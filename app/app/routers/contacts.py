@@ -1,66 +1,331 @@
-from typing import Optional
+from typing import Optional, Set, Union, AsyncIterator, List, Tuple, Any
 
 import pymongo
-from fastapi import APIRouter, Depends, Query
+from bson import ObjectId
+from fastapi import APIRouter, Depends, Query, Body, Path, Header
 from fastapi import status
 from fastapi.requests import Request
-from fastapi.responses import Response
-from fastapi.security import HTTPAuthorizationCredentials
-from motor.motor_asyncio import AsyncIOMotorCollection
+from fastapi.responses import Response, StreamingResponse
+from motor.motor_asyncio import AsyncIOMotorCollection, AsyncIOMotorGridFSBucket, AsyncIOMotorGridOut
+from pydantic import conlist
 
+from app.abstract_database import MAXIMUM_RECORDS_PER_PAGE
+from app.batch import MAXIMUM_BATCH_SIZE, create_batch
 from app.database_connections import databases
 from app.documentation import GrantTypeRequestSentence, get_accepted_user_roles_sentence
-from app.json_web_token import JsonWebToken
-from app.models.authorization import UserRole
-from app.models.contact import ContactData, ContactCreation, ContactResponse, ContactList
+from app.etags import get_list_etag, is_not_modified, get_not_modified_response
+from app.export_jobs import ExportJobs
+from app.http_response_exception import HTTPResponseException
+from app.json_responses import JsonResponses
+from app.models.authorization import UserRole, AccessTokenClaims
+from app.models.contact import ContactData, ContactCreation, ContactResponse, ContactList, ContactBatchResponse, \
+    ContactChanges
+from app.models.export import ExportJobData, ExportJobCreation, ExportJobResponse, ExportJobFile, ExportJobStatus
+from app.models.pagination import TotalRecordsMode
+from app.models.search import SearchMode
+from app.models.streaming import StreamFormat, ExportFormat
 from app.mongo import Mongo
-from app.responses import main_endpoint_responses
-from app.security import bearer_token
+from app.responses import main_endpoint_responses, subsidiary_endpoint_responses, get_error_response_example
+from app.security import get_access_token_claims, UserPermission, application_permission
+from app.streaming import get_streaming_response, get_export_response, get_file_streaming_response
+from app.types.object_id import ObjectIdStr
 
 router: APIRouter = APIRouter()
 COLLECTION: AsyncIOMotorCollection
+EXPORT_COLLECTION: AsyncIOMotorCollection
+EXPORT_BUCKET: AsyncIOMotorGridFSBucket
+EXPORT_JOBS: ExportJobs
+SEARCH_FIELDS: Set[str] = {"first_name", "last_name", "email", "message"}
+SORT: List[Tuple[str, int]] = [("created_at", pymongo.DESCENDING)]
+REPORT_VIEWER_PERMISSION: UserPermission = UserPermission({UserRole.CONTACT_REPORT_VIEWER})
 
 
 @router.on_event("startup")
 async def start_up() -> None:
     """Execute this function before execute any functions.
     """
-    global COLLECTION
-    COLLECTION = await databases.main_database.set_collection("contact")
+    global COLLECTION, EXPORT_COLLECTION, EXPORT_BUCKET, EXPORT_JOBS
+    COLLECTION = await databases.main_database.set_collection("contact", ngram_fields=SEARCH_FIELDS,
+                                                              buffer_writes=True, cache_lists=True,
+                                                              keep_tombstones=True
+                                                              )
+    EXPORT_COLLECTION = await databases.main_database.set_collection("contact_export")
+    EXPORT_BUCKET = await databases.main_database.set_bucket("contact_export")
+    EXPORT_JOBS = ExportJobs(Mongo, COLLECTION, EXPORT_COLLECTION, EXPORT_BUCKET, ContactResponse, SEARCH_FIELDS, SORT)
+
+    await EXPORT_JOBS.start()
+
+
+@router.on_event("shutdown")
+async def shut_down() -> None:
+    """Execute this function before this application is shutting down.
+    """
+    await EXPORT_JOBS.stop()
+
+
+def __stream_contacts(keyword: Optional[str], regex: bool) -> AsyncIterator[dict]:
+    """Stream the contacts that match the specified keyword sorting by created time in descending order.
+
+    :param keyword: Keyword for searching contacts
+    :param regex: Whether to match the keyword as a regular expression
+    :return: Contacts
+    """
+    return Mongo.stream(collection=COLLECTION,
+                        projection_model=ContactResponse,
+                        search_fields=SEARCH_FIELDS,
+                        keyword=keyword,
+                        sort=SORT,
+                        search_mode=SearchMode.REGEX if regex else SearchMode.NGRAM
+                        )
 
 
 @router.get(
     "",
     summary="Get contacts sorting by created time in descending order.",
-    description="Contacts can be searched by first name, last name, email, or message with regular expression."
+    description="Contacts can be searched by first name, last name, email, or message with substring "
+                "or regular expression. A page that has not changed since its ETag was got can be revalidated "
+                "with an If-None-Match header."
                 + GrantTypeRequestSentence.AUTHORIZATION_CODE
                 + get_accepted_user_roles_sentence({UserRole.CONTACT_REPORT_VIEWER}),
     response_model=ContactList,
-    responses=main_endpoint_responses,
+    responses={**main_endpoint_responses, status.HTTP_304_NOT_MODIFIED: {"description": "Not Modified"}},
+    dependencies=[Depends(REPORT_VIEWER_PERMISSION)],
 )
 async def get_contacts(
         request: Request,
-        authorization: HTTPAuthorizationCredentials = Depends(bearer_token),
+        response: Response,
         page: int = Query(1, description="Page", ge=1),
-        records_per_page: int = Query(10, description="Records per page", ge=1),
+        records_per_page: int = Query(10,
+                                      description="Records per page; use the stream endpoint to get more contacts "
+                                                  "at once.",
+                                      ge=1,
+                                      le=MAXIMUM_RECORDS_PER_PAGE
+                                      ),
+        keyword: Optional[str] = Query(None,
+                                       description="Keyword for searching contacts by first name, last name, email, "
+                                                   "or message"
+                                       ),
+        cursor: Optional[str] = Query(None,
+                                      description="Cursor from the previous_cursor or next_cursor link for listing "
+                                                  "contacts in cursor mode; the page will be ignored."
+                                      ),
+        total: Optional[TotalRecordsMode] = Query(None,
+                                                  description="How to count the total records; the default is exact "
+                                                              "in page mode and none in cursor mode. An estimated "
+                                                              "total is used only when there is no keyword."
+                                                  ),
+        regex: bool = Query(False,
+                            description="Match the keyword as a regular expression instead of a case-insensitive "
+                                        "substring; a regular expression search cannot use an index."
+                            ),
+        if_none_match: Optional[str] = Header(None, description="ETag of the page that the client has",
+                                              alias="If-None-Match"
+                                              )
+) -> Union[dict, Response]:
+    result: dict = await Mongo.list(collection=COLLECTION,
+                                    projection_model=ContactResponse,
+                                    request=request,
+                                    page=page,
+                                    records_per_page=records_per_page,
+                                    search_fields=SEARCH_FIELDS,
+                                    keyword=keyword,
+                                    sort=SORT,
+                                    cursor=cursor,
+                                    total=total,
+                                    search_mode=SearchMode.REGEX if regex else SearchMode.NGRAM
+                                    )
+    etag: str = get_list_etag(result)
+
+    if is_not_modified(etag, if_none_match):
+        return get_not_modified_response(etag)
+
+    response.headers["ETag"] = etag
+
+    return await JsonResponses.get_response(result, response=response)
+
+
+@router.get(
+    ":stream",
+    summary="Stream contacts sorting by created time in descending order.",
+    description="All contacts that match the keyword are streamed without pagination as a JSON array "
+                "or newline-delimited JSON."
+                + GrantTypeRequestSentence.AUTHORIZATION_CODE
+                + get_accepted_user_roles_sentence({UserRole.CONTACT_REPORT_VIEWER}),
+    response_class=StreamingResponse,
+    responses={**main_endpoint_responses,
+               status.HTTP_200_OK: {"content": {"application/json": {}, "application/x-ndjson": {}}}
+               },
+    dependencies=[Depends(REPORT_VIEWER_PERMISSION)],
+)
+async def stream_contacts(
+        keyword: Optional[str] = Query(None,
+                                       description="Keyword for searching contacts by first name, last name, email, "
+                                                   "or message"
+                                       ),
+        regex: bool = Query(False,
+                            description="Match the keyword as a regular expression instead of a case-insensitive "
+                                        "substring; a regular expression search cannot use an index."
+                            ),
+        stream_format: StreamFormat = Query(StreamFormat.JSON, description="Stream format", alias="format")
+) -> StreamingResponse:
+    return await get_streaming_response(__stream_contacts(keyword, regex), stream_format)
+
+
+@router.get(
+    "/changes",
+    summary="Get the contacts that have been created, updated, or deleted since a sync token.",
+    description="Get all contacts without a sync token first, then send each next_token as the since parameter "
+                "to get only the later changes. Keep sending the next token right away while has_more is true. "
+                "Changes appear after a few seconds, and a sync token expires after the deletions are forgotten."
+                + GrantTypeRequestSentence.AUTHORIZATION_CODE
+                + get_accepted_user_roles_sentence({UserRole.CONTACT_REPORT_VIEWER}),
+    response_model=ContactChanges,
+    responses={**main_endpoint_responses,
+               status.HTTP_400_BAD_REQUEST: get_error_response_example(
+                   error_code="invalid_sync_token",
+                   error_description="The specified sync token was invalid."
+               ),
+               status.HTTP_410_GONE: get_error_response_example(
+                   error_code="expired_sync_token",
+                   error_description="The specified sync token was expired, please sync all items again."
+               )
+               },
+    dependencies=[Depends(REPORT_VIEWER_PERMISSION)],
+)
+async def get_contact_changes(
+        since: Optional[str] = Query(None, description="Sync token from the previous next_token"),
+        records_per_page: int = Query(MAXIMUM_RECORDS_PER_PAGE,
+                                      description="Maximum number of changed contacts and deleted contact IDs each",
+                                      ge=1,
+                                      le=MAXIMUM_RECORDS_PER_PAGE
+                                      )
+) -> Union[dict, Response]:
+    result: dict = await Mongo.changes(COLLECTION, ContactResponse, since, records_per_page)
+
+    return await JsonResponses.get_response(result)
+
+
+@router.get(
+    "/export",
+    summary="Export contacts sorting by created time in descending order.",
+    description="All contacts that match the keyword are exported as a CSV or newline-delimited JSON file "
+                "which is read with one query."
+                + GrantTypeRequestSentence.AUTHORIZATION_CODE
+                + get_accepted_user_roles_sentence({UserRole.CONTACT_REPORT_VIEWER}),
+    response_class=StreamingResponse,
+    responses={**main_endpoint_responses,
+               status.HTTP_200_OK: {"content": {"text/csv": {}, "application/x-ndjson": {}}}
+               },
+    dependencies=[Depends(REPORT_VIEWER_PERMISSION)],
+)
+async def export_contacts(
         keyword: Optional[str] = Query(None,
                                        description="Keyword for searching contacts by first name, last name, email, "
                                                    "or message"
-                                       )
-) -> dict:
-    await JsonWebToken.get_user_identifier(access_token=authorization.credentials,
-                                           accepted_roles={UserRole.CONTACT_REPORT_VIEWER}
-                                           )
-
-    return await Mongo.list(collection=COLLECTION,
-                            projection_model=ContactResponse,
-                            request=request,
-                            page=page,
-                            records_per_page=records_per_page,
-                            search_fields={"first_name", "last_name", "email", "message"},
-                            keyword=keyword,
-                            sort=[("created_at", pymongo.DESCENDING)]
-                            )
+                                       ),
+        regex: bool = Query(False,
+                            description="Match the keyword as a regular expression instead of a case-insensitive "
+                                        "substring; a regular expression search cannot use an index."
+                            ),
+        export_format: ExportFormat = Query(ExportFormat.CSV, description="Export format", alias="format")
+) -> StreamingResponse:
+    return await get_export_response(__stream_contacts(keyword, regex), export_format, ContactResponse, "contacts")
+
+
+@router.post(
+    "/exports",
+    summary="Create a contact export job.",
+    status_code=status.HTTP_202_ACCEPTED,
+    description="The contacts that match the keyword are exported into a CSV or newline-delimited JSON file "
+                "in the background, so the file can be downloaded from the job later."
+                + GrantTypeRequestSentence.AUTHORIZATION_CODE
+                + get_accepted_user_roles_sentence({UserRole.CONTACT_REPORT_VIEWER}),
+    response_model=ExportJobData,
+    responses=main_endpoint_responses,
+    dependencies=[Depends(REPORT_VIEWER_PERMISSION)],
+)
+async def create_contact_export(*,
+                                request: Request,
+                                response: Response,
+                                claims: AccessTokenClaims = Depends(get_access_token_claims),
+                                export_data: ExportJobCreation
+                                ) -> dict:
+    export_information: dict = export_data.dict()
+    export_information.update({
+        "owner": claims.oid,
+        "search_mode": SearchMode.REGEX if export_data.regex else SearchMode.NGRAM,
+        "status": ExportJobStatus.PENDING,
+        "processed_records": 0,
+        "total_records": None,
+        "file_id": None
+    })
+    result: dict = await Mongo.create(EXPORT_COLLECTION, export_information, ExportJobResponse)
+    response.headers["Location"] = str(request.url) + "/" + result.get("data").get("_id")
+
+    await EXPORT_JOBS.submit(ObjectId(result.get("data").get("_id")))
+
+    return result
+
+
+@router.get(
+    "/exports/{export_id}",
+    summary="Get an own contact export job by export job ID.",
+    description="The job's progress is the number of processed records out of the total records."
+                + GrantTypeRequestSentence.AUTHORIZATION_CODE
+                + get_accepted_user_roles_sentence({UserRole.CONTACT_REPORT_VIEWER}),
+    response_model=ExportJobData,
+    responses=subsidiary_endpoint_responses,
+    dependencies=[Depends(REPORT_VIEWER_PERMISSION)],
+)
+async def get_contact_export(
+        claims: AccessTokenClaims = Depends(get_access_token_claims),
+        export_id: ObjectIdStr = Path(..., description="Export job ID", example="5f43825c66f4c0e20cd17dc3")
+) -> Union[dict, Response]:
+    result: dict = await Mongo.get(EXPORT_COLLECTION, export_id, ExportJobResponse, {"owner": claims.oid})
+
+    return await JsonResponses.get_response(result)
+
+
+@router.get(
+    "/exports/{export_id}/file",
+    summary="Download an own contact export job's file by export job ID.",
+    description="A single byte range can be requested with a Range header to resume a download."
+                + GrantTypeRequestSentence.AUTHORIZATION_CODE
+                + get_accepted_user_roles_sentence({UserRole.CONTACT_REPORT_VIEWER}),
+    response_class=StreamingResponse,
+    responses={**subsidiary_endpoint_responses,
+               status.HTTP_200_OK: {"content": {"text/csv": {}, "application/x-ndjson": {}}},
+               status.HTTP_409_CONFLICT: get_error_response_example(
+                   error_code="export_not_completed",
+                   error_description="The export job has not been completed."
+               ),
+               status.HTTP_416_REQUESTED_RANGE_NOT_SATISFIABLE: get_error_response_example(
+                   error_code="range_not_satisfiable",
+                   error_description="The specified range was not satisfiable."
+               )
+               },
+    dependencies=[Depends(REPORT_VIEWER_PERMISSION)],
+)
+async def download_contact_export(
+        claims: AccessTokenClaims = Depends(get_access_token_claims),
+        export_id: ObjectIdStr = Path(..., description="Export job ID", example="5f43825c66f4c0e20cd17dc3"),
+        range_header: Optional[str] = Header(None, description="Byte range, e.g. bytes=1024-", alias="Range")
+) -> StreamingResponse:
+    export_job: dict = (await Mongo.get(EXPORT_COLLECTION, export_id, ExportJobFile, {"owner": claims.oid})
+                         ).get("data")
+
+    if export_job.get("status") != ExportJobStatus.COMPLETED:
+        raise HTTPResponseException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail={
+                "error_code": "export_not_completed",
+                "error_description": "The export job has not been completed."
+            }
+        )
+
+    file: AsyncIOMotorGridOut = await Mongo.get_file(EXPORT_BUCKET, ObjectId(export_job.get("file_id")))
+
+    return await get_file_streaming_response(file, ExportFormat(export_job.get("format")), "contacts", range_header)
 
 
 @router.post(
@@ -70,17 +335,33 @@ async def get_contacts(
     description=GrantTypeRequestSentence.CLIENT_CREDENTIALS,
     response_model=ContactData,
     responses=main_endpoint_responses,
+    dependencies=[Depends(application_permission)],
 )
 async def create_contact(*,
                          request: Request,
                          response: Response,
-                         authorization: HTTPAuthorizationCredentials = Depends(bearer_token),
                          contact_data: ContactCreation
                          ) -> dict:
-    await JsonWebToken.validate_application_access_token(authorization.credentials)
-
     result: dict = await Mongo.create(COLLECTION, contact_data.dict(), ContactResponse)
     response.status_code = status.HTTP_201_CREATED
     response.headers["Location"] = str(request.url) + "/" + str(result.get("_id"))
 
     return result
+
+
+@router.post(
+    ":batch",
+    summary="Create a batch of contacts.",
+    description=f"Each item must be a contact creation body, and a batch can contain up to {MAXIMUM_BATCH_SIZE} "
+                "items. Each item gets its own status code and error, so an invalid item does not fail the batch."
+                + GrantTypeRequestSentence.CLIENT_CREDENTIALS,
+    response_model=ContactBatchResponse,
+    responses=main_endpoint_responses,
+    dependencies=[Depends(application_permission)],
+)
+async def create_contacts(*,
+                          items: conlist(Any, min_items=1, max_items=MAXIMUM_BATCH_SIZE) = Body(...)
+                          ) -> Union[dict, Response]:
+    result: dict = await create_batch(Mongo, COLLECTION, items, ContactCreation, ContactResponse)
+
+    return await JsonResponses.get_response(result)
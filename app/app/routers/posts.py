@@ -1,20 +1,31 @@
-from typing import Optional
+from typing import Optional, Union, Any
 
-from fastapi import APIRouter, Path, Query, Depends
+from fastapi import APIRouter, Path, Query, Depends, Body, Header
 from fastapi import status
 from fastapi.requests import Request
-from fastapi.responses import Response
-from fastapi.security import HTTPAuthorizationCredentials
+from fastapi.responses import Response, StreamingResponse
 from motor.motor_asyncio import AsyncIOMotorCollection
+from pydantic import conlist
 
+from app.batch import MAXIMUM_BATCH_SIZE, create_batch
+from app.abstract_database import MAXIMUM_RECORDS_PER_PAGE
 from app.database_connections import databases
 from app.documentation import GrantTypeRequestSentence
+from app.etags import get_document_etag, get_list_etag, is_not_modified, get_not_modified_response, \
+    get_etag_conditions
 from app.http_response_exception import HTTPResponseException
-from app.json_web_token import JsonWebToken
-from app.models.post import PostList, PostData, PostCreation, PostPreRelationships, PostUpdate
+from app.json_responses import JsonResponses
+from app.models.authorization import AccessTokenClaims
+from app.models.pagination import TotalRecordsMode
+from app.models.post import PostList, PostData, PostCreation, PostPreRelationships, PostUpdate, PostBatchResponse, \
+    PostChanges
+from app.models.search import SearchMode
+from app.models.streaming import StreamFormat
 from app.mongo import Mongo
-from app.responses import main_endpoint_responses, subsidiary_endpoint_responses
-from app.security import bearer_token
+from app.responses import main_endpoint_responses, subsidiary_endpoint_responses, get_responses, \
+    get_error_response_example
+from app.security import get_access_token_claims, user_permission, application_permission
+from app.streaming import get_streaming_response
 from app.types.object_id import ObjectIdStr
 
 router: APIRouter = APIRouter()
@@ -26,7 +37,9 @@ async def start_up() -> None:
     """Execute this function before execute any functions.
     """
     global COLLECTION
-    COLLECTION = await databases.main_database.set_collection("post")
+    COLLECTION = await databases.main_database.set_collection("post", cache_documents=True, cache_lists=True,
+                                                              keep_tombstones=True
+                                                              )
 
 
 async def __add_owner(relationships: dict, owner: str) -> None:
@@ -50,49 +63,171 @@ async def __add_relationships(post: dict) -> None:
     await __add_owner(relationships, post.pop("owner"))
 
 
-async def __prove_owner(authorization: HTTPAuthorizationCredentials, post_id: str) -> None:
-    """Prove the owner of the post that is specified by post ID.
+async def __get_owner_conditions(claims: AccessTokenClaims) -> dict:
+    """Get the conditions that match only the signed-in user's posts.
 
-    :param authorization: Authorization header
+    :param claims: Signed-in user's access token claims
+    :return: Owner conditions
+    """
+    return {"owner": claims.oid}
+
+
+async def __handle_unmatched_post(error: HTTPResponseException, post_id: str, owner_conditions: dict) -> None:
+    """Handle an error of a write that was conditioned on the post's owner and entity tag.
+
+    A write that did not match any post raises a not found error, so the post is looked up only in this case
+    to tell whether the post does not exist, is owned by another user, or has been changed since its entity tag
+    was got.
+
+    :param error: Write error
     :param post_id: Post ID
-    :raises HTTPResponseException: If the signed-in user was not the post's owner.
+    :param owner_conditions: Owner conditions of the write
+    :raises HTTPResponseException: If the post was not found, the signed-in user was not the post's owner,
+        the post's entity tag did not match, or the write error was another error.
     """
-    owner: str = await JsonWebToken.get_user_identifier(access_token=authorization.credentials)
-    post: dict = await Mongo.get(COLLECTION, post_id, PostPreRelationships)
+    if error.status_code == status.HTTP_404_NOT_FOUND:
+        post: dict = (await Mongo.get(COLLECTION, post_id, PostPreRelationships)).get("data")
+
+        if post.get("owner") != owner_conditions.get("owner"):
+            raise HTTPResponseException(status_code=status.HTTP_403_FORBIDDEN)
 
-    if post.get("data").get("owner") != owner:
-        raise HTTPResponseException(status_code=status.HTTP_403_FORBIDDEN)
+        raise HTTPResponseException(status_code=status.HTTP_412_PRECONDITION_FAILED)
+
+    raise error
 
 
 @router.get(
     "",
     summary="Get posts sorting by updated time in descending order.",
-    description="Posts can be searched by message with regular expression." + GrantTypeRequestSentence.CLIENT_CREDENTIALS,
+    description="Posts can be searched by message with regular expression or text search. "
+                "A page that has not changed since its ETag was got can be revalidated with an If-None-Match header."
+                + GrantTypeRequestSentence.CLIENT_CREDENTIALS,
     response_model=PostList,
-    responses=main_endpoint_responses,
+    responses={**main_endpoint_responses, status.HTTP_304_NOT_MODIFIED: {"description": "Not Modified"}},
+    dependencies=[Depends(application_permission)],
 )
 async def get_posts(
         request: Request,
-        authorization: HTTPAuthorizationCredentials = Depends(bearer_token),
+        response: Response,
         page: int = Query(1, description="Page", ge=1),
-        records_per_page: int = Query(10, description="Records per page", ge=1),
-        keyword: Optional[str] = Query(None, description="Keyword for searching posts by message")
-) -> dict:
-    await JsonWebToken.validate_application_access_token(access_token=authorization.credentials)
-
+        records_per_page: int = Query(10,
+                                      description="Records per page; use the stream endpoint to get more posts "
+                                                  "at once.",
+                                      ge=1,
+                                      le=MAXIMUM_RECORDS_PER_PAGE
+                                      ),
+        keyword: Optional[str] = Query(None, description="Keyword for searching posts by message"),
+        cursor: Optional[str] = Query(None,
+                                      description="Cursor from the previous_cursor or next_cursor link for listing "
+                                                  "posts in cursor mode; the page will be ignored."
+                                      ),
+        total: Optional[TotalRecordsMode] = Query(None,
+                                                  description="How to count the total records; the default is exact "
+                                                              "in page mode and none in cursor mode. An estimated "
+                                                              "total is used only when there is no keyword."
+                                                  ),
+        search: SearchMode = Query(SearchMode.REGEX,
+                                   description="Search mode; regex matches the keyword as a regular expression, "
+                                               "text matches the keyword's words with the message text index."
+                                   ),
+        sort_by_relevance: bool = Query(False,
+                                        description="Sort posts by relevance score instead of updated time "
+                                                    "in text search mode; this is not supported in cursor mode."
+                                        ),
+        if_none_match: Optional[str] = Header(None, description="ETag of the page that the client has",
+                                              alias="If-None-Match"
+                                              )
+) -> Union[dict, Response]:
     result: dict = await Mongo.list(collection=COLLECTION,
                                     projection_model=PostPreRelationships,
                                     request=request,
                                     page=page,
                                     records_per_page=records_per_page,
                                     search_fields={"message"},
-                                    keyword=keyword
+                                    keyword=keyword,
+                                    cursor=cursor,
+                                    total=total,
+                                    search_mode=search,
+                                    sort_by_relevance=sort_by_relevance
                                     )
+    etag: str = get_list_etag(result)
+
+    if is_not_modified(etag, if_none_match):
+        return get_not_modified_response(etag)
 
     for post in result.get("data"):
         await __add_relationships(post)
 
-    return result
+    response.headers["ETag"] = etag
+
+    return await JsonResponses.get_response(result, response=response)
+
+
+@router.get(
+    ":stream",
+    summary="Stream posts sorting by updated time in descending order.",
+    description="All posts that match the keyword are streamed without pagination as a JSON array "
+                "or newline-delimited JSON."
+                + GrantTypeRequestSentence.CLIENT_CREDENTIALS,
+    response_class=StreamingResponse,
+    responses={**main_endpoint_responses,
+               status.HTTP_200_OK: {"content": {"application/json": {}, "application/x-ndjson": {}}}
+               },
+    dependencies=[Depends(application_permission)],
+)
+async def stream_posts(
+        keyword: Optional[str] = Query(None, description="Keyword for searching posts by message"),
+        search: SearchMode = Query(SearchMode.REGEX,
+                                   description="Search mode; regex matches the keyword as a regular expression, "
+                                               "text matches the keyword's words with the message text index."
+                                   ),
+        stream_format: StreamFormat = Query(StreamFormat.JSON, description="Stream format", alias="format")
+) -> StreamingResponse:
+    return await get_streaming_response(Mongo.stream(collection=COLLECTION,
+                                                     projection_model=PostPreRelationships,
+                                                     search_fields={"message"},
+                                                     keyword=keyword,
+                                                     search_mode=search
+                                                     ),
+                                        stream_format,
+                                        __add_relationships
+                                        )
+
+
+@router.get(
+    "/changes",
+    summary="Get the posts that have been created, updated, or deleted since a sync token.",
+    description="Get all posts without a sync token first, then send each next_token as the since parameter "
+                "to get only the later changes. Keep sending the next token right away while has_more is true. "
+                "Changes appear after a few seconds, and a sync token expires after the deletions are forgotten."
+                + GrantTypeRequestSentence.CLIENT_CREDENTIALS,
+    response_model=PostChanges,
+    responses={**main_endpoint_responses,
+               status.HTTP_400_BAD_REQUEST: get_error_response_example(
+                   error_code="invalid_sync_token",
+                   error_description="The specified sync token was invalid."
+               ),
+               status.HTTP_410_GONE: get_error_response_example(
+                   error_code="expired_sync_token",
+                   error_description="The specified sync token was expired, please sync all items again."
+               )
+               },
+    dependencies=[Depends(application_permission)],
+)
+async def get_post_changes(
+        since: Optional[str] = Query(None, description="Sync token from the previous next_token"),
+        records_per_page: int = Query(MAXIMUM_RECORDS_PER_PAGE,
+                                      description="Maximum number of changed posts and deleted post IDs each",
+                                      ge=1,
+                                      le=MAXIMUM_RECORDS_PER_PAGE
+                                      )
+) -> Union[dict, Response]:
+    result: dict = await Mongo.changes(COLLECTION, PostPreRelationships, since, records_per_page)
+
+    for post in result.get("data"):
+        await __add_relationships(post)
+
+    return await JsonResponses.get_response(result)
 
 
 @router.post(
@@ -102,15 +237,16 @@ async def get_posts(
     description=GrantTypeRequestSentence.AUTHORIZATION_CODE,
     response_model=PostData,
     responses=main_endpoint_responses,
+    dependencies=[Depends(user_permission)],
 )
 async def create_post(*,
                       request: Request,
                       response: Response,
-                      authorization: HTTPAuthorizationCredentials = Depends(bearer_token),
+                      claims: AccessTokenClaims = Depends(get_access_token_claims),
                       post_data: PostCreation
                       ) -> dict:
     post_information: dict = post_data.dict()
-    post_information["owner"] = await JsonWebToken.get_user_identifier(access_token=authorization.credentials)
+    post_information["owner"] = claims.oid
     result: dict = await Mongo.create(COLLECTION, post_information, PostPreRelationships)
     response.status_code = status.HTTP_201_CREATED
     response.headers["Location"] = str(request.url) + "/" + str(result.get("_id"))
@@ -120,62 +256,115 @@ async def create_post(*,
     return result
 
 
+@router.post(
+    ":batch",
+    summary="Create a batch of posts.",
+    description=f"Each item must be a post creation body, and a batch can contain up to {MAXIMUM_BATCH_SIZE} items. "
+                "Each item gets its own status code and error, so an invalid item does not fail the batch."
+                + GrantTypeRequestSentence.AUTHORIZATION_CODE,
+    response_model=PostBatchResponse,
+    responses=main_endpoint_responses,
+    dependencies=[Depends(user_permission)],
+)
+async def create_posts(*,
+                       claims: AccessTokenClaims = Depends(get_access_token_claims),
+                       items: conlist(Any, min_items=1, max_items=MAXIMUM_BATCH_SIZE) = Body(...)
+                       ) -> Union[dict, Response]:
+    result: dict = await create_batch(Mongo, COLLECTION, items, PostCreation, PostPreRelationships,
+                                      {"owner": claims.oid}
+                                      )
+
+    for item in result.get("data"):
+        if item.get("data") is not None:
+            await __add_relationships(item.get("data"))
+
+    return await JsonResponses.get_response(result)
+
+
 @router.get(
     "/{post_id}",
     summary="Get a post by post ID.",
-    description=GrantTypeRequestSentence.CLIENT_CREDENTIALS,
+    description="A post that has not changed since its ETag was got can be revalidated with an If-None-Match "
+                "header."
+                + GrantTypeRequestSentence.CLIENT_CREDENTIALS,
     response_model=PostData,
-    responses=subsidiary_endpoint_responses,
+    responses={**subsidiary_endpoint_responses, status.HTTP_304_NOT_MODIFIED: {"description": "Not Modified"}},
+    dependencies=[Depends(application_permission)],
 )
 async def get_post(
-        authorization: HTTPAuthorizationCredentials = Depends(bearer_token),
-        post_id: ObjectIdStr = Path(..., description="Post ID", example="5f43825c66f4c0e20cd17dc3")
-) -> dict:
-    await JsonWebToken.validate_application_access_token(access_token=authorization.credentials)
-
+        response: Response,
+        post_id: ObjectIdStr = Path(..., description="Post ID", example="5f43825c66f4c0e20cd17dc3"),
+        if_none_match: Optional[str] = Header(None, description="ETag of the post that the client has",
+                                              alias="If-None-Match"
+                                              )
+) -> Union[dict, Response]:
     result: dict = await Mongo.get(COLLECTION, post_id, PostPreRelationships)
+    etag: str = get_document_etag(result.get("data"))
+
+    if is_not_modified(etag, if_none_match):
+        return get_not_modified_response(etag)
 
     await __add_relationships(result.get("data"))
 
-    return result
+    response.headers["ETag"] = etag
+
+    return await JsonResponses.get_response(result, response=response)
 
 
 @router.patch(
     "/{post_id}",
     summary="Update an own post by post ID.",
-    description=GrantTypeRequestSentence.AUTHORIZATION_CODE,
+    description="The post is updated only if it has not changed since its ETag was got when an If-Match header is "
+                "sent."
+                + GrantTypeRequestSentence.AUTHORIZATION_CODE,
     response_model=PostData,
-    responses=subsidiary_endpoint_responses,
+    responses={**subsidiary_endpoint_responses, **get_responses({status.HTTP_412_PRECONDITION_FAILED})},
+    dependencies=[Depends(user_permission)],
 )
 async def update_post(
         *,
-        authorization: HTTPAuthorizationCredentials = Depends(bearer_token),
+        response: Response,
+        claims: AccessTokenClaims = Depends(get_access_token_claims),
         post_id: ObjectIdStr = Path(..., description="Post ID", example="5f43825c66f4c0e20cd17dc3"),
+        if_match: Optional[str] = Header(None, description="ETag of the post that the client has", alias="If-Match"),
         post_data: PostUpdate
-) -> dict:
-    await __prove_owner(authorization, post_id)
+) -> Union[dict, Response]:
+    owner_conditions: dict = await __get_owner_conditions(claims)
+    conditions: dict = {**owner_conditions, **get_etag_conditions(post_id, if_match)}
 
-    result = await Mongo.update(COLLECTION, post_id, post_data.dict(), PostPreRelationships)
+    try:
+        result: dict = await Mongo.update(COLLECTION, post_id, post_data.dict(), PostPreRelationships, conditions)
+    except HTTPResponseException as error:
+        await __handle_unmatched_post(error, post_id, owner_conditions)
+
+    response.headers["ETag"] = get_document_etag(result.get("data"))
 
     await __add_relationships(result.get("data"))
 
-    return result
+    return await JsonResponses.get_response(result, response=response)
 
 
 @router.delete(
     "/{post_id}",
     summary="Delete an own post by post ID.",
-    description=GrantTypeRequestSentence.AUTHORIZATION_CODE,
+    description="The post is deleted only if it has not changed since its ETag was got when an If-Match header is "
+                "sent."
+                + GrantTypeRequestSentence.AUTHORIZATION_CODE,
     status_code=status.HTTP_204_NO_CONTENT,
-    responses=subsidiary_endpoint_responses,
+    responses={**subsidiary_endpoint_responses, **get_responses({status.HTTP_412_PRECONDITION_FAILED})},
+    dependencies=[Depends(user_permission)],
 )
 async def delete_post(
         response: Response,
-        authorization: HTTPAuthorizationCredentials = Depends(bearer_token),
-        post_id: ObjectIdStr = Path(..., description="Post ID", example="5f43825c66f4c0e20cd17dc3")
+        claims: AccessTokenClaims = Depends(get_access_token_claims),
+        post_id: ObjectIdStr = Path(..., description="Post ID", example="5f43825c66f4c0e20cd17dc3"),
+        if_match: Optional[str] = Header(None, description="ETag of the post that the client has", alias="If-Match")
 ) -> None:
-    await __prove_owner(authorization, post_id)
-
+    owner_conditions: dict = await __get_owner_conditions(claims)
+    conditions: dict = {**owner_conditions, **get_etag_conditions(post_id, if_match)}
     response.status_code = status.HTTP_204_NO_CONTENT
 
-    await Mongo.delete(COLLECTION, post_id)
+    try:
+        await Mongo.delete(COLLECTION, post_id, conditions)
+    except HTTPResponseException as error:
+        await __handle_unmatched_post(error, post_id, owner_conditions)
@@ -1,12 +1,11 @@
 from fastapi import APIRouter, Depends
-from fastapi.security import HTTPAuthorizationCredentials
 
 from app.documentation import GrantTypeRequestSentence
 from app.external_web_services import call_microsoft_graph_web_service
-from app.json_web_token import JsonWebToken
+from app.models.authorization import AccessTokenClaims
 from app.models.user import UserData
 from app.responses import main_endpoint_responses
-from app.security import bearer_token
+from app.security import get_access_token_claims, user_permission
 
 router = APIRouter()
 
@@ -16,10 +15,11 @@ router = APIRouter()
     summary="Get a signed-in user's profile.",
     description=GrantTypeRequestSentence.AUTHORIZATION_CODE,
     responses=main_endpoint_responses,
-    response_model=UserData
+    response_model=UserData,
+    dependencies=[Depends(user_permission)]
 )
-async def get_signed_in_user_profile(authorization: HTTPAuthorizationCredentials = Depends(bearer_token)) -> dict:
-    identifier: str = await JsonWebToken.get_user_identifier(authorization.credentials)
+async def get_signed_in_user_profile(claims: AccessTokenClaims = Depends(get_access_token_claims)) -> dict:
+    identifier: str = claims.oid
     user: dict = await call_microsoft_graph_web_service(method="GET",
                                                         path=f"/users/{identifier}",
                                                         parameters={
@@ -1,9 +1,13 @@
-from fastapi import HTTPException
+from typing import Optional, Set
+
+from fastapi import HTTPException, Depends
 from fastapi import status
 from fastapi.requests import Request
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 
 from app.http_response_exception import HTTPResponseException
+from app.json_web_token import JsonWebToken
+from app.models.authorization import AccessTokenClaims, UserRole
 
 
 class BearerToken(HTTPBearer):
@@ -30,3 +34,62 @@ class BearerToken(HTTPBearer):
 
 
 bearer_token: BearerToken = BearerToken()
+
+
+async def get_access_token_claims(
+        authorization: HTTPAuthorizationCredentials = Depends(bearer_token)
+) -> AccessTokenClaims:
+    """Get the claims of a request's Bearer token.
+
+    FastAPI caches a dependency's result for a request, so the Bearer token is decoded once per request however many
+    permissions and endpoint parameters depend on its claims.
+
+    :param authorization: Bearer token
+    :return: Access token claims
+    :raises HTTPResponseException: If the Bearer token was invalid.
+    """
+    return await JsonWebToken.get_claims(authorization.credentials)
+
+
+class UserPermission:
+    """A security class for requiring a user access token with any of the accepted roles
+    """
+    __accepted_roles: Optional[Set[UserRole]]
+
+    def __init__(self, accepted_roles: Set[UserRole] = None) -> None:
+        """Initialize this class.
+
+        :param accepted_roles: Accepted user roles ( Any user role is accepted if this is None. )
+        """
+        self.__accepted_roles = accepted_roles
+
+    async def __call__(self, claims: AccessTokenClaims = Depends(get_access_token_claims)) -> AccessTokenClaims:
+        """Require a user access token with any of the accepted roles.
+
+        :param claims: Access token claims
+        :return: Access token claims
+        :raises HTTPResponseException: If the access token was not a user access token with any accepted role.
+        """
+        await JsonWebToken.validate_user_claims(claims, self.__accepted_roles)
+
+        return claims
+
+
+class ApplicationPermission:
+    """A security class for requiring an application or user access token
+    """
+
+    async def __call__(self, claims: AccessTokenClaims = Depends(get_access_token_claims)) -> AccessTokenClaims:
+        """Require an application or user access token.
+
+        :param claims: Access token claims
+        :return: Access token claims
+        :raises HTTPResponseException: If the access token was neither an application nor a user access token.
+        """
+        await JsonWebToken.validate_application_claims(claims)
+
+        return claims
+
+
+user_permission: UserPermission = UserPermission()
+application_permission: ApplicationPermission = ApplicationPermission()
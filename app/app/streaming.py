@@ -0,0 +1,286 @@
+import csv
+import io
+import re
+from typing import AsyncIterator, Optional, Callable, Awaitable, List, Type, Any, Tuple
+
+import orjson
+from fastapi import status
+from fastapi.responses import StreamingResponse
+from pydantic import BaseModel
+
+from app.http_response_exception import HTTPResponseException
+from app.models.streaming import StreamFormat, ExportFormat
+
+STREAM_CHUNK_SIZE: int = 64 * 1024
+__formula_prefixes: tuple = ("=", "+", "-", "@", "\t", "\r")
+__media_types: dict = {
+    StreamFormat.JSON: "application/json",
+    StreamFormat.NDJSON: "application/x-ndjson"
+}
+__export_media_types: dict = {
+    ExportFormat.CSV: "text/csv",
+    ExportFormat.NDJSON: "application/x-ndjson"
+}
+
+
+async def __prepend_document(document: dict, documents: AsyncIterator[dict]) -> AsyncIterator[dict]:
+    """Put a document that was already read back in front of the other documents.
+
+    :param document: Document
+    :param documents: The other documents
+    :return: All documents
+    """
+    yield document
+
+    async for document in documents:
+        yield document
+
+
+async def __encode_documents(documents: AsyncIterator[dict], stream_format: StreamFormat,
+                             transform: Optional[Callable[[dict], Awaitable[None]]]) -> AsyncIterator[bytes]:
+    """Encode documents into chunks of a JSON array or newline-delimited JSON.
+
+    :param documents: Documents
+    :param stream_format: Stream format
+    :param transform: Function that changes each document in place before it is encoded
+    :return: Encoded chunks
+    """
+    json_array: bool = stream_format == StreamFormat.JSON
+    option: Optional[int] = None if json_array else orjson.OPT_APPEND_NEWLINE
+    chunk: List[bytes] = [b"["] if json_array else []
+    chunk_size: int = 0
+    separator: bytes = b""
+
+    async for document in documents:
+        if transform is not None:
+            await transform(document)
+
+        encoded_document: bytes = orjson.dumps(document, default=str, option=option)
+
+        if json_array:
+            chunk.append(separator)
+            separator = b","
+
+        chunk.append(encoded_document)
+        chunk_size += len(encoded_document)
+
+        if chunk_size >= STREAM_CHUNK_SIZE:
+            yield b"".join(chunk)
+
+            chunk = []
+            chunk_size = 0
+
+    if json_array:
+        chunk.append(b"]")
+
+    if bool(chunk):
+        yield b"".join(chunk)
+
+
+async def __get_csv_value(value: Any) -> Any:
+    """Get a CSV value which a spreadsheet application will not evaluate as a formula.
+
+    :param value: Value
+    :return: CSV value
+    """
+    if isinstance(value, str) and value.startswith(__formula_prefixes):
+        return "'" + value
+
+    return value
+
+
+async def __encode_csv(documents: AsyncIterator[dict], projection_model: Type[BaseModel]) -> AsyncIterator[bytes]:
+    """Encode documents into chunks of CSV with a header row of the projection model's field names.
+
+    The CSV starts with a UTF-8 byte order mark, so spreadsheet applications detect its encoding.
+
+    :param documents: Documents
+    :param projection_model: Projection model
+    :return: Encoded chunks
+    """
+    keys: List[str] = [field.alias for field in projection_model.__fields__.values()]
+    buffer: io.StringIO = io.StringIO()
+    writer = csv.writer(buffer)
+
+    buffer.write("\ufeff")
+    writer.writerow(projection_model.__fields__.keys())
+
+    async for document in documents:
+        writer.writerow([await __get_csv_value(document.get(key)) for key in keys])
+
+        if buffer.tell() >= STREAM_CHUNK_SIZE:
+            yield buffer.getvalue().encode()
+
+            buffer.seek(0)
+            buffer.truncate()
+
+    yield buffer.getvalue().encode()
+
+
+async def __get_attachment_headers(filename: str) -> dict:
+    """Get the headers of an attachment response.
+
+    :param filename: Attachment filename
+    :return: Headers
+    """
+    return {"Content-Disposition": f'attachment; filename="{filename}"'}
+
+
+async def __start_documents(documents: AsyncIterator[dict]) -> AsyncIterator[dict]:
+    """Read the first document before a response starts, so an error of the database operation can still be
+    returned as an error response.
+
+    :param documents: Documents
+    :return: All documents
+    :raises HTTPResponseException: If there were some errors during the database operation.
+    """
+    try:
+        return __prepend_document(await documents.__anext__(), documents)
+    except StopAsyncIteration:
+        return documents
+
+
+async def get_streaming_response(documents: AsyncIterator[dict], stream_format: StreamFormat,
+                                 transform: Optional[Callable[[dict], Awaitable[None]]] = None) -> StreamingResponse:
+    """Get a response that streams documents as a JSON array or newline-delimited JSON in chunks,
+    so memory stays constant however many documents there are.
+
+    :param documents: Documents
+    :param stream_format: Stream format
+    :param transform: Function that changes each document in place before it is encoded
+    :return: Streaming response
+    :raises HTTPResponseException: If there were some errors during the database operation.
+    """
+    return StreamingResponse(__encode_documents(await __start_documents(documents), stream_format, transform),
+                             media_type=__media_types.get(stream_format)
+                             )
+
+
+def encode_export(documents: AsyncIterator[dict], export_format: ExportFormat,
+                  projection_model: Type[BaseModel]) -> AsyncIterator[bytes]:
+    """Encode documents into chunks of an export file.
+
+    :param documents: Documents
+    :param export_format: Export format
+    :param projection_model: Projection model of the documents which defines the CSV columns
+    :return: Encoded chunks
+    """
+    if export_format == ExportFormat.CSV:
+        return __encode_csv(documents, projection_model)
+
+    return __encode_documents(documents, StreamFormat.NDJSON, None)
+
+
+async def get_export_response(documents: AsyncIterator[dict], export_format: ExportFormat,
+                              projection_model: Type[BaseModel], filename: str) -> StreamingResponse:
+    """Get a response that streams documents as an export file attachment in chunks,
+    so memory stays constant however many documents there are.
+
+    :param documents: Documents
+    :param export_format: Export format
+    :param projection_model: Projection model of the documents which defines the CSV columns
+    :param filename: Attachment filename without extension
+    :return: Streaming response
+    :raises HTTPResponseException: If there were some errors during the database operation.
+    """
+    return StreamingResponse(encode_export(await __start_documents(documents), export_format, projection_model),
+                             media_type=__export_media_types.get(export_format),
+                             headers=await __get_attachment_headers(f"{filename}.{export_format.value}")
+                             )
+
+
+async def __get_byte_range(range_header: Optional[str], length: int) -> Optional[Tuple[int, int]]:
+    """Get the byte range of a Range header. A Range header that is malformed or has multiple ranges is ignored.
+
+    :param range_header: Range header
+    :param length: File length
+    :return: First and last byte positions ( This will be None if the whole file is requested. )
+    :raises HTTPResponseException: If the byte range was not satisfiable.
+    """
+    matched_range: Optional[re.Match] = None if range_header is None \
+        else re.fullmatch(r"bytes=(\d*)-(\d*)", range_header.strip())
+
+    if matched_range is None:
+        return None
+
+    first_position, last_position = matched_range.groups()
+
+    if first_position == last_position == "" or \
+            first_position != "" and last_position != "" and int(last_position) < int(first_position):
+        return None
+
+    if first_position == "":
+        first, last = max(length - int(last_position), 0), length - 1
+    else:
+        first = int(first_position)
+        last = length - 1 if last_position == "" else min(int(last_position), length - 1)
+
+    if first > last:
+        raise HTTPResponseException(
+            status_code=status.HTTP_416_REQUESTED_RANGE_NOT_SATISFIABLE,
+            detail={
+                "error_code": "range_not_satisfiable",
+                "error_description": "The specified range was not satisfiable."
+            },
+            headers={"Content-Range": f"bytes */{length}"}
+        )
+
+    return first, last
+
+
+async def __read_file(file: Any, first: int, size: int) -> AsyncIterator[bytes]:
+    """Read a part of a file in chunks.
+
+    :param file: File which has an async read method
+    :param first: First byte position
+    :param size: Number of bytes
+    :return: Chunks
+    """
+    file.seek(first)
+
+    while size > 0:
+        chunk: bytes = await file.read(min(size, STREAM_CHUNK_SIZE))
+
+        if not bool(chunk):
+            break
+
+        size -= len(chunk)
+
+        yield chunk
+
+
+async def get_file_streaming_response(file: Any, export_format: ExportFormat, filename: str,
+                                      range_header: Optional[str] = None) -> StreamingResponse:
+    """Get a response that streams a stored export file as an attachment in chunks.
+
+    If a single byte range is requested, only that part of the file will be streamed with a partial content status,
+    so an interrupted download can be resumed.
+
+    :param file: File which has length, seek, and async read
+    :param export_format: Export format
+    :param filename: Attachment filename without extension
+    :param range_header: Range header
+    :return: Streaming response
+    :raises HTTPResponseException: If the requested byte range was not satisfiable.
+    """
+    headers: dict = await __get_attachment_headers(f"{filename}.{export_format.value}")
+    byte_range: Optional[Tuple[int, int]] = await __get_byte_range(range_header, file.length)
+    headers["Accept-Ranges"] = "bytes"
+
+    if byte_range is None:
+        headers["Content-Length"] = str(file.length)
+
+        return StreamingResponse(__read_file(file, 0, file.length),
+                                 media_type=__export_media_types.get(export_format),
+                                 headers=headers
+                                 )
+
+    first, last = byte_range
+    headers["Content-Length"] = str(last - first + 1)
+    headers["Content-Range"] = f"bytes {first}-{last}/{file.length}"
+
+    return StreamingResponse(__read_file(file, first, last - first + 1),
+                             status_code=status.HTTP_206_PARTIAL_CONTENT,
+                             media_type=__export_media_types.get(export_format),
+                             headers=headers
+                             )
@@ -1,12 +1,16 @@
-from datetime import datetime
-from typing import Any, Generator
+from datetime import datetime, tzinfo
+from typing import Any, Generator, Optional
 
 from tzlocal import get_localzone
 
 
 class DatetimeStr(str):
     """This class handles converting a datetime to a string.
+
+    A converted string keeps the stored datetime, whose precision is higher than the string's seconds.
     """
+    __timezone: tzinfo = get_localzone()
+    stored_value: Optional[datetime] = None
 
     @classmethod
     def __get_validators__(cls) -> Generator:
@@ -22,7 +26,22 @@ class DatetimeStr(str):
         :return: Datetime in ISO format
         :raise TypeError: If the specified value is not a datetime.
         """
+        if isinstance(value, cls):
+            return value
+
         if not isinstance(value, datetime):
             raise TypeError("%r is not a datetime." % value)
 
-        return value.astimezone(get_localzone()).isoformat(timespec="seconds")
+        return cls.convert(value)
+
+    @classmethod
+    def convert(cls, value: datetime) -> "DatetimeStr":
+        """Convert a datetime to a string in ISO format in the local timezone which is looked up once.
+
+        :param value: Datetime
+        :return: Datetime in ISO format
+        """
+        converted_value: DatetimeStr = cls(value.astimezone(cls.__timezone).isoformat(timespec="seconds"))
+        converted_value.stored_value = value
+
+        return converted_value
@@ -20,7 +20,19 @@ class ObjectIdStr(str):
         :param value: Value
         :return: Object ID
         """
+        if isinstance(value, cls):
+            return value
+
         if not ObjectId.is_valid(value):
             raise TypeError("%r is not an ObjectId." % value)
 
         return str(value)
+
+    @classmethod
+    def convert(cls, value: ObjectId) -> "ObjectIdStr":
+        """Convert an ObjectId to a string.
+
+        :param value: ObjectId
+        :return: Object ID
+        """
+        return cls(value)
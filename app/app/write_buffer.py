@@ -0,0 +1,108 @@
+import asyncio
+from typing import List, Tuple, Optional, Set, Any
+
+from bson import ObjectId
+from pymongo.errors import PyMongoError, BulkWriteError, WriteError
+
+
+class WriteBuffer:
+    """This class handles group-committing the inserts of a collection.
+
+    Pending inserts are collected until the oldest one has waited for the maximum delay or there are as many as
+    the maximum size, then they are flushed together with one unordered bulk insert. Each caller still waits for
+    its own document only.
+    """
+    __collection: Any
+    __maximum_delay: float
+    __maximum_size: int
+    __pending: List[Tuple[dict, asyncio.Future]]
+    __timer: Optional[asyncio.TimerHandle]
+    __flushes: Set[asyncio.Task]
+
+    def __init__(self, collection: Any, maximum_delay: float, maximum_size: int) -> None:
+        """Initialize this class.
+
+        :param collection: Collection reference
+        :param maximum_delay: Maximum time in seconds that an insert waits for other inserts
+        :param maximum_size: Maximum number of documents in a bulk insert
+        """
+        self.__collection = collection
+        self.__maximum_delay = maximum_delay
+        self.__maximum_size = maximum_size
+        self.__pending = []
+        self.__timer = None
+        self.__flushes = set()
+
+    async def insert(self, document: dict) -> Any:
+        """Insert a document with the next bulk insert.
+
+        :param document: Document
+        :return: Inserted document's ID
+        :raises PyMongoError: If the document could not be inserted.
+        """
+        loop: asyncio.AbstractEventLoop = asyncio.get_event_loop()
+        future: asyncio.Future = loop.create_future()
+
+        if "_id" not in document:
+            document["_id"] = ObjectId()
+
+        self.__pending.append((document, future))
+
+        if len(self.__pending) >= self.__maximum_size:
+            self.__flush_pending()
+        elif self.__timer is None:
+            self.__timer = loop.call_later(self.__maximum_delay, self.__flush_pending)
+
+        return await future
+
+    def __flush_pending(self) -> None:
+        """Start flushing all pending inserts.
+        """
+        if self.__timer is not None:
+            self.__timer.cancel()
+            self.__timer = None
+
+        pending, self.__pending = self.__pending, []
+
+        if bool(pending):
+            flush: asyncio.Task = asyncio.ensure_future(self.__flush(pending))
+            self.__flushes.add(flush)
+            flush.add_done_callback(self.__flushes.discard)
+
+    async def __flush(self, pending: List[Tuple[dict, asyncio.Future]]) -> None:
+        """Flush the specified inserts with one unordered bulk insert and resolve each insert's caller.
+
+        :param pending: Pending inserts
+        """
+        write_errors: dict = {}
+
+        try:
+            await self.__collection.insert_many([document for document, _ in pending], ordered=False)
+        except BulkWriteError as bulk_write_error:
+            for write_error in bulk_write_error.details.get("writeErrors", []):
+                write_errors[write_error.get("index")] = WriteError(write_error.get("errmsg"),
+                                                                   write_error.get("code"),
+                                                                   write_error
+                                                                   )
+        except PyMongoError as database_server_error:
+            for _, future in pending:
+                if not future.done():
+                    future.set_exception(database_server_error)
+
+            return
+
+        for index, (document, future) in enumerate(pending):
+            if future.done():
+                continue
+
+            if index in write_errors:
+                future.set_exception(write_errors[index])
+            else:
+                future.set_result(document.get("_id"))
+
+    async def close(self) -> None:
+        """Flush all pending inserts and wait for all flushes to finish.
+        """
+        self.__flush_pending()
+
+        await asyncio.gather(*self.__flushes, return_exceptions=True)
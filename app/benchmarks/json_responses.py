@@ -0,0 +1,153 @@
+"""Micro-benchmark of encoding list pages in validated and trusted response modes.
+
+Run it from the directory that contains the app package:
+
+    python -m benchmarks.json_responses --records-per-page 100
+"""
+import argparse
+import asyncio
+import json
+import timeit
+from datetime import datetime, timedelta
+from typing import Type, List, Callable
+
+from bson import ObjectId
+from fastapi.responses import JSONResponse
+from fastapi.routing import serialize_response
+from fastapi.utils import create_response_field
+from pydantic import BaseModel
+from pydantic.fields import ModelField
+
+from app.json_responses import TrustedJSONResponse
+from app.models.contact import ContactResponse, ContactList
+from app.models.post import PostPreRelationships, PostList
+from app.projections import get_compiled_projection
+
+
+def get_contact(index: int, time: datetime) -> dict:
+    """Get a contact as it is read from the database.
+
+    :param index: Contact index
+    :param time: Created time
+    :return: Contact
+    """
+    return {
+        "_id": ObjectId(),
+        "first_name": f"Run {index}",
+        "last_name": "Mao Li",
+        "email": f"mao_li_run_{index}@example.com",
+        "message": "I would like to rent a condominium near the BTS station for two years.",
+        "created_at": time,
+        "updated_at": time
+    }
+
+
+def get_post(index: int, time: datetime) -> dict:
+    """Get a post as it is read from the database.
+
+    :param index: Post index
+    :param time: Updated time
+    :return: Post
+    """
+    return {
+        "_id": ObjectId(),
+        "message": f"What is quantum theory? This is the question number {index}.",
+        "owner": "5ac4b08d-f8b7-4d8c-a3bc-16b47e6f3e7f",
+        "created_at": time,
+        "updated_at": time
+    }
+
+
+def get_page(projection_model: Type[BaseModel], get_document: Callable[[int, datetime], dict],
+             records_per_page: int) -> dict:
+    """Get a list page shaped like the one that Mongo.list returns.
+
+    :param projection_model: Projection model
+    :param get_document: Function that gets a document as it is read from the database
+    :param records_per_page: Records per page
+    :return: List page
+    """
+    url: str = "https://example.com/api/v1/items"
+    time: datetime = datetime(2020, 10, 5, 16, 0, 12)
+    documents: List[dict] = [get_compiled_projection(projection_model).convert(
+        get_document(index, time - timedelta(minutes=index))
+    ) for index in range(records_per_page)]
+
+    for document in documents:
+        if "owner" in document:
+            document["relationships"] = {"owner": {"identifier": document.pop("owner")}}
+
+    return {
+        "links": {
+            "first_page": f"{url}?page=1&records_per_page={records_per_page}",
+            "last_page": f"{url}?page=10&records_per_page={records_per_page}",
+            "previous_page": None,
+            "next_page": f"{url}?page=2&records_per_page={records_per_page}",
+            "previous_cursor": None,
+            "next_cursor": "eyJmIjogWyJ1cGRhdGVkX2F0IiwgIl9pZCJdfQ"
+        },
+        "meta": {
+            "current_page": 1,
+            "last_page": 10,
+            "total_records": records_per_page * 10,
+            "total_records_exact": True,
+            "records_per_page": records_per_page,
+            "url": url
+        },
+        "data": documents
+    }
+
+
+def encode_validated(field: ModelField, page: dict) -> bytes:
+    """Encode a page the way FastAPI encodes a returned dictionary.
+
+    :param field: Response field of the route's response model
+    :param page: Page
+    :return: Encoded page
+    """
+    content: dict = asyncio.get_event_loop().run_until_complete(serialize_response(field=field,
+                                                                                   response_content=page
+                                                                                   ))
+
+    return JSONResponse(content).body
+
+
+def encode_trusted(page: dict) -> bytes:
+    """Encode a page in trusted response mode.
+
+    :param page: Page
+    :return: Encoded page
+    """
+    return TrustedJSONResponse(page).body
+
+
+def main() -> None:
+    """Benchmark each list page's encoding and print the results.
+    """
+    parser: argparse.ArgumentParser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--records-per-page", type=int, default=100, help="Records per page")
+    parser.add_argument("--number", type=int, default=200, help="Number of encodings per measurement")
+    parser.add_argument("--repeat", type=int, default=5, help="Number of measurements")
+    arguments: argparse.Namespace = parser.parse_args()
+    pages: dict = {
+        "contacts": (ContactList, get_page(ContactResponse, get_contact, arguments.records_per_page)),
+        "posts": (PostList, get_page(PostPreRelationships, get_post, arguments.records_per_page))
+    }
+
+    for name, (response_model, page) in pages.items():
+        field: ModelField = create_response_field(name=f"Response_{name}", type_=response_model)
+
+        if json.loads(encode_validated(field, page)) != json.loads(encode_trusted(page)):
+            raise AssertionError(f"The {name} page is encoded differently in trusted response mode.")
+
+        validated: float = min(timeit.repeat(lambda: encode_validated(field, page), number=arguments.number,
+                                             repeat=arguments.repeat)) / arguments.number
+        trusted: float = min(timeit.repeat(lambda: encode_trusted(page), number=arguments.number,
+                                           repeat=arguments.repeat)) / arguments.number
+
+        print(f"{name}: {arguments.records_per_page} records per page, validated {validated * 1000:.3f} ms, "
+              f"trusted {trusted * 1000:.3f} ms, {validated / trusted:.1f}x faster")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,260 @@
+"""Benchmark of verifying access tokens with and without the verified claims cache.
+
+The JSON Web Key Set and the OpenID configuration are served by a stubbed HTTP transport, so it runs offline.
+Run it from the directory that contains the app package:
+
+    python -m benchmarks.json_web_token --calls 2000 --concurrency 50 --output results.json
+"""
+import argparse
+import asyncio
+import base64
+import hashlib
+import json
+import os
+import platform
+import statistics
+import time
+import uuid
+from typing import List, Callable, Awaitable, Dict
+
+import cryptography
+import jwt
+import respx
+from cryptography.hazmat.backends import default_backend
+from cryptography.hazmat.primitives.asymmetric import rsa
+from cryptography.hazmat.primitives.asymmetric.rsa import RSAPrivateKey
+from fastapi import status
+from httpx import Response
+
+from app.json_web_token import JsonWebToken
+from app.models.authorization import UserRole
+
+TENANT_ID: str = "ee64f829-1cc2-4fb2-996e-2e0fb78f5f29"
+CLIENT_ID: str = "d665ee86-da44-4d36-8d30-0ad2b5e16bde"
+AUTHORITY: str = f"https://login.microsoftonline.com/{TENANT_ID}"
+ISSUER: str = f"{AUTHORITY}/v2.0"
+JWKS_URI: str = f"{AUTHORITY}/discovery/v2.0/keys"
+
+
+def get_signing_keys(number: int) -> Dict[str, RSAPrivateKey]:
+    """Get RSA signing keys by key ID, the way Azure AD publishes several keys at once.
+
+    :param number: Number of signing keys
+    :return: Signing keys by key ID
+    """
+    keys: Dict[str, RSAPrivateKey] = {}
+
+    for _ in range(number):
+        key: RSAPrivateKey = rsa.generate_private_key(public_exponent=65537, key_size=2048, backend=default_backend())
+        kid: str = base64.urlsafe_b64encode(hashlib.sha1(os.urandom(32)).digest()).decode().rstrip("=")
+        keys[kid] = key
+
+    return keys
+
+
+def get_json_web_key_set(keys: Dict[str, RSAPrivateKey]) -> dict:
+    """Get a JSON Web Key Set of the signing keys' public keys.
+
+    :param keys: Signing keys by key ID
+    :return: JSON Web Key Set
+    """
+    def encode(number: int) -> str:
+        return base64.urlsafe_b64encode(number.to_bytes((number.bit_length() + 7) // 8, "big")).decode().rstrip("=")
+
+    return {"keys": [{
+        "kty": "RSA",
+        "use": "sig",
+        "kid": kid,
+        "x5t": kid,
+        "n": encode(key.public_key().public_numbers().n),
+        "e": encode(key.public_key().public_numbers().e),
+        "issuer": ISSUER
+    } for kid, key in keys.items()]}
+
+
+def get_openid_configuration() -> dict:
+    """Get an OpenID configuration shaped like Azure AD's one.
+
+    :return: OpenID configuration
+    """
+    return {
+        "token_endpoint": f"{AUTHORITY}/oauth2/v2.0/token",
+        "token_endpoint_auth_methods_supported": ["client_secret_post", "private_key_jwt", "client_secret_basic"],
+        "jwks_uri": JWKS_URI,
+        "response_modes_supported": ["query", "fragment", "form_post"],
+        "subject_types_supported": ["pairwise"],
+        "id_token_signing_alg_values_supported": ["RS256"],
+        "response_types_supported": ["code", "id_token", "code id_token", "id_token token"],
+        "scopes_supported": ["openid", "profile", "email", "offline_access"],
+        "issuer": ISSUER,
+        "authorization_endpoint": f"{AUTHORITY}/oauth2/v2.0/authorize",
+        "end_session_endpoint": f"{AUTHORITY}/oauth2/v2.0/logout",
+        "tenant_region_scope": "AS"
+    }
+
+
+def get_access_token(keys: Dict[str, RSAPrivateKey], application: bool = False) -> str:
+    """Get an access token with the claims of an Azure AD v2.0 user or application access token.
+
+    :param keys: Signing keys by key ID
+    :param application: Whether the access token is an application access token
+    :return: Access token
+    """
+    kid: str = list(keys)[-1]
+    current_time: int = int(time.time())
+    claims: dict = {
+        "aud": CLIENT_ID,
+        "iss": ISSUER,
+        "iat": current_time,
+        "nbf": current_time,
+        "exp": current_time + 3600,
+        "aio": base64.b64encode(os.urandom(96)).decode(),
+        "azp": str(uuid.uuid4()),
+        "azpacr": "1",
+        "oid": str(uuid.uuid4()),
+        "rh": "0.AAAAKfhk7sIcsk-ZbS4PsHhfKYbuZdZd2jZEjSs1CtK14Wu9AAA.",
+        "sub": base64.urlsafe_b64encode(os.urandom(32)).decode().rstrip("="),
+        "tid": TENANT_ID,
+        "uti": base64.urlsafe_b64encode(os.urandom(16)).decode().rstrip("="),
+        "ver": "2.0"
+    }
+
+    if application:
+        claims["roles"] = ["access_as_application"]
+    else:
+        claims.update({
+            "name": "Mao Li",
+            "preferred_username": "mao_li@example.com",
+            "scp": "access_as_user",
+            "roles": [UserRole.CONTACT_REPORT_VIEWER.value]
+        })
+
+    return jwt.encode(claims, keys[kid], algorithm="RS256", headers={"kid": kid}).decode()
+
+
+async def measure(call: Callable[[str], Awaitable], access_tokens: List[str], concurrency: int) -> dict:
+    """Measure the latencies and the throughput of calls that share the access tokens round-robin.
+
+    :param call: Function that verifies an access token
+    :param access_tokens: Access tokens
+    :param concurrency: Number of concurrent callers
+    :return: Measurement
+    """
+    latencies: List[float] = []
+    calls: int = len(access_tokens)
+
+    async def call_repeatedly(worker: int) -> None:
+        for index in range(worker, calls, concurrency):
+            started_at: float = time.perf_counter()
+
+            await call(access_tokens[index])
+
+            latencies.append(time.perf_counter() - started_at)
+
+    started_at: float = time.perf_counter()
+
+    await asyncio.gather(*[call_repeatedly(worker) for worker in range(concurrency)])
+
+    elapsed_time: float = time.perf_counter() - started_at
+    percentiles: List[float] = statistics.quantiles(latencies, n=100) if len(latencies) > 1 else latencies * 99
+
+    return {
+        "calls": calls,
+        "concurrency": concurrency,
+        "elapsed_seconds": elapsed_time,
+        "calls_per_second": calls / elapsed_time,
+        "mean_ms": statistics.mean(latencies) * 1000,
+        "p50_ms": percentiles[49] * 1000,
+        "p95_ms": percentiles[94] * 1000,
+        "p99_ms": percentiles[98] * 1000
+    }
+
+
+async def benchmark(arguments: argparse.Namespace) -> dict:
+    """Benchmark verifying user and application access tokens in every cache and token reuse combination.
+
+    :param arguments: Command-line arguments
+    :return: Results
+    """
+    keys: Dict[str, RSAPrivateKey] = get_signing_keys(arguments.keys)
+    operations: Dict[str, Callable[[str], Awaitable]] = {
+        "get_user_identifier": lambda access_token: JsonWebToken.get_user_identifier(
+            access_token, {UserRole.CONTACT_REPORT_VIEWER}
+        ),
+        "validate_application_access_token": JsonWebToken.validate_application_access_token
+    }
+    unique_access_tokens: Dict[str, List[str]] = {
+        operation: [get_access_token(keys, operation != "get_user_identifier") for _ in range(arguments.calls)]
+        for operation in operations
+    }
+    results: List[dict] = []
+    mock_router: respx.MockRouter = respx.mock(assert_all_called=False, assert_all_mocked=True)
+    mock_router.get(f"{AUTHORITY}/v2.0/.well-known/openid-configuration").mock(
+        return_value=Response(status_code=status.HTTP_200_OK, headers={"Cache-Control": "max-age=86400, private"},
+                              json=get_openid_configuration()
+                              )
+    )
+    mock_router.get(JWKS_URI).mock(
+        return_value=Response(status_code=status.HTTP_200_OK, headers={"Cache-Control": "max-age=86400, private"},
+                              json=get_json_web_key_set(keys)
+                              )
+    )
+    os.environ.update({"AZURE_AD_AUTHORITY": AUTHORITY, "AZURE_AD_AUDIENCE": CLIENT_ID})
+
+    with mock_router:
+        for cache_size in [arguments.cache_size, 0]:
+            for operation, call in operations.items():
+                for token_reuse in ["reused", "unique"]:
+                    access_tokens: List[str] = unique_access_tokens.get(operation) if token_reuse == "unique" \
+                        else unique_access_tokens.get(operation)[:1] * arguments.calls
+
+                    for concurrency in [1, arguments.concurrency]:
+                        os.environ["ACCESS_TOKEN_CACHE_SIZE"] = str(cache_size)
+
+                        await JsonWebToken.set_up()
+                        await call(get_access_token(keys, operation != "get_user_identifier"))
+
+                        measurement: dict = await measure(call, access_tokens, concurrency)
+                        results.append({
+                            "operation": operation,
+                            "claims_cache": "enabled" if cache_size > 0 else "disabled",
+                            "access_tokens": token_reuse,
+                            **measurement,
+                            "claims_cache_statistics": await JsonWebToken.get_claims_cache_statistics()
+                        })
+
+        await JsonWebToken.tear_down()
+
+    return {
+        "environment": {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "pyjwt": jwt.__version__,
+            "cryptography": cryptography.__version__
+        },
+        "parameters": vars(arguments),
+        "results": results
+    }
+
+
+def main() -> None:
+    """Benchmark verifying access tokens and print the results as JSON.
+    """
+    parser: argparse.ArgumentParser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--calls", type=int, default=2000, help="Number of calls per measurement")
+    parser.add_argument("--concurrency", type=int, default=50, help="Number of concurrent callers")
+    parser.add_argument("--keys", type=int, default=3, help="Number of published signing keys")
+    parser.add_argument("--cache-size", type=int, default=10000, help="Verified claims cache size when it is enabled")
+    parser.add_argument("--output", help="File that the results are written to instead of the standard output")
+    arguments: argparse.Namespace = parser.parse_args()
+    results: str = json.dumps(asyncio.get_event_loop().run_until_complete(benchmark(arguments)), indent=2)
+
+    if arguments.output is None:
+        print(results)
+    else:
+        with open(arguments.output, "w") as file:
+            file.write(results + "\n")
+
+
+if __name__ == "__main__":
+    main()
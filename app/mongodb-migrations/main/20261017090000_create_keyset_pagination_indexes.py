@@ -0,0 +1,25 @@
+from typing import Final
+
+import pymongo
+from mongodb_migrations.base import BaseMigration
+
+
+class Migration(BaseMigration):
+    """This class handles migrating a MongoDB collection.
+    """
+    COLLECTIONS: Final[dict] = {
+        "post": "updated_at",
+        "contact": "created_at"
+    }
+
+    def upgrade(self):
+        """Upgrade the collections.
+        """
+        for collection, sort_field in self.COLLECTIONS.items():
+            self.db[collection].create_index([(sort_field, pymongo.DESCENDING), ("_id", pymongo.DESCENDING)])
+
+    def downgrade(self):
+        """Downgrade the collections.
+        """
+        for collection, sort_field in self.COLLECTIONS.items():
+            self.db[collection].drop_index([(sort_field, pymongo.DESCENDING), ("_id", pymongo.DESCENDING)])
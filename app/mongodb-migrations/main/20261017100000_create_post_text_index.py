@@ -0,0 +1,21 @@
+from typing import Final
+
+import pymongo
+from mongodb_migrations.base import BaseMigration
+
+
+class Migration(BaseMigration):
+    """This class handles migrating a MongoDB collection.
+    """
+    COLLECTION: Final[str] = "post"
+    INDEX: Final[str] = "message_text"
+
+    def upgrade(self):
+        """Upgrade the collection.
+        """
+        self.db[self.COLLECTION].create_index([("message", pymongo.TEXT)], name=self.INDEX)
+
+    def downgrade(self):
+        """Downgrade the collection.
+        """
+        self.db[self.COLLECTION].drop_index(self.INDEX)
@@ -0,0 +1,41 @@
+from typing import Final, Set, List
+
+from mongodb_migrations.base import BaseMigration
+from pymongo import UpdateOne
+
+from app.ngrams import NGRAM_FIELD, get_document_ngrams
+
+
+class Migration(BaseMigration):
+    """This class handles migrating a MongoDB collection.
+    """
+    COLLECTION: Final[str] = "contact"
+    NGRAM_FIELDS: Final[Set[str]] = {"first_name", "last_name", "email", "message"}
+    BATCH_SIZE: Final[int] = 1000
+
+    def upgrade(self):
+        """Upgrade the collection.
+        """
+        collection = self.db[self.COLLECTION]
+        requests: List[UpdateOne] = []
+
+        for document in collection.find({}, projection=list(self.NGRAM_FIELDS)):
+            requests.append(UpdateOne({"_id": document.get("_id")},
+                                      {"$set": {NGRAM_FIELD: get_document_ngrams(document, self.NGRAM_FIELDS)}}
+                                      ))
+
+            if len(requests) == self.BATCH_SIZE:
+                collection.bulk_write(requests, ordered=False)
+                requests = []
+
+        if bool(requests):
+            collection.bulk_write(requests, ordered=False)
+
+        collection.create_index(NGRAM_FIELD)
+
+    def downgrade(self):
+        """Downgrade the collection.
+        """
+        collection = self.db[self.COLLECTION]
+        collection.drop_index(NGRAM_FIELD + "_1")
+        collection.update_many({}, {"$unset": {NGRAM_FIELD: ""}})
@@ -0,0 +1,34 @@
+from typing import Final
+
+import pymongo
+from mongodb_migrations.base import BaseMigration
+
+from app.abstract_database import TOMBSTONE_RETENTION
+
+
+class Migration(BaseMigration):
+    """This class handles migrating MongoDB collections.
+    """
+    CONTACT_COLLECTION: Final[str] = "contact"
+    TOMBSTONE_COLLECTION: Final[str] = "tombstone"
+    TOMBSTONE_EXPIRATION_INDEX: Final[str] = "deleted_at_expiration"
+
+    def upgrade(self):
+        """Upgrade the collections.
+        """
+        self.db[self.CONTACT_COLLECTION].create_index([("updated_at", pymongo.DESCENDING),
+                                                       ("_id", pymongo.DESCENDING)
+                                                       ])
+        self.db[self.TOMBSTONE_COLLECTION].create_index([("collection", pymongo.ASCENDING),
+                                                         ("deleted_at", pymongo.ASCENDING),
+                                                         ("_id", pymongo.ASCENDING)
+                                                         ])
+        self.db[self.TOMBSTONE_COLLECTION].create_index("deleted_at", name=self.TOMBSTONE_EXPIRATION_INDEX,
+                                                        expireAfterSeconds=int(TOMBSTONE_RETENTION.total_seconds())
+                                                        )
+
+    def downgrade(self):
+        """Downgrade the collections.
+        """
+        self.db[self.CONTACT_COLLECTION].drop_index([("updated_at", pymongo.DESCENDING), ("_id", pymongo.DESCENDING)])
+        self.db[self.TOMBSTONE_COLLECTION].drop()
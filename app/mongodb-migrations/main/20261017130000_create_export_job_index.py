@@ -0,0 +1,24 @@
+from typing import Final
+
+import pymongo
+from mongodb_migrations.base import BaseMigration
+
+
+class Migration(BaseMigration):
+    """This class handles migrating MongoDB collections.
+    """
+    CONTACT_EXPORT_COLLECTION: Final[str] = "contact_export"
+
+    def upgrade(self):
+        """Upgrade the collections.
+        """
+        self.db[self.CONTACT_EXPORT_COLLECTION].create_index([("status", pymongo.ASCENDING),
+                                                              ("updated_at", pymongo.ASCENDING)
+                                                              ])
+
+    def downgrade(self):
+        """Downgrade the collections.
+        """
+        self.db[self.CONTACT_EXPORT_COLLECTION].drop_index([("status", pymongo.ASCENDING),
+                                                            ("updated_at", pymongo.ASCENDING)
+                                                            ])
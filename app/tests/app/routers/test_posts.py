@@ -0,0 +1,127 @@
+from datetime import datetime, timezone
+from typing import Any, Callable, Awaitable
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+from fastapi import status
+from fastapi.responses import Response
+from pytest_mock import MockerFixture
+
+from app.etags import get_document_etag
+from app.http_response_exception import HTTPResponseException
+from app.models.authorization import AccessTokenClaims
+from app.models.post import PostUpdate
+from app.types.datetime import DatetimeStr
+
+pytestmark = pytest.mark.asyncio
+
+POST_ID: str = "5f43825c66f4c0e20cd17dc3"
+OWNER: str = "801af166"
+UPDATED_AT: datetime = datetime(2020, 10, 5, 16, 0, 12, 100000)
+POST: dict = {
+    "_id": POST_ID,
+    "message": "What is quantum theory?",
+    "created_at": DatetimeStr.convert(UPDATED_AT),
+    "updated_at": DatetimeStr.convert(UPDATED_AT),
+    "owner": OWNER
+}
+
+
+@pytest.fixture
+def posts(mocker: MockerFixture) -> Any:
+    """Get the posts router module whose Mongo class is mocked.
+
+    :param mocker: Mocker
+    :return: Posts router module
+    """
+    from app.routers import posts
+
+    mocker.patch.object(posts, "Mongo", MagicMock())
+    mocker.patch.object(posts, "COLLECTION", "post", create=True)
+
+    return posts
+
+
+async def update_post(posts: Any, if_match: str) -> Response:
+    """Update the post as its owner.
+
+    :param posts: Posts router module
+    :param if_match: If-Match header value
+    :return: Response
+    """
+    response: Response = Response()
+
+    await posts.update_post(response=response, claims=AccessTokenClaims(oid=OWNER), post_id=POST_ID,
+                            if_match=if_match, post_data=PostUpdate(message="What is string theory?")
+                            )
+
+    return response
+
+
+async def delete_post(posts: Any, if_match: str) -> Response:
+    """Delete the post as its owner.
+
+    :param posts: Posts router module
+    :param if_match: If-Match header value
+    :return: Response
+    """
+    response: Response = Response()
+
+    await posts.delete_post(response=response, claims=AccessTokenClaims(oid=OWNER), post_id=POST_ID,
+                            if_match=if_match
+                            )
+
+    return response
+
+
+class TestPosts:
+    """This class handles all app.routers.posts module test cases.
+    """
+
+    @pytest.mark.parametrize("operation, method", [(update_post, "update"), (delete_post, "delete")])
+    @pytest.mark.parametrize("post, status_code", [
+        (None, status.HTTP_404_NOT_FOUND),
+        ({**POST, "owner": "7bd3b1f2"}, status.HTTP_403_FORBIDDEN),
+        (POST, status.HTTP_412_PRECONDITION_FAILED)
+    ])
+    async def test_writing_unmatched_post(self, posts: Any, operation: Callable[[Any, str], Awaitable[Response]],
+                                          method: str, post: dict, status_code: int) -> None:
+        """Test updating and deleting a post by its stale entity tag when the post is missing, is owned by another
+        user, or has been changed since the entity tag was got.
+        """
+        setattr(posts.Mongo, method, AsyncMock(side_effect=HTTPResponseException(status.HTTP_404_NOT_FOUND)))
+        posts.Mongo.get = AsyncMock(side_effect=HTTPResponseException(status.HTTP_404_NOT_FOUND)) if post is None \
+            else AsyncMock(return_value={"data": dict(post)})
+
+        with pytest.raises(HTTPResponseException) as exception_information:
+            await operation(posts, get_document_etag(POST))
+
+        assert exception_information.value.status_code == status_code
+        assert getattr(posts.Mongo, method).await_args.args[-1] == {
+            "owner": OWNER, "updated_at": UPDATED_AT.replace(tzinfo=timezone.utc)
+        }
+
+    async def test_writing_post_by_other_error(self, posts: Any) -> None:
+        """Test updating a post when the database fails, which does not look the post up.
+        """
+        posts.Mongo.update = AsyncMock(side_effect=HTTPResponseException(status.HTTP_500_INTERNAL_SERVER_ERROR))
+        posts.Mongo.get = AsyncMock()
+
+        with pytest.raises(HTTPResponseException) as exception_information:
+            await update_post(posts, get_document_etag(POST))
+
+        assert exception_information.value.status_code == status.HTTP_500_INTERNAL_SERVER_ERROR
+        posts.Mongo.get.assert_not_awaited()
+
+    async def test_updating_post_by_etag(self, posts: Any) -> None:
+        """Test updating a post by its current entity tag, which responds with the updated post's entity tag.
+        """
+        updated_post: dict = {**POST, "updated_at": DatetimeStr.convert(UPDATED_AT.replace(microsecond=200000))}
+        posts.Mongo.update = AsyncMock(return_value={"data": dict(updated_post)})
+        posts.Mongo.get = AsyncMock()
+
+        response: Response = await update_post(posts, get_document_etag(POST))
+
+        assert response.headers.get("ETag") == get_document_etag(updated_post)
+        assert response.headers.get("ETag") != get_document_etag(POST)
+        posts.Mongo.get.assert_not_awaited()
@@ -0,0 +1,95 @@
+from typing import Optional
+
+import pytest
+from starlette.requests import Request
+
+from app.abstract_database import AbstractDatabase
+
+pytestmark = pytest.mark.asyncio
+
+URL: str = "http://testserver/items"
+
+
+def get_link(parameter: str, value: Optional[object]) -> Optional[str]:
+    """Get a pagination link of 10 records per page.
+
+    :param parameter: Page or cursor parameter name
+    :param value: Page number or cursor
+    :return: Pagination link ( This will be None if the value is None. )
+    """
+    return None if value is None else f"{URL}?{parameter}={value}&records_per_page=10"
+
+
+class TestAbstractDatabase:
+    """This class handles all app.abstract_database.AbstractDatabase class test cases.
+    """
+    __request: Request = Request({"type": "http", "method": "GET", "scheme": "http", "server": ("testserver", 80),
+                                  "path": "/items", "root_path": "", "query_string": b"page=2&records_per_page=10",
+                                  "headers": []
+                                  })
+
+    @pytest.mark.parametrize("page, total_records, has_next_page, last_page, next_page", [
+        (1, 25, None, 3, 2),
+        (3, 25, None, 3, None),
+        (1, 0, None, 1, None),
+        (2, 25, False, 3, None),
+        (2, None, True, None, 3),
+        (2, None, None, None, None)
+    ])
+    async def test_getting_page_pagination(self, page: int, total_records: Optional[int],
+                                           has_next_page: Optional[bool], last_page: Optional[int],
+                                           next_page: Optional[int]) -> None:
+        """Test getting the pagination of a page whose total records are counted or not counted, and whose next page
+        is computed from the total records or is specified.
+        """
+        pagination: dict = await AbstractDatabase._get_pagination(self.__request, page, 10, total_records,
+                                                                  total_records is not None, has_next_page,
+                                                                  None, "bmV4dA"
+                                                                  )
+
+        assert pagination == {
+            "links": {
+                "first_page": get_link("page", 1),
+                "last_page": get_link("page", last_page),
+                "previous_page": get_link("page", page - 1 if page > 1 else None),
+                "next_page": get_link("page", next_page),
+                "previous_cursor": None,
+                "next_cursor": "bmV4dA"
+            },
+            "meta": {
+                "current_page": page,
+                "last_page": last_page,
+                "total_records": total_records,
+                "total_records_exact": total_records is not None,
+                "records_per_page": 10,
+                "url": URL
+            }
+        }
+
+    @pytest.mark.parametrize("previous_cursor, next_cursor", [(None, "bmV4dA"), ("cHJldmlvdXM", None)])
+    async def test_getting_cursor_pagination(self, previous_cursor: Optional[str],
+                                             next_cursor: Optional[str]) -> None:
+        """Test getting the pagination of a page that was listed in cursor mode, which has cursor links only.
+        """
+        pagination: dict = await AbstractDatabase._get_pagination(self.__request, None, 10, 40, False, None,
+                                                                  previous_cursor, next_cursor
+                                                                  )
+
+        assert pagination == {
+            "links": {
+                "first_page": get_link("page", 1),
+                "last_page": None,
+                "previous_page": get_link("cursor", previous_cursor),
+                "next_page": get_link("cursor", next_cursor),
+                "previous_cursor": previous_cursor,
+                "next_cursor": next_cursor
+            },
+            "meta": {
+                "current_page": None,
+                "last_page": None,
+                "total_records": 40,
+                "total_records_exact": False,
+                "records_per_page": 10,
+                "url": URL
+            }
+        }
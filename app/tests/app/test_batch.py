@@ -0,0 +1,65 @@
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+from fastapi import status
+
+from app.batch import create_batch
+from app.models.post import PostCreation, PostPreRelationships
+
+pytestmark = pytest.mark.asyncio
+
+
+class TestBatch:
+    """This class handles all app.batch module test cases.
+    """
+
+    async def test_creating_batch(self) -> None:
+        """Test creating a batch which has valid and invalid items.
+        """
+        created_post: dict = {"_id": "5f43825c66f4c0e20cd17dc3", "message": "What is quantum theory?"}
+        database: MagicMock = MagicMock()
+        database.create_many = AsyncMock(return_value=[
+            {"status_code": status.HTTP_201_CREATED, "data": created_post, "error": None}
+        ])
+        items: list = [{"message": "Too short"}, {"message": "What is quantum theory?"}]
+
+        result: dict = await create_batch(database, "post", items, PostCreation, PostPreRelationships,
+                                          {"owner": "801af166"}
+                                          )
+
+        database.create_many.assert_awaited_once_with(
+            "post", [{"message": "What is quantum theory?", "owner": "801af166"}], PostPreRelationships
+        )
+        assert result.get("data")[0].get("index") == 0
+        assert result.get("data")[0].get("status_code") == status.HTTP_422_UNPROCESSABLE_ENTITY
+        assert result.get("data")[0].get("error").get("error_code") == "invalid_item"
+        assert result.get("data")[1] == {"index": 1, "status_code": status.HTTP_201_CREATED, "data": created_post,
+                                         "error": None}
+
+    async def test_creating_batch_without_valid_items(self) -> None:
+        """Test creating a batch which does not have any valid items.
+        """
+        database: MagicMock = MagicMock()
+        database.create_many = AsyncMock()
+
+        result: dict = await create_batch(database, "post", [{}], PostCreation, PostPreRelationships)
+
+        database.create_many.assert_not_awaited()
+        assert result.get("data")[0].get("error").get("error_description") == "message: field required"
+
+    async def test_creating_batch_with_non_object_items(self) -> None:
+        """Test creating a batch whose items are not objects, which gets an error result for each of them.
+        """
+        database: MagicMock = MagicMock()
+        database.create_many = AsyncMock()
+
+        result: dict = await create_batch(database, "post", ["What is quantum theory?", None, 1],
+                                          PostCreation, PostPreRelationships
+                                          )
+
+        database.create_many.assert_not_awaited()
+        assert [item.get("index") for item in result.get("data")] == [0, 1, 2]
+        assert all(item.get("status_code") == status.HTTP_422_UNPROCESSABLE_ENTITY for item in result.get("data"))
+        assert all(item.get("error") == {"error_code": "invalid_item",
+                                         "error_description": "The item must be an object."
+                                         } for item in result.get("data"))
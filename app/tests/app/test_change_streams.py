@@ -0,0 +1,195 @@
+import asyncio
+import os
+from typing import List, Optional
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+from pymongo.errors import AutoReconnect, OperationFailure
+
+from app import change_streams
+from app.change_streams import ChangeStreamListener
+
+pytestmark = pytest.mark.asyncio
+
+
+class ChangeStream:
+    """This class handles imitating a change stream which reports the specified changes once.
+    """
+    alive: bool
+    resume_token: Optional[dict]
+    __changes: list
+
+    def __init__(self, changes: list, resume_token: Optional[dict]) -> None:
+        """Initialize this class.
+
+        :param changes: Change events or errors
+        :param resume_token: Resume token that this change stream was opened with
+        """
+        self.alive = True
+        self.resume_token = resume_token
+        self.__changes = list(changes)
+
+    async def try_next(self) -> Optional[dict]:
+        """Get the next change event.
+
+        :return: Change event ( This will be None if there is no change event. )
+        :raises PyMongoError: If an error is reported.
+        """
+        await asyncio.sleep(0)
+
+        if not bool(self.__changes):
+            return None
+
+        change = self.__changes.pop(0)
+
+        if isinstance(change, Exception):
+            self.alive = False
+
+            raise change
+
+        if change.get("operationType") == "invalidate":
+            self.alive = False
+        else:
+            self.resume_token = change.get("_id")
+
+        return change
+
+    async def close(self) -> None:
+        """Close this change stream.
+        """
+        self.alive = False
+
+
+def get_collection(streams: List[list]) -> MagicMock:
+    """Get a collection whose change stream reports the specified changes every time it is opened.
+
+    :param streams: Changes of each opened change stream
+    :return: Collection
+    """
+    collection: MagicMock = MagicMock()
+    collection.name = "post"
+    collection.watch = MagicMock(side_effect=lambda pipeline, resume_after: ChangeStream(
+        streams.pop(0) if bool(streams) else [], resume_after
+    ))
+
+    return collection
+
+
+class TestChangeStreamListener:
+    """This class handles all app.change_streams.ChangeStreamListener class test cases.
+    """
+
+    async def test_handling_changes(self) -> None:
+        """Test handling a gap once the change stream is opened at start, then handling the changes.
+        """
+        changes: list = [{"_id": {"_data": "1"}, "operationType": "update", "documentKey": {"_id": 1}},
+                         {"_id": {"_data": "2"}, "operationType": "delete", "documentKey": {"_id": 2}}
+                         ]
+        collection: MagicMock = get_collection([changes])
+        change_handler: AsyncMock = AsyncMock()
+        gap_handler: AsyncMock = AsyncMock()
+        listener: ChangeStreamListener = ChangeStreamListener(collection, change_handler, gap_handler)
+
+        await listener.start()
+        await asyncio.sleep(0.05)
+        await listener.stop()
+
+        assert collection.watch.call_args_list[0].kwargs.get("resume_after") is None
+        assert [call.args[0] for call in change_handler.await_args_list] == changes
+        gap_handler.assert_awaited_once()
+
+    async def test_resuming_after_interruption(self, mocker) -> None:
+        """Test handling a gap and resuming from the latest resume token after the change stream was interrupted.
+        """
+        mocker.patch.object(change_streams, "CHANGE_STREAM_RETRY_DELAY", 0)
+        collection: MagicMock = get_collection([
+            [{"_id": {"_data": "1"}, "operationType": "update", "documentKey": {"_id": 1}}, AutoReconnect()],
+            [{"_id": {"_data": "2"}, "operationType": "update", "documentKey": {"_id": 2}}]
+        ])
+        change_handler: AsyncMock = AsyncMock()
+        gap_handler: AsyncMock = AsyncMock()
+        listener: ChangeStreamListener = ChangeStreamListener(collection, change_handler, gap_handler)
+
+        await listener.start()
+        await asyncio.sleep(0.05)
+        await listener.stop()
+
+        assert [call.kwargs.get("resume_after") for call in collection.watch.call_args_list] == [None, {"_data": "1"}]
+        assert change_handler.await_count == 2
+        assert gap_handler.await_count == 2
+
+    async def test_restarting_after_unresumable_error(self, mocker) -> None:
+        """Test forgetting the resume token when the change stream could not be resumed from it.
+        """
+        mocker.patch.object(change_streams, "CHANGE_STREAM_RETRY_DELAY", 0)
+        collection: MagicMock = get_collection([
+            [{"_id": {"_data": "1"}, "operationType": "update", "documentKey": {"_id": 1}}, AutoReconnect()],
+            [OperationFailure("Resume point lost", 286)],
+            []
+        ])
+        gap_handler: AsyncMock = AsyncMock()
+        listener: ChangeStreamListener = ChangeStreamListener(collection, AsyncMock(), gap_handler)
+
+        await listener.start()
+        await asyncio.sleep(0.05)
+        await listener.stop()
+
+        assert [call.kwargs.get("resume_after") for call in collection.watch.call_args_list[:3]] == [
+            None, {"_data": "1"}, None
+        ]
+        assert gap_handler.await_count == 3
+
+    async def test_reopening_invalidated_change_stream(self) -> None:
+        """Test handling a gap and reopening the change stream from the current time after it was invalidated.
+        """
+        collection: MagicMock = get_collection([[{"_id": {"_data": "1"}, "operationType": "invalidate"}]])
+        change_handler: AsyncMock = AsyncMock()
+        gap_handler: AsyncMock = AsyncMock()
+        listener: ChangeStreamListener = ChangeStreamListener(collection, change_handler, gap_handler)
+
+        await listener.start()
+        await asyncio.sleep(0.05)
+        await listener.stop()
+
+        assert collection.watch.call_count > 1
+        assert collection.watch.call_args.kwargs.get("resume_after") is None
+        change_handler.assert_not_awaited()
+        assert gap_handler.await_count == 2
+
+    @pytest.mark.skipif(os.getenv("MONGO_REPLICA_SET_URL") is None,
+                        reason="MONGO_REPLICA_SET_URL environment variable is not set."
+                        )
+    async def test_listening_to_replica_set(self) -> None:
+        """Test listening to a real change stream of a replica set, e.g. a local single-node replica set which is
+        started with `mongod --replSet rs0` and `rs.initiate()`, whose URL is set in MONGO_REPLICA_SET_URL.
+        """
+        from motor.motor_asyncio import AsyncIOMotorClient
+
+        client: AsyncIOMotorClient = AsyncIOMotorClient(os.getenv("MONGO_REPLICA_SET_URL"))
+        database = client["change_stream_test"]
+        change_handler: AsyncMock = AsyncMock()
+        gap_handler: AsyncMock = AsyncMock()
+        listener: ChangeStreamListener = ChangeStreamListener(database["post"], change_handler, gap_handler)
+
+        try:
+            await listener.start()
+            await asyncio.sleep(1)
+
+            inserted_id = (await database["post"].insert_one({"message": "Run"})).inserted_id
+
+            await database["post"].update_one({"_id": inserted_id}, {"$set": {"message": "Mao"}})
+
+            for _ in range(50):
+                if change_handler.await_count > 0:
+                    break
+
+                await asyncio.sleep(0.1)
+
+            await listener.stop()
+
+            assert change_handler.await_args.args[0].get("operationType") == "update"
+            assert change_handler.await_args.args[0].get("documentKey") == {"_id": inserted_id}
+            gap_handler.assert_awaited_once()
+        finally:
+            await client.drop_database("change_stream_test")
+            client.close()
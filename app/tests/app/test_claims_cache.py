@@ -0,0 +1,55 @@
+import time
+
+from app.claims_cache import ClaimsCache
+
+
+class TestClaimsCache:
+    """This class handles all app.claims_cache.ClaimsCache class test cases.
+    """
+
+    def test_getting_cached_claims(self) -> None:
+        """Test getting a copy of an access token's cached claims until the access token expires.
+        """
+        claims_cache: ClaimsCache = ClaimsCache(10)
+        current_time: float = time.time()
+
+        assert claims_cache.get("token") is None
+
+        claims_cache.put("token", {"oid": "user-1", "nbf": current_time - 1, "exp": current_time + 60})
+        claims: dict = claims_cache.get("token")
+        claims.pop("oid")
+
+        assert claims_cache.get("token").get("oid") == "user-1"
+        assert claims_cache.statistics == {"size": 1, "hits": 2, "misses": 1, "evictions": 0, "expirations": 0,
+                                           "hit_rate": 2 / 3
+                                           }
+
+    def test_not_serving_expired_and_immature_claims(self) -> None:
+        """Test not serving the claims of an expired access token or an access token that is not valid yet.
+        """
+        claims_cache: ClaimsCache = ClaimsCache(10)
+        current_time: float = time.time()
+        claims_cache.put("expired", {"nbf": current_time - 60, "exp": current_time - 1})
+        claims_cache.put("immature", {"nbf": current_time + 60, "exp": current_time + 120})
+
+        assert claims_cache.get("expired") is None
+        assert claims_cache.get("immature") is None
+        assert claims_cache.statistics == {"size": 1, "hits": 0, "misses": 2, "evictions": 0, "expirations": 1,
+                                           "hit_rate": 0.0
+                                           }
+
+    def test_evicting_claims(self) -> None:
+        """Test evicting the least recently used claims, and not caching any claims when the cache is disabled.
+        """
+        claims_cache: ClaimsCache = ClaimsCache(1)
+        disabled_claims_cache: ClaimsCache = ClaimsCache(0)
+        current_time: float = time.time()
+
+        for access_token in ["first", "second"]:
+            claims_cache.put(access_token, {"nbf": current_time, "exp": current_time + 60})
+            disabled_claims_cache.put(access_token, {"nbf": current_time, "exp": current_time + 60})
+
+        assert claims_cache.get("first") is None
+        assert claims_cache.get("second") is not None
+        assert claims_cache.statistics.get("evictions") == 1
+        assert disabled_claims_cache.statistics.get("size") == 0
@@ -0,0 +1,69 @@
+from datetime import datetime
+
+import pytest
+from bson import ObjectId
+
+from app.cursors import CursorDirection, encode_cursor, decode_cursor
+
+
+class TestCursors:
+    """This class handles all app.cursors module test cases.
+    """
+    __sort_fields: list = ["updated_at", "_id"]
+
+    def test_decoding_encoded_cursor(self) -> None:
+        """Test decoding an encoded cursor.
+        """
+        values: list = [datetime(2021, 2, 11, 10, 28, 23, 123000), ObjectId("5f43825c66f4c0e20cd17dc3")]
+        cursor: str = encode_cursor(self.__sort_fields, values, CursorDirection.PREVIOUS)
+        decoded_values, direction = decode_cursor(cursor, self.__sort_fields)
+
+        assert "=" not in cursor
+        assert decoded_values[0].replace(tzinfo=None) == values[0]
+        assert decoded_values[1] == values[1]
+        assert direction == CursorDirection.PREVIOUS
+
+    def test_decoding_cursor_with_other_sort_fields(self) -> None:
+        """Test decoding a cursor that was created for other sort fields.
+        """
+        cursor: str = encode_cursor(["created_at", "_id"], [datetime(2021, 2, 11), ObjectId()], CursorDirection.NEXT)
+
+        with pytest.raises(ValueError, match="The cursor does not match the sort fields."):
+            decode_cursor(cursor, self.__sort_fields)
+
+    @pytest.mark.parametrize("cursor", ["not a cursor", "bm90IGpzb24", "eyJmIjogWyJ1cGRhdGVkX2F0Il19"])
+    def test_decoding_malformed_cursor(self, cursor: str) -> None:
+        """Test decoding a malformed cursor.
+
+        :param cursor: Malformed cursor
+        """
+        with pytest.raises(ValueError):
+            decode_cursor(cursor, self.__sort_fields)
+
+    @pytest.mark.parametrize("values", [
+        [{"$gt": datetime(2021, 2, 11)}, ObjectId()],
+        [datetime(2021, 2, 11), {"$exists": True}],
+        [datetime(2021, 2, 11), [ObjectId()]],
+        ["2021-02-11T10:28:23", ObjectId()]
+    ])
+    def test_decoding_cursor_with_values_of_other_types(self, values: list) -> None:
+        """Test decoding a cursor whose values could be read as query operators or do not match the fields' types.
+
+        :param values: Values of other types
+        """
+        cursor: str = encode_cursor(self.__sort_fields, values, CursorDirection.NEXT)
+
+        with pytest.raises(ValueError, match="types"):
+            decode_cursor(cursor, self.__sort_fields)
+
+    def test_decoding_cursor_of_untyped_field(self) -> None:
+        """Test decoding a cursor whose untyped sort field has a scalar value but not a document.
+        """
+        sort_fields: list = ["last_name", "_id"]
+
+        assert decode_cursor(encode_cursor(sort_fields, ["Li", ObjectId("5f43825c66f4c0e20cd17dc3")],
+                                           CursorDirection.NEXT), sort_fields)[0][0] == "Li"
+
+        with pytest.raises(ValueError):
+            decode_cursor(encode_cursor(sort_fields, [{"$regex": "^L"}, ObjectId()], CursorDirection.NEXT),
+                          sort_fields)
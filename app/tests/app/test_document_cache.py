@@ -0,0 +1,87 @@
+from pydantic import BaseModel
+
+from app.document_cache import DocumentCache
+
+
+class Item(BaseModel):
+    name: str
+
+
+class ItemName(BaseModel):
+    name: str
+
+
+class TestDocumentCache:
+    """This class handles all app.document_cache.DocumentCache class test cases.
+    """
+
+    def test_getting_cached_document(self) -> None:
+        """Test getting a copy of a cached document.
+        """
+        document_cache: DocumentCache = DocumentCache(10, 60)
+
+        assert document_cache.get("run", Item) is None
+
+        document_cache.put("run", Item, {"name": "Run"}, document_cache.version)
+        document: dict = document_cache.get("run", Item)
+        document["name"] = "Mao"
+
+        assert document_cache.get("run", Item) == {"name": "Run"}
+        assert document_cache.get("run", ItemName) is None
+        assert document_cache.statistics == {"size": 1, "hits": 2, "misses": 2, "evictions": 0, "expirations": 0}
+
+    def test_evicting_least_recently_used_document(self) -> None:
+        """Test evicting the least recently used document when the cache is full.
+        """
+        document_cache: DocumentCache = DocumentCache(2, 60)
+        document_cache.put("run", Item, {"name": "Run"}, document_cache.version)
+        document_cache.put("mao", Item, {"name": "Mao"}, document_cache.version)
+        document_cache.get("run", Item)
+        document_cache.put("li", Item, {"name": "Li"}, document_cache.version)
+
+        assert document_cache.get("mao", Item) is None
+        assert document_cache.get("run", Item) == {"name": "Run"}
+        assert document_cache.statistics.get("evictions") == 1
+
+    def test_expiring_document(self) -> None:
+        """Test expiring a document after the time to live.
+        """
+        document_cache: DocumentCache = DocumentCache(10, 0)
+        document_cache.put("run", Item, {"name": "Run"}, document_cache.version)
+
+        assert document_cache.get("run", Item) is None
+        assert document_cache.statistics.get("expirations") == 1
+
+    def test_invalidating_document(self) -> None:
+        """Test invalidating all projections of a document.
+        """
+        document_cache: DocumentCache = DocumentCache(10, 60)
+        document_cache.put("run", Item, {"name": "Run"}, document_cache.version)
+        document_cache.put("run", ItemName, {"name": "Run"}, document_cache.version)
+        document_cache.invalidate("run")
+
+        assert document_cache.get("run", Item) is None
+        assert document_cache.get("run", ItemName) is None
+
+    def test_putting_document_read_before_invalidation(self) -> None:
+        """Test that a document which was read before an invalidation is not cached.
+        """
+        document_cache: DocumentCache = DocumentCache(10, 60)
+        version: int = document_cache.version
+        document_cache.invalidate("run")
+        document_cache.put("run", Item, {"name": "Run"}, version)
+
+        assert document_cache.get("run", Item) is None
+
+    def test_clearing_cache(self) -> None:
+        """Test clearing all cached documents, so a document that was read before the clearing is not cached.
+        """
+        document_cache: DocumentCache = DocumentCache(10, 60)
+        version: int = document_cache.version
+        document_cache.put("run", Item, {"name": "Run"}, version)
+
+        document_cache.clear()
+        document_cache.put("mao", Item, {"name": "Mao"}, version)
+
+        assert document_cache.get("run", Item) is None
+        assert document_cache.get("mao", Item) is None
@@ -0,0 +1,114 @@
+import time
+from datetime import datetime, timezone, timedelta
+from typing import Iterator
+
+import pytest
+from fastapi import status
+
+from app.etags import get_document_etag, get_list_etag, is_not_modified, get_not_modified_response, \
+    get_etag_conditions
+from app.http_response_exception import HTTPResponseException
+from app.types.datetime import DatetimeStr
+
+
+@pytest.fixture
+def local_timezone(request: pytest.FixtureRequest, monkeypatch: pytest.MonkeyPatch) -> Iterator[timedelta]:
+    """Set the local timezone to a fixed offset from UTC, the way a container's TZ environment variable does.
+
+    :param request: Request which has the offset from UTC in hours
+    :param monkeypatch: Monkeypatch
+    :return: Offset from UTC
+    """
+    offset: timedelta = timedelta(hours=request.param)
+    monkeypatch.setenv("TZ", f"<{request.param:+03d}>{-request.param}")
+    monkeypatch.setattr(DatetimeStr, "_DatetimeStr__timezone", timezone(offset))
+    time.tzset()
+
+    yield offset
+
+    monkeypatch.undo()
+    time.tzset()
+
+
+class TestEtags:
+    """This class handles all app.etags module test cases.
+    """
+    __post_id: str = "5f43825c66f4c0e20cd17dc3"
+    __updated_at: datetime = datetime(2020, 10, 5, 16, 0, 12, 100000)
+    __post: dict = {"_id": "5f43825c66f4c0e20cd17dc3", "updated_at": DatetimeStr.convert(__updated_at)}
+
+    def test_getting_document_etag(self) -> None:
+        """Test getting a document's strong entity tag from its ID and stored updated time in milliseconds.
+        """
+        etag: str = get_document_etag(self.__post)
+        updated_post: dict = {**self.__post,
+                              "updated_at": DatetimeStr.convert(self.__updated_at + timedelta(milliseconds=800))
+                              }
+
+        assert etag == f'"{self.__post_id}-1601913612100"'
+        assert updated_post.get("updated_at") == self.__post.get("updated_at")
+        assert get_document_etag(updated_post) != etag
+        assert not is_not_modified(get_document_etag(updated_post), etag)
+
+    def test_getting_list_etag(self) -> None:
+        """Test getting a page's weak entity tag which changes with the page's documents and total records.
+        """
+        page: dict = {"data": [self.__post], "meta": {"total_records": 1}, "links": {"next_page": None}}
+        etag: str = get_list_etag(page)
+
+        assert etag.startswith('W/"')
+        assert get_list_etag({**page, "data": [dict(self.__post)]}) == etag
+        assert get_list_etag({**page, "meta": {"total_records": 2}}) != etag
+        assert get_list_etag({**page, "data": []}) != etag
+
+    def test_checking_not_modified(self) -> None:
+        """Test checking an If-None-Match header with the weak comparison.
+        """
+        etag: str = get_document_etag(self.__post)
+        response = get_not_modified_response(etag)
+
+        assert not is_not_modified(etag, None)
+        assert is_not_modified(etag, f'"other", W/{etag}')
+        assert is_not_modified(etag, "*")
+        assert not is_not_modified(etag, 'W/"other"')
+        assert response.status_code == status.HTTP_304_NOT_MODIFIED
+        assert response.body == b""
+        assert response.headers.get("ETag") == etag
+
+    def test_getting_etag_conditions(self) -> None:
+        """Test getting the conditions that match a document's exact stored updated time.
+        """
+        etag: str = get_document_etag(self.__post)
+        other_etag: str = f'"{self.__post_id}-1601913612101"'
+
+        assert get_etag_conditions(self.__post_id, None) == {}
+        assert get_etag_conditions(self.__post_id, "*") == {}
+        assert get_etag_conditions(self.__post_id, etag) == {
+            "updated_at": datetime(2020, 10, 5, 16, 0, 12, 100000, tzinfo=timezone.utc)
+        }
+        assert get_etag_conditions(self.__post_id, f"{etag}, {other_etag}") == {"updated_at": {"$in": [
+            datetime(2020, 10, 5, 16, 0, 12, 100000, tzinfo=timezone.utc),
+            datetime(2020, 10, 5, 16, 0, 12, 101000, tzinfo=timezone.utc)
+        ]}}
+
+    @pytest.mark.parametrize("local_timezone", [7, 0, -5], indirect=True)
+    def test_getting_etag_conditions_in_local_timezone(self, local_timezone: timedelta) -> None:
+        """Test getting the conditions of a document's entity tag which match the document's stored updated time
+        whatever the local timezone is.
+        """
+        post: dict = {"_id": self.__post_id, "updated_at": DatetimeStr.convert(self.__updated_at)}
+
+        assert get_etag_conditions(self.__post_id, get_document_etag(post)) == {
+            "updated_at": self.__updated_at.replace(tzinfo=timezone.utc)
+        }
+
+    def test_getting_etag_conditions_of_other_document(self) -> None:
+        """Test getting the conditions of an If-Match header that has no entity tag of the document, or has the
+        document's entity tag as a weak entity tag which never matches with the strong comparison.
+        """
+        for if_match in ['"5f43825c66f4c0e20cd17dc4-1601913612100", "malformed"',
+                         f"W/{get_document_etag(self.__post)}"]:
+            with pytest.raises(HTTPResponseException) as exception_information:
+                get_etag_conditions(self.__post_id, if_match)
+
+            assert exception_information.value.status_code == status.HTTP_412_PRECONDITION_FAILED
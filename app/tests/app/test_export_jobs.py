@@ -0,0 +1,180 @@
+import asyncio
+from typing import AsyncIterator
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+from bson import ObjectId
+from pydantic import BaseModel
+from pymongo.errors import AutoReconnect
+
+from app.export_jobs import ExportJobs
+from app.models.export import ExportJobStatus
+
+pytestmark = pytest.mark.asyncio
+
+
+class Item(BaseModel):
+    name: str
+
+
+async def get_items(*_) -> AsyncIterator[dict]:
+    """Get items.
+
+    :return: Items
+    """
+    yield {"name": "Run"}
+    yield {"name": "Mao"}
+
+
+async def get_found_jobs(*found_jobs: dict) -> AsyncIterator[dict]:
+    """Get found jobs.
+
+    :param found_jobs: Found jobs
+    :return: Found jobs
+    """
+    for job in found_jobs:
+        yield job
+
+
+async def run_job(database: MagicMock, jobs: MagicMock, bucket: MagicMock, job_id: ObjectId) -> None:
+    """Run a job with one worker.
+
+    :param database: Database class
+    :param jobs: Export job collection
+    :param bucket: Export file bucket
+    :param job_id: Job ID
+    """
+    export_jobs: ExportJobs = ExportJobs(database, MagicMock(), jobs, bucket, Item, {"name"}, [("name", 1)], 1)
+
+    await export_jobs.start()
+    await export_jobs.submit(job_id)
+    await asyncio.sleep(0.05)
+    await export_jobs.stop()
+
+
+def get_jobs(job: dict = None) -> MagicMock:
+    """Get an export job collection with the specified pending job.
+
+    :param job: Pending job
+    :return: Export job collection
+    """
+    jobs: MagicMock = MagicMock()
+    jobs.find = MagicMock(side_effect=lambda *_, **__: get_found_jobs())
+    jobs.find_one_and_update = AsyncMock(return_value=job)
+    jobs.update_one = AsyncMock()
+
+    return jobs
+
+
+def get_bucket() -> MagicMock:
+    """Get an export file bucket.
+
+    :return: Export file bucket
+    """
+    bucket: MagicMock = MagicMock()
+    bucket.open_upload_stream_with_id.return_value = MagicMock(write=AsyncMock(), close=AsyncMock(), abort=AsyncMock())
+    bucket.delete = AsyncMock()
+
+    return bucket
+
+
+class TestExportJobs:
+    """This class handles all app.export_jobs.ExportJobs class test cases.
+    """
+
+    async def test_running_job(self) -> None:
+        """Test running a job which writes its file and is completed.
+        """
+        job_id: ObjectId = ObjectId()
+        database: MagicMock = MagicMock(count=AsyncMock(return_value=2), stream=MagicMock(side_effect=get_items))
+        jobs: MagicMock = get_jobs({"_id": job_id, "format": "ndjson", "keyword": None, "search_mode": "regex"})
+        bucket: MagicMock = get_bucket()
+
+        file: MagicMock = bucket.open_upload_stream_with_id.return_value
+
+        await run_job(database, jobs, bucket, job_id)
+
+        file.write.assert_awaited_once_with(b'{"name":"Run"}\n{"name":"Mao"}\n')
+        file.close.assert_awaited_once()
+        assert jobs.update_one.await_args.args[1]["$set"] == {
+            "status": ExportJobStatus.COMPLETED,
+            "file_id": jobs.find_one_and_update.await_args.args[1]["$set"]["upload_id"],
+            "processed_records": 2
+        }
+
+    async def test_running_claimed_job(self) -> None:
+        """Test running a job which was already claimed by another worker.
+        """
+        database: MagicMock = MagicMock(count=AsyncMock(return_value=2), stream=MagicMock(side_effect=get_items))
+        jobs: MagicMock = get_jobs()
+        bucket: MagicMock = get_bucket()
+
+        await run_job(database, jobs, bucket, ObjectId())
+
+        bucket.open_upload_stream_with_id.assert_not_called()
+        jobs.update_one.assert_not_awaited()
+
+    async def test_running_failed_job(self) -> None:
+        """Test running a job whose file could not be written.
+        """
+        job_id: ObjectId = ObjectId()
+        database: MagicMock = MagicMock(count=AsyncMock(return_value=2), stream=MagicMock(side_effect=get_items))
+        jobs: MagicMock = get_jobs({"_id": job_id, "format": "csv", "keyword": None, "search_mode": "regex"})
+        bucket: MagicMock = get_bucket()
+        bucket.open_upload_stream_with_id.return_value.write.side_effect = AutoReconnect("The connection was closed.")
+
+        await run_job(database, jobs, bucket, job_id)
+
+        bucket.open_upload_stream_with_id.return_value.abort.assert_awaited_once()
+        assert jobs.update_one.await_args.args[1]["$set"] == {"status": ExportJobStatus.FAILED}
+
+    async def test_running_reclaimed_job(self) -> None:
+        """Test running a job whose lease expired, which deletes the file that its previous claim did not finish.
+        """
+        job_id: ObjectId = ObjectId()
+        upload_id: ObjectId = ObjectId()
+        database: MagicMock = MagicMock(count=AsyncMock(return_value=2), stream=MagicMock(side_effect=get_items))
+        jobs: MagicMock = get_jobs({"_id": job_id, "status": ExportJobStatus.RUNNING, "upload_id": upload_id,
+                                    "format": "ndjson", "keyword": None, "search_mode": "regex"}
+                                   )
+        bucket: MagicMock = get_bucket()
+
+        await run_job(database, jobs, bucket, job_id)
+
+        claim: dict = jobs.find_one_and_update.await_args.args[1]["$set"]
+        bucket.delete.assert_awaited_once_with(upload_id)
+        assert claim["upload_id"] != upload_id
+        assert bucket.open_upload_stream_with_id.call_args.args[0] == claim["upload_id"]
+        assert jobs.update_one.await_args.args[0] == {"_id": job_id, "upload_id": claim["upload_id"]}
+
+    async def test_sweeping_jobs(self) -> None:
+        """Test sweeping the jobs, which queues the claimable jobs and deletes the expired jobs and their files.
+        """
+        job_id: ObjectId = ObjectId()
+        expired_job_id: ObjectId = ObjectId()
+        file_id: ObjectId = ObjectId()
+        jobs: MagicMock = get_jobs()
+        jobs.find = MagicMock(side_effect=[get_found_jobs({"_id": job_id}),
+                                           get_found_jobs({"_id": expired_job_id, "file_id": file_id})
+                                           ])
+        jobs.delete_one = AsyncMock()
+        bucket: MagicMock = get_bucket()
+
+        await run_job(MagicMock(), jobs, bucket, job_id)
+
+        assert jobs.find_one_and_update.await_args_list[0].args[0]["_id"] == job_id
+        bucket.delete.assert_awaited_once_with(file_id)
+        jobs.delete_one.assert_awaited_once_with({"_id": expired_job_id})
+
+    async def test_sweeping_jobs_with_database_error(self) -> None:
+        """Test sweeping the jobs when the database could not be read, which does not stop the export jobs.
+        """
+        job_id: ObjectId = ObjectId()
+        database: MagicMock = MagicMock(count=AsyncMock(return_value=2), stream=MagicMock(side_effect=get_items))
+        jobs: MagicMock = get_jobs({"_id": job_id, "format": "ndjson", "keyword": None, "search_mode": "regex"})
+        jobs.find = MagicMock(side_effect=AutoReconnect("The connection was closed."))
+        bucket: MagicMock = get_bucket()
+
+        await run_job(database, jobs, bucket, job_id)
+
+        bucket.open_upload_stream_with_id.return_value.close.assert_awaited_once()
@@ -0,0 +1,56 @@
+import orjson
+import pytest
+from bson import ObjectId
+from fastapi import status
+from fastapi.responses import Response
+
+from app.json_responses import JsonResponses, ResponseMode, TrustedJSONResponse
+
+pytestmark = pytest.mark.asyncio
+
+
+class TestJsonResponses:
+    """This class handles all app.json_responses module test cases.
+    """
+
+    async def test_getting_validated_response(self) -> None:
+        """Test getting a response in validated mode which returns the content as is.
+        """
+        content: dict = {"data": {"message": "Hello"}}
+
+        assert await JsonResponses.get_response(content, mode=ResponseMode.VALIDATED) is content
+
+    async def test_getting_trusted_response(self) -> None:
+        """Test getting a response in trusted mode which is encoded with orjson.
+        """
+        object_id: ObjectId = ObjectId()
+        response: TrustedJSONResponse = await JsonResponses.get_response({"data": {"_id": object_id}},
+                                                                         status.HTTP_201_CREATED,
+                                                                         ResponseMode.TRUSTED
+                                                                         )
+
+        assert response.status_code == status.HTTP_201_CREATED
+        assert response.media_type == "application/json"
+        assert orjson.loads(response.body) == {"data": {"_id": str(object_id)}}
+
+    async def test_getting_trusted_response_with_route_headers(self) -> None:
+        """Test getting a trusted response with the headers that were set on the route's injected response.
+        """
+        route_response: Response = Response()
+        route_response.headers["ETag"] = 'W/"1"'
+        response: TrustedJSONResponse = await JsonResponses.get_response({"data": {}}, mode=ResponseMode.TRUSTED,
+                                                                         response=route_response
+                                                                         )
+
+        assert response.headers.get("ETag") == 'W/"1"'
+        assert response.headers.get("Content-Length") == str(len(response.body))
+
+    async def test_getting_response_in_default_mode(self) -> None:
+        """Test getting a response in the default response mode.
+        """
+        JsonResponses.set_default_mode(ResponseMode.TRUSTED)
+
+        try:
+            assert isinstance(await JsonResponses.get_response({}), TrustedJSONResponse)
+        finally:
+            JsonResponses.set_default_mode(ResponseMode.VALIDATED)
@@ -0,0 +1,218 @@
+import asyncio
+import base64
+import os
+import time
+from typing import Optional, AsyncGenerator
+
+import jwt
+import pytest
+import respx
+from cryptography.hazmat.backends import default_backend
+from cryptography.hazmat.primitives.asymmetric import rsa
+from cryptography.hazmat.primitives.asymmetric.rsa import RSAPrivateKey
+from fastapi import status
+from httpx import Response
+from pytest_mock import MockerFixture
+from respx import MockRouter
+
+from app.http_response_exception import HTTPResponseException
+from app.json_web_token import JsonWebToken
+from app.models.authorization import UserRole
+
+pytestmark = pytest.mark.asyncio
+
+authority: str = "https://login.microsoftonline.com/tenant"
+audience: str = "audience"
+issuer: str = "https://login.microsoftonline.com/tenant/v2.0"
+private_key: RSAPrivateKey = rsa.generate_private_key(public_exponent=65537, key_size=2048, backend=default_backend())
+mock_router: MockRouter = respx.mock(assert_all_called=False, assert_all_mocked=True, base_url=authority)
+
+
+def get_json_web_key(kid: str, key: RSAPrivateKey) -> dict:
+    """Get a JSON Web Key of the specified private key's public key.
+
+    :param kid: Key ID
+    :param key: Private key
+    :return: JSON Web Key
+    """
+    numbers = key.public_key().public_numbers()
+
+    return {
+        "kty": "RSA",
+        "use": "sig",
+        "kid": kid,
+        "n": base64.urlsafe_b64encode(numbers.n.to_bytes(256, "big")).decode().rstrip("="),
+        "e": base64.urlsafe_b64encode(numbers.e.to_bytes(3, "big")).decode().rstrip("=")
+    }
+
+
+def get_access_token(kid: str = "key-1", key: RSAPrivateKey = private_key, algorithm: str = "RS256",
+                     expires_in: int = 3600, **claims) -> str:
+    """Get an access token that is signed with the specified private key.
+
+    :param kid: Key ID
+    :param key: Private key
+    :param algorithm: Signing algorithm
+    :param expires_in: Time in seconds until the access token expires
+    :param claims: Additional claims
+    :return: Access token
+    """
+    current_time: int = int(time.time())
+    payload: dict = {"aud": audience, "iss": issuer, "iat": current_time, "nbf": current_time,
+                     "exp": current_time + expires_in, "oid": "user-1", **claims
+                     }
+    signing_key = key if algorithm.startswith("RS") else "secret"
+
+    return jwt.encode(payload, signing_key, algorithm=algorithm, headers={"kid": kid}).decode()
+
+
+@pytest.fixture
+async def json_web_token(mocker: MockerFixture) -> AsyncGenerator[MockRouter, None]:
+    """Set up JsonWebToken with a local JSON Web Key Set, and tear it down after a test.
+
+    :param mocker: Mocker fixture
+    :return: Mock router of Azure AD
+    """
+    mocker.patch.dict(os.environ, {"AZURE_AD_AUTHORITY": authority, "AZURE_AD_AUDIENCE": audience})
+
+    with mock_router:
+        mock_router.get("/v2.0/.well-known/openid-configuration").mock(
+            return_value=Response(status_code=status.HTTP_200_OK,
+                                  json={"issuer": issuer, "jwks_uri": f"{authority}/discovery/v2.0/keys"}
+                                  )
+        )
+        mock_router.get("/discovery/v2.0/keys").mock(
+            return_value=Response(status_code=status.HTTP_200_OK,
+                                  json={"keys": [get_json_web_key("key-1", private_key),
+                                                 {"kty": "EC", "kid": "key-2", "crv": "P-256"}
+                                                 ]}
+                                  )
+        )
+
+        await JsonWebToken.set_up()
+
+        yield mock_router
+
+        await JsonWebToken.tear_down()
+
+
+@pytest.mark.usefixtures("json_web_token")
+class TestJsonWebToken:
+    """This class handles all app.json_web_token.JsonWebToken class test cases.
+    """
+
+    @staticmethod
+    async def __get_error_status_code(access_token: str, accepted_roles: Optional[set] = None) -> int:
+        """Get the status code of the error that the specified access token raises.
+
+        :param access_token: Access token
+        :param accepted_roles: Accepted user roles
+        :return: Status code
+        """
+        with pytest.raises(HTTPResponseException) as exception_information:
+            await JsonWebToken.get_user_identifier(access_token, accepted_roles)
+
+        return exception_information.value.status_code
+
+    async def test_getting_user_identifier(self) -> None:
+        """Test getting the user identifier of a user access token.
+        """
+        access_token: str = get_access_token(scp="access_as_user", roles=[UserRole.CONTACT_REPORT_VIEWER.value])
+
+        assert await JsonWebToken.get_user_identifier(access_token) == "user-1"
+        assert await JsonWebToken.get_user_identifier(access_token, {UserRole.CONTACT_REPORT_VIEWER}) == "user-1"
+
+    async def test_getting_user_identifier_without_permissions(self) -> None:
+        """Test getting the user identifier of an access token without the user scope or accepted roles.
+        """
+        assert await self.__get_error_status_code(get_access_token()) == status.HTTP_403_FORBIDDEN
+        assert await self.__get_error_status_code(get_access_token(scp="access_as_user"),
+                                                  {UserRole.CONTACT_REPORT_VIEWER}
+                                                  ) == status.HTTP_403_FORBIDDEN
+
+    async def test_validating_application_access_token(self) -> None:
+        """Test validating an application access token.
+        """
+        await JsonWebToken.validate_application_access_token(get_access_token(roles=["access_as_application"]))
+
+        with pytest.raises(HTTPResponseException) as exception_information:
+            await JsonWebToken.validate_application_access_token(get_access_token())
+
+        assert exception_information.value.status_code == status.HTTP_403_FORBIDDEN
+
+    async def test_caching_verified_claims(self) -> None:
+        """Test serving the verified claims of a reused access token from the cache, but never an invalid one's.
+        """
+        access_token: str = get_access_token(scp="access_as_user")
+        invalid_access_token: str = get_access_token(kid="unknown", scp="access_as_user")
+
+        for _ in range(3):
+            assert await JsonWebToken.get_user_identifier(access_token) == "user-1"
+            assert await self.__get_error_status_code(invalid_access_token) == status.HTTP_401_UNAUTHORIZED
+
+        statistics: dict = await JsonWebToken.get_claims_cache_statistics()
+
+        assert (statistics.get("size"), statistics.get("hits"), statistics.get("misses")) == (1, 2, 4)
+
+    async def test_refetching_rotated_public_keys(self, json_web_token: MockRouter, mocker: MockerFixture) -> None:
+        """Test refetching the public keys once for concurrent access tokens signed by a rotated key.
+        """
+        mocker.patch("app.json_web_token.MINIMUM_REFETCH_INTERVAL", 0)
+        key_set_route = json_web_token.get("/discovery/v2.0/keys").mock(
+            return_value=Response(status_code=status.HTTP_200_OK,
+                                  json={"keys": [get_json_web_key("key-3", private_key)]}
+                                  )
+        )
+        call_count: int = key_set_route.call_count
+        access_token: str = get_access_token(kid="key-3", scp="access_as_user")
+
+        assert await asyncio.gather(*[JsonWebToken.get_user_identifier(access_token) for _ in range(10)]) \
+               == ["user-1"] * 10
+        assert key_set_route.call_count == call_count + 1
+        assert await self.__get_error_status_code(get_access_token(scp="access_as_user")) \
+               == status.HTTP_401_UNAUTHORIZED
+
+    async def test_rate_limiting_refetches(self, json_web_token: MockRouter) -> None:
+        """Test not refetching the public keys again within the minimum refetch interval.
+        """
+        key_set_route = json_web_token.get("/discovery/v2.0/keys")
+        call_count: int = key_set_route.call_count
+
+        for _ in range(5):
+            assert await self.__get_error_status_code(get_access_token(kid="unknown", scp="access_as_user")) \
+                   == status.HTTP_401_UNAUTHORIZED
+
+        assert key_set_route.call_count == call_count
+
+    async def test_refreshing_public_keys_periodically(self, json_web_token: MockRouter, mocker: MockerFixture) -> None:
+        """Test refreshing the public keys in the background as soon as the cached key set expires.
+        """
+        mocker.patch("app.json_web_token.MINIMUM_REFRESH_INTERVAL", 0.01)
+        key_set_route = json_web_token.get("/discovery/v2.0/keys").mock(
+            return_value=Response(status_code=status.HTTP_200_OK, headers={"Cache-Control": "public, max-age=0"},
+                                  json={"keys": [get_json_web_key("key-1", private_key)]}
+                                  )
+        )
+
+        call_count: int = key_set_route.call_count
+
+        await JsonWebToken.set_up()
+        await asyncio.sleep(0.1)
+
+        assert key_set_route.call_count > call_count + 2
+
+    async def test_decoding_invalid_access_tokens(self) -> None:
+        """Test decoding expired, unknown-key, wrongly signed, and symmetrically signed access tokens.
+        """
+        other_key: RSAPrivateKey = rsa.generate_private_key(public_exponent=65537, key_size=2048,
+                                                            backend=default_backend()
+                                                            )
+
+        for access_token in [get_access_token(scp="access_as_user", expires_in=-60),
+                             get_access_token(kid="unknown", scp="access_as_user"),
+                             get_access_token(kid="key-2", scp="access_as_user"),
+                             get_access_token(key=other_key, scp="access_as_user"),
+                             get_access_token(algorithm="HS256", scp="access_as_user"),
+                             "malformed"
+                             ]:
+            assert await self.__get_error_status_code(access_token) == status.HTTP_401_UNAUTHORIZED
@@ -0,0 +1,49 @@
+import time
+
+from app.list_cache import ListCache
+
+
+class TestListCache:
+    """This class handles all app.list_cache.ListCache class test cases.
+    """
+
+    def test_getting_cached_page(self) -> None:
+        """Test getting a copy of a cached page whose documents can be changed without changing the cache.
+        """
+        list_cache: ListCache = ListCache(10, 60)
+
+        assert list_cache.get(("post", 1)) is None
+
+        list_cache.put(("post", 1), {"data": [{"message": "Run"}], "meta": {"total_records": 1}}, list_cache.generation)
+        page: dict = list_cache.get(("post", 1))
+        page["data"][0].pop("message")
+
+        assert list_cache.get(("post", 1)) == {"data": [{"message": "Run"}], "meta": {"total_records": 1}}
+        assert list_cache.statistics == {"size": 1, "hits": 2, "misses": 1, "evictions": 0, "expirations": 0}
+
+    def test_invalidating_pages(self) -> None:
+        """Test hiding the cached pages after a write, and not caching a page that was read before the write.
+        """
+        list_cache: ListCache = ListCache(10, 60)
+        generation: int = list_cache.generation
+        list_cache.put(("post", 1), {"data": []}, generation)
+
+        list_cache.invalidate()
+        list_cache.put(("post", 2), {"data": []}, generation)
+
+        assert list_cache.get(("post", 1)) is None
+        assert list_cache.get(("post", 2)) is None
+
+    def test_expiring_and_evicting_pages(self) -> None:
+        """Test expiring a page after the time to live and evicting the least recently used page.
+        """
+        list_cache: ListCache = ListCache(1, 0.01)
+        list_cache.put(("post", 1), {"data": []}, list_cache.generation)
+        list_cache.put(("post", 2), {"data": []}, list_cache.generation)
+
+        assert list_cache.get(("post", 1)) is None
+
+        time.sleep(0.02)
+
+        assert list_cache.get(("post", 2)) is None
+        assert list_cache.statistics == {"size": 0, "hits": 0, "misses": 2, "evictions": 1, "expirations": 1}
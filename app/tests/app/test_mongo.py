@@ -0,0 +1,427 @@
+import asyncio
+import os
+from datetime import datetime, timedelta
+from typing import AsyncIterator, Any, List, Optional, Tuple
+
+import pymongo
+import pytest
+from bson import ObjectId
+from fastapi import status
+from pydantic import BaseModel, Field
+from pymongo.errors import PyMongoError
+from pytest_mock import MockerFixture
+from starlette.requests import Request
+
+from app.batch import create_batch
+from app.cursors import encode_cursor, CursorDirection
+from app.etags import get_document_etag, get_etag_conditions
+from app.http_response_exception import HTTPResponseException
+from app.models.pagination import TotalRecordsMode
+from app.models.post import PostPreRelationships
+from app.models.search import SearchMode
+from app.ngrams import NGRAM_FIELD
+from app.types.datetime import DatetimeStr
+from app.types.object_id import ObjectIdStr
+
+pytestmark = [
+    pytest.mark.asyncio,
+    pytest.mark.skipif(os.getenv("MONGO_REPLICA_SET_URL") is None,
+                       reason="MONGO_REPLICA_SET_URL environment variable is not set."
+                       )
+]
+
+
+class ItemCreation(BaseModel):
+    name: str = Field(..., min_length=3)
+
+
+class Item(BaseModel):
+    id: ObjectIdStr = Field(..., alias="_id")
+    name: str
+
+
+class TimedItem(Item):
+    updated_at: DatetimeStr
+
+
+def get_request(path: str) -> Request:
+    """Get an HTTP request of a path.
+
+    :param path: Path
+    :return: HTTP request
+    """
+    return Request({"type": "http", "method": "GET", "scheme": "http", "server": ("testserver", 80), "path": path,
+                    "root_path": "", "query_string": b"", "headers": []
+                    })
+
+
+@pytest.fixture
+async def database() -> AsyncIterator[Any]:
+    """Get a database connection to a MongoDB, e.g. a local single-node replica set whose URL is set in
+    MONGO_REPLICA_SET_URL, and drop the test database afterwards.
+
+    :return: Database class instance
+    """
+    from app.mongo import Mongo
+
+    mongo: Mongo = Mongo(os.getenv("MONGO_REPLICA_SET_URL"), 27017, "mongo_test", None, None)
+    client: Any = (await mongo.set_collection("item")).database.client
+
+    try:
+        yield mongo
+    finally:
+        await client.drop_database("mongo_test")
+        client.close()
+
+
+async def insert_items(collection: Any, names: List[str], created_at: List[datetime]) -> List[ObjectId]:
+    """Insert items directly with the specified created times.
+
+    :param collection: Collection reference
+    :param names: Names
+    :param created_at: Created time of each item
+    :return: Inserted IDs
+    """
+    result: Any = await collection.insert_many([{"name": name, "created_at": time, "updated_at": time}
+                                                for name, time in zip(names, created_at)
+                                                ])
+
+    return result.inserted_ids
+
+
+class TestMongo:
+    """This class handles all app.mongo.Mongo class test cases against a real MongoDB.
+    """
+
+    async def test_listing_by_cursor_with_ties(self, database: Any) -> None:
+        """Test listing every page forwards and backwards by cursor when many documents have the same sort value,
+        so the _id tie-breaker decides their order.
+        """
+        collection: Any = await database.set_collection("item")
+        time: datetime = datetime(2020, 10, 5, 16, 0, 12)
+        await insert_items(collection, [f"Item {index}" for index in [5, 2, 7, 0, 3, 6, 1, 4]],
+                           [time, time, time, time + timedelta(seconds=1), time + timedelta(seconds=1), time, time,
+                            time - timedelta(seconds=1)
+                            ])
+        sort: list = [("created_at", pymongo.DESCENDING)]
+        expected_ids: List[str] = [str(document.get("_id")) for document in await collection.find(
+            sort=[("created_at", pymongo.DESCENDING), ("_id", pymongo.DESCENDING)]
+        ).to_list(length=None)]
+        first_page: dict = await database.list(collection, Item, get_request("/items"), 1, 3, {"name"}, sort=sort)
+        pages: List[dict] = [first_page]
+        cursor: Optional[str] = first_page.get("links").get("next_cursor")
+
+        while cursor is not None:
+            pages.append(await database.list(collection, Item, get_request("/items"), 1, 3, {"name"}, sort=sort,
+                                              cursor=cursor
+                                              ))
+            cursor = pages[-1].get("links").get("next_cursor")
+
+        assert [document.get("_id") for page in pages for document in page.get("data")] == expected_ids
+        assert [len(page.get("data")) for page in pages] == [3, 3, 2]
+
+        backward_pages: List[dict] = [pages[-1]]
+        cursor = pages[-1].get("links").get("previous_cursor")
+
+        while cursor is not None:
+            backward_pages.append(await database.list(collection, Item, get_request("/items"), 1, 3, {"name"},
+                                                      sort=sort, cursor=cursor
+                                                      ))
+            cursor = backward_pages[-1].get("links").get("previous_cursor")
+
+        assert [page.get("data") for page in reversed(backward_pages)] == [page.get("data") for page in pages]
+
+    async def test_searching_by_ngrams(self, database: Any) -> None:
+        """Test searching the created documents by case-insensitive substring with their n-grams.
+        """
+        collection: Any = await database.set_collection("ngram_item", ngram_fields={"name", "email"})
+
+        for name, email in [("Mao Li", "mao_li@example.com"), ("Run (Admin)", "run@example.com"),
+                            ("Ann Maori", "ann@example.org")]:
+            await database.create(collection, {"name": name, "email": email}, Item)
+
+        async def search(keyword: str) -> List[str]:
+            page: dict = await database.list(collection, Item, get_request("/items"), 1, 10, {"name", "email"},
+                                             keyword, [("name", pymongo.ASCENDING)], search_mode=SearchMode.NGRAM
+                                             )
+
+            return [document.get("name") for document in page.get("data")]
+
+        assert {"ao ", "o l", "o_l"} <= set((await collection.find_one({"name": "Mao Li"})).get(NGRAM_FIELD))
+        assert await search("MAO") == ["Ann Maori", "Mao Li"]
+        assert await search("ao l") == ["Mao Li"]
+        assert await search("n (a") == ["Run (Admin)"]
+        assert await search(".org") == ["Ann Maori"]
+        assert await search("i") == ["Ann Maori", "Mao Li", "Run (Admin)"]
+        assert await search("ao x") == []
+        assert await database.count(collection, {"name", "email"}, "mao", SearchMode.NGRAM) == 2
+
+    @pytest.mark.parametrize("total, keyword, total_records, total_records_exact, last_page", [
+        (TotalRecordsMode.EXACT, None, 3, True, 2),
+        (TotalRecordsMode.EXACT, "Mao", 2, True, 1),
+        (TotalRecordsMode.ESTIMATED, None, 3, False, 2),
+        (TotalRecordsMode.ESTIMATED, "Mao", 2, True, 1),
+        (TotalRecordsMode.NONE, None, None, False, None)
+    ])
+    async def test_listing_by_total_records_modes(self, database: Any, total: TotalRecordsMode,
+                                                  keyword: Optional[str], total_records: Optional[int],
+                                                  total_records_exact: bool, last_page: Optional[int]) -> None:
+        """Test counting the total records of a page exactly, by estimation, which is exact if there is a query,
+        or not at all.
+        """
+        collection: Any = await database.set_collection("item")
+        await insert_items(collection, ["Mao Li", "Run", "Ann Mao"], [datetime.utcnow()] * 3)
+
+        page: dict = await database.list(collection, Item, get_request("/items"), 1, 2, {"name"}, keyword,
+                                         total=total
+                                         )
+
+        assert page.get("meta").get("total_records") == total_records
+        assert page.get("meta").get("total_records_exact") == total_records_exact
+        assert page.get("meta").get("last_page") == last_page
+        assert (page.get("links").get("next_page") is not None) == (keyword is None)
+
+    async def test_searching_by_text_relevance(self, database: Any) -> None:
+        """Test searching the documents with the text index and sorting them by relevance score, which keeps the score
+        out of the listed documents and does not give any cursors.
+        """
+        collection: Any = await database.set_collection("text_item")
+        await collection.create_index([("name", pymongo.TEXT)])
+        time: datetime = datetime(2020, 10, 5, 16, 0, 12)
+        item_ids: List[ObjectId] = await insert_items(collection, ["Mao Mao Run", "Ann Mao Li", "Run"],
+                                                      [time, time + timedelta(seconds=1), time + timedelta(seconds=2)]
+                                                      )
+
+        async def search(page: int) -> dict:
+            return await database.list(collection, Item, get_request("/items"), page, 1, {"name"}, "mao",
+                                       search_mode=SearchMode.TEXT, sort_by_relevance=True
+                                       )
+
+        pages: List[dict] = [await search(1), await search(2)]
+
+        assert [page.get("data") for page in pages] == [[{"_id": str(item_ids[0]), "name": "Mao Mao Run"}],
+                                                        [{"_id": str(item_ids[1]), "name": "Ann Mao Li"}]
+                                                        ]
+        assert [page.get("meta").get("total_records") for page in pages] == [2, 2]
+        assert [(page.get("links").get("previous_cursor"), page.get("links").get("next_cursor"))
+                for page in pages] == [(None, None), (None, None)]
+        assert pages[0].get("links").get("next_page") is not None
+
+    async def test_searching_by_text_relevance_in_cursor_mode(self, database: Any) -> None:
+        """Test sorting the documents by relevance score in cursor mode, which is not supported.
+        """
+        collection: Any = await database.set_collection("text_item")
+        cursor: str = encode_cursor(["updated_at", "_id"], [datetime.utcnow(), ObjectId()], CursorDirection.NEXT)
+
+        with pytest.raises(HTTPResponseException) as exception_information:
+            await database.list(collection, Item, get_request("/items"), 1, 1, {"name"}, "mao", cursor=cursor,
+                                search_mode=SearchMode.TEXT, sort_by_relevance=True
+                                )
+
+        assert exception_information.value.status_code == status.HTTP_400_BAD_REQUEST
+        assert exception_information.value.detail.get("error_code") == "unsupported_sort"
+
+    async def test_creating_as_read_back(self, database: Any) -> None:
+        """Test creating a document, whose document projected in process is the same as the document read back
+        from the database, including its times and entity tag.
+        """
+        collection: Any = await database.set_collection("post")
+
+        created_post: dict = (await database.create(collection, {"message": "What is quantum theory?",
+                                                                 "owner": "801af166"
+                                                                 }, PostPreRelationships)).get("data")
+        read_post: dict = (await database.get(collection, created_post.get("_id"), PostPreRelationships)).get("data")
+
+        assert created_post == read_post
+        assert created_post.get("updated_at").stored_value == read_post.get("updated_at").stored_value
+        assert get_document_etag(created_post) == get_document_etag(read_post)
+        assert PostPreRelationships.parse_obj(created_post) == PostPreRelationships.parse_obj(read_post)
+
+    async def test_updating_ngram_fields(self, database: Any) -> None:
+        """Test updating an n-gram field, which recomputes the n-grams from the updated field and the stored fields.
+        """
+        collection: Any = await database.set_collection("ngram_item", ngram_fields={"name", "email"})
+        item_id: str = (await database.create(collection, {"name": "Mao Li", "email": "mao@example.com"}, Item)) \
+            .get("data").get("_id")
+
+        await database.update(collection, item_id, {"name": "Run"}, Item)
+
+        async def search(keyword: str) -> List[str]:
+            page: dict = await database.list(collection, Item, get_request("/items"), 1, 10, {"name", "email"},
+                                             keyword, search_mode=SearchMode.NGRAM
+                                             )
+
+            return [document.get("name") for document in page.get("data")]
+
+        assert await search("run") == ["Run"]
+        assert await search("mao@") == ["Run"]
+        assert await search("mao l") == []
+
+    async def test_updating_with_pipeline(self, database: Any) -> None:
+        """Test updating a document, whose updated time changes only if some fields are changed, with one update
+        pipeline that stores the values literally.
+        """
+        collection: Any = await database.set_collection("item")
+        time: datetime = datetime(2020, 10, 5, 16, 0, 12)
+        item_id: str = str((await insert_items(collection, ["Mao"], [time]))[0])
+
+        unchanged_item: dict = await database.update(collection, item_id, {"name": "Mao"}, Item)
+        stored_item: dict = await collection.find_one({"_id": ObjectId(item_id)})
+
+        assert unchanged_item == {"data": {"_id": item_id, "name": "Mao"}}
+        assert stored_item.get("updated_at") == time
+
+        changed_item: dict = await database.update(collection, item_id, {"name": "$name", "email": None}, Item)
+        stored_item = await collection.find_one({"_id": ObjectId(item_id)})
+
+        assert changed_item == {"data": {"_id": item_id, "name": "$name"}}
+        assert stored_item.get("updated_at") > time
+        assert "email" not in stored_item
+
+        with pytest.raises(HTTPResponseException) as exception_information:
+            await database.update(collection, item_id, {"name": "Run"}, Item, {"updated_at": time})
+
+        assert exception_information.value.status_code == status.HTTP_404_NOT_FOUND
+        assert (await collection.find_one({"_id": ObjectId(item_id)})).get("name") == "$name"
+
+    async def test_creating_batch(self, database: Any) -> None:
+        """Test creating a batch with one unordered bulk insert, which reports every item's own result, so the invalid
+        and the duplicate items do not stop creating the other items.
+        """
+        collection: Any = await database.set_collection("item")
+        await collection.create_index("name", unique=True)
+        await insert_items(collection, ["Run"], [datetime(2020, 10, 5, 16, 0, 12)])
+
+        result: dict = await create_batch(type(database), collection,
+                                          [{"name": "Mao"}, {"name": "Li"}, {"name": "Run"}, {"name": "Mao"},
+                                           {"name": "Ann"}
+                                           ], ItemCreation, Item)
+
+        assert [item.get("index") for item in result.get("data")] == [0, 1, 2, 3, 4]
+        assert [item.get("status_code") for item in result.get("data")] == [
+            status.HTTP_201_CREATED, status.HTTP_422_UNPROCESSABLE_ENTITY, status.HTTP_409_CONFLICT,
+            status.HTTP_409_CONFLICT, status.HTTP_201_CREATED
+        ]
+        assert [item.get("error").get("error_code") for item in result.get("data")[1:4]] == [
+            "invalid_item", "duplicate_item", "duplicate_item"
+        ]
+        assert result.get("data")[4].get("data").get("name") == "Ann"
+        assert sorted(await collection.distinct("name")) == ["Ann", "Mao", "Run"]
+        assert await collection.count_documents({"_id": ObjectId(result.get("data")[0].get("data").get("_id"))}) == 1
+
+    async def test_getting_changes_after_settling_time(self, database: Any) -> None:
+        """Test getting the changes that are older than the settling time only, so a fresh change is got by the next
+        sync token.
+        """
+        collection: Any = await database.set_collection("item")
+        old_item_id: ObjectId = (await insert_items(collection, ["Run"], [datetime.utcnow() - timedelta(minutes=1)]))[0]
+        await database.create(collection, {"name": "Mao"}, Item)
+
+        changes: dict = await database.changes(collection, Item, None, 10)
+        next_changes: dict = await database.changes(collection, Item, changes.get("next_token"), 10)
+
+        assert changes.get("data") == [{"_id": str(old_item_id), "name": "Run"}]
+        assert changes.get("deleted") == []
+        assert not changes.get("has_more")
+        assert next_changes.get("data") == []
+        assert not next_changes.get("has_more")
+
+    async def test_getting_changes_by_sync_tokens(self, database: Any, mocker: MockerFixture) -> None:
+        """Test getting every created, updated, and deleted document once by following the next sync tokens,
+        when many documents have the same updated time.
+        """
+        mocker.patch("app.mongo.CHANGES_SETTLING_TIME", timedelta(0))
+        collection: Any = await database.set_collection("tombstone_item", keep_tombstones=True)
+        time: datetime = datetime.utcnow() - timedelta(minutes=1)
+        item_ids: List[ObjectId] = await insert_items(collection, ["Mao", "Run", "Ann"],
+                                                      [time, time, time - timedelta(seconds=1)]
+                                                      )
+        await (await database.set_collection("tombstone")).insert_one(
+            {"collection": "other_item", "document_id": ObjectId(), "deleted_at": datetime.utcnow()}
+        )
+
+        async def get_all_changes(token: Optional[str]) -> Tuple[List[dict], str]:
+            pages: List[dict] = [await database.changes(collection, Item, token, 1)]
+
+            while pages[-1].get("has_more"):
+                pages.append(await database.changes(collection, Item, pages[-1].get("next_token"), 1))
+
+            return pages, pages[-1].get("next_token")
+
+        pages, token = await get_all_changes(None)
+
+        assert [[item.get("name") for item in page.get("data")] for page in pages] == [["Ann"], ["Mao"], ["Run"]]
+        assert all(page.get("deleted") == [] for page in pages)
+
+        await asyncio.sleep(0.01)
+        await database.delete(collection, str(item_ids[0]))
+        await database.update(collection, str(item_ids[1]), {"name": "Li"}, Item)
+        await database.delete(collection, str(item_ids[2]))
+        await asyncio.sleep(0.01)
+
+        pages, token = await get_all_changes(token)
+
+        assert [item.get("name") for page in pages for item in page.get("data")] == ["Li"]
+        assert [document_id for page in pages for document_id in page.get("deleted")] == [str(item_ids[0]),
+                                                                                           str(item_ids[2])
+                                                                                           ]
+        assert [page.get("has_more") for page in pages] == [True, False]
+
+        pages, _ = await get_all_changes(token)
+
+        assert [(page.get("data"), page.get("deleted"), page.get("has_more")) for page in pages] == [([], [], False)]
+
+    async def test_deleting_when_tombstone_fails(self, database: Any, mocker: MockerFixture) -> None:
+        """Test deleting a document whose tombstone cannot be inserted, which keeps the document.
+        """
+        collection: Any = await database.set_collection("tombstone_item", keep_tombstones=True)
+        item_id: str = str((await insert_items(collection, ["Mao"], [datetime.utcnow()]))[0])
+        tombstones: Any = database._tombstones[collection.name]
+        mocker.patch.object(tombstones, "insert_one", mocker.AsyncMock(side_effect=PyMongoError("Failed.")))
+
+        with pytest.raises(HTTPResponseException) as exception_information:
+            await database.delete(collection, item_id)
+
+        assert exception_information.value.status_code == status.HTTP_500_INTERNAL_SERVER_ERROR
+        assert (await database.get(collection, item_id, Item)).get("data") == {"_id": item_id, "name": "Mao"}
+        assert await tombstones.count_documents({"collection": collection.name}) == 0
+
+    async def test_getting_changes_by_expired_sync_token(self, database: Any) -> None:
+        """Test getting the changes by a sync token whose tombstone position is older than the tombstone retention.
+        """
+        collection: Any = await database.set_collection("tombstone_item", keep_tombstones=True)
+        time: datetime = datetime.utcnow() - timedelta(days=31)
+        token: str = encode_cursor(["updated_at", "_id", "deleted_at", "tombstone_id"],
+                                   [time, ObjectId(), time, ObjectId()], CursorDirection.NEXT
+                                   )
+
+        with pytest.raises(HTTPResponseException) as exception_information:
+            await database.changes(collection, Item, token, 10)
+
+        assert exception_information.value.status_code == status.HTTP_410_GONE
+
+    async def test_updating_by_etag(self, database: Any) -> None:
+        """Test updating a document twice within the same second by the entity tag that each update returns, so a
+        write with the entity tag of the document's previous version is not written.
+        """
+        collection: Any = await database.set_collection("item")
+        item_id: str = str((await insert_items(collection, ["Mao"], [datetime.utcnow()]))[0])
+        etag: str = get_document_etag((await database.get(collection, item_id, TimedItem)).get("data"))
+
+        first_item: dict = (await database.update(collection, item_id, {"name": "Run"}, TimedItem,
+                                                  get_etag_conditions(item_id, etag)
+                                                  )).get("data")
+        second_item: dict = (await database.update(collection, item_id, {"name": "Ann"}, TimedItem,
+                                                   get_etag_conditions(item_id, get_document_etag(first_item))
+                                                   )).get("data")
+
+        assert len({etag, get_document_etag(first_item), get_document_etag(second_item)}) == 3
+
+        with pytest.raises(HTTPResponseException) as exception_information:
+            await database.update(collection, item_id, {"name": "Li"}, TimedItem,
+                                  get_etag_conditions(item_id, get_document_etag(first_item))
+                                  )
+
+        assert exception_information.value.status_code == status.HTTP_404_NOT_FOUND
+        assert get_document_etag((await database.get(collection, item_id, TimedItem)).get("data")) \
+            == get_document_etag(second_item)
@@ -0,0 +1,25 @@
+from app.ngrams import get_ngrams, get_document_ngrams
+
+
+class TestNgrams:
+    """This class handles all app.ngrams module test cases.
+    """
+
+    def test_getting_ngrams(self) -> None:
+        """Test getting n-grams.
+        """
+        assert get_ngrams("Mao Li") == {"mao", "ao ", "o l", " li"}
+
+    def test_getting_ngrams_of_short_text(self) -> None:
+        """Test getting n-grams of a text that is shorter than the n-gram size.
+        """
+        assert get_ngrams("Li") == set()
+        assert get_ngrams(None) == set()
+
+    def test_getting_document_ngrams(self) -> None:
+        """Test getting n-grams of a document's fields.
+        """
+        document: dict = {"first_name": "Run", "last_name": "Mao", "email": "run@ex.co", "message": None}
+
+        assert get_document_ngrams(document, {"first_name", "last_name", "message"}) == ["mao", "run"]
+        assert get_document_ngrams(document, {"email"}) == [".co", "@ex", "ex.", "n@e", "run", "un@", "x.c"]
@@ -0,0 +1,56 @@
+from datetime import datetime, timezone
+
+from bson import ObjectId
+
+from app.models.contact import ContactResponse
+from app.models.post import PostPreRelationships
+from app.projections import get_compiled_projection
+
+
+class TestProjections:
+    """This class handles all app.projections module test cases.
+    """
+
+    def test_compiling_projection_once(self) -> None:
+        """Test that a projection model is compiled once.
+        """
+        assert get_compiled_projection(PostPreRelationships) is get_compiled_projection(PostPreRelationships)
+
+    def test_compiling_projection(self) -> None:
+        """Test compiling a projection model into a projection.
+        """
+        assert get_compiled_projection(PostPreRelationships).projection == {
+            "id": True,
+            "message": True,
+            "created_at": True,
+            "updated_at": True,
+            "owner": True
+        }
+
+    def test_converting_document(self) -> None:
+        """Test that a converted document passes its projection model's validation.
+        """
+        object_id: ObjectId = ObjectId()
+        document: dict = get_compiled_projection(ContactResponse).convert({
+            "_id": object_id,
+            "first_name": "Run",
+            "last_name": "Mao Li",
+            "email": "mao_li_run@example.com",
+            "message": "I would like to rent a condominium.",
+            "created_at": datetime(2020, 10, 5, 16, 0, 12, tzinfo=timezone.utc),
+            "updated_at": None
+        })
+
+        assert document["_id"] == str(object_id)
+        assert document["updated_at"] is None
+
+        document["updated_at"] = document["created_at"]
+
+        assert ContactResponse.parse_obj(document).created_at == document["created_at"]
+
+    def test_checking_included_fields(self) -> None:
+        """Test checking whether a field is included by a compiled projection.
+        """
+        assert get_compiled_projection(PostPreRelationships).includes("_id")
+        assert get_compiled_projection(PostPreRelationships).includes("owner")
+        assert not get_compiled_projection(PostPreRelationships).includes("score")
@@ -0,0 +1,72 @@
+from fastapi import FastAPI, Depends, status
+from fastapi.testclient import TestClient
+from pytest_mock import MockerFixture
+
+from app.json_web_token import JsonWebToken
+from app.models.authorization import AccessTokenClaims, UserRole
+from app.security import get_access_token_claims, UserPermission, user_permission, application_permission
+
+app: FastAPI = FastAPI()
+
+
+@app.get("/users", dependencies=[Depends(user_permission)])
+async def get_user(claims: AccessTokenClaims = Depends(get_access_token_claims)) -> dict:
+    return {"oid": claims.oid}
+
+
+@app.get("/reports", dependencies=[Depends(UserPermission({UserRole.CONTACT_REPORT_VIEWER}))])
+async def get_report() -> dict:
+    return {}
+
+
+@app.get("/applications", dependencies=[Depends(application_permission)])
+async def get_application() -> dict:
+    return {}
+
+
+class TestSecurity:
+    """This class handles all app.security module test cases.
+    """
+    __client: TestClient = TestClient(app)
+    __claims: dict = {
+        "user": AccessTokenClaims(oid="user-1", scopes=["access_as_user"]),
+        "viewer": AccessTokenClaims(oid="user-2", scopes=["access_as_user"],
+                                    roles=[UserRole.CONTACT_REPORT_VIEWER.value]
+                                    ),
+        "application": AccessTokenClaims(roles=["access_as_application"])
+    }
+
+    def __get_status_codes(self, path: str) -> dict:
+        """Get the status code of every access token's request to a path.
+
+        :param path: Path
+        :return: Status codes by access token
+        """
+        return {access_token: self.__client.get(path, headers={"Authorization": f"Bearer {access_token}"}).status_code
+                for access_token in self.__claims
+                }
+
+    def test_decoding_access_token_once(self, mocker: MockerFixture) -> None:
+        """Test decoding the Bearer token once per request for both the permission and the endpoint's claims.
+        """
+        get_claims = mocker.patch.object(JsonWebToken, "get_claims", side_effect=self.__claims.get)
+        response = self.__client.get("/users", headers={"Authorization": "Bearer user"})
+
+        assert response.json() == {"oid": "user-1"}
+        assert get_claims.call_count == 1
+
+    def test_requiring_permissions(self, mocker: MockerFixture) -> None:
+        """Test requiring a user access token, an accepted user role, or an application access token.
+        """
+        mocker.patch.object(JsonWebToken, "get_claims", side_effect=self.__claims.get)
+
+        assert self.__get_status_codes("/users") == {"user": status.HTTP_200_OK, "viewer": status.HTTP_200_OK,
+                                                     "application": status.HTTP_403_FORBIDDEN
+                                                     }
+        assert self.__get_status_codes("/reports") == {"user": status.HTTP_403_FORBIDDEN, "viewer": status.HTTP_200_OK,
+                                                       "application": status.HTTP_403_FORBIDDEN
+                                                       }
+        assert self.__get_status_codes("/applications") == {"user": status.HTTP_200_OK, "viewer": status.HTTP_200_OK,
+                                                            "application": status.HTTP_200_OK
+                                                            }
+        assert self.__client.get("/users").status_code == status.HTTP_401_UNAUTHORIZED
@@ -0,0 +1,165 @@
+from typing import AsyncIterator, List
+
+import orjson
+import pytest
+from fastapi.responses import StreamingResponse
+from pydantic import BaseModel
+
+from app.http_response_exception import HTTPResponseException
+from app.models.streaming import StreamFormat, ExportFormat
+from app.streaming import get_streaming_response, get_export_response, get_file_streaming_response
+
+pytestmark = pytest.mark.asyncio
+
+
+class Item(BaseModel):
+    name: str
+    index: int
+
+
+async def get_documents(count: int) -> AsyncIterator[dict]:
+    """Get documents.
+
+    :param count: Number of documents
+    :return: Documents
+    """
+    for index in range(count):
+        yield {"index": index}
+
+
+class File:
+    """This class handles a stored file in memory.
+    """
+
+    def __init__(self, data: bytes) -> None:
+        """Initialize this class.
+
+        :param data: File data
+        """
+        self.length = len(data)
+        self.__data = data
+        self.__position = 0
+
+    def seek(self, position: int) -> None:
+        """Move the file position.
+
+        :param position: File position
+        """
+        self.__position = position
+
+    async def read(self, size: int) -> bytes:
+        """Read from the file position.
+
+        :param size: Maximum number of bytes
+        :return: Data
+        """
+        data: bytes = self.__data[self.__position:self.__position + size]
+        self.__position += len(data)
+
+        return data
+
+
+async def read_body(response: StreamingResponse) -> bytes:
+    """Read a streaming response's body.
+
+    :param response: Streaming response
+    :return: Body
+    """
+    chunks: List[bytes] = [chunk async for chunk in response.body_iterator]
+
+    return b"".join(chunks)
+
+
+class TestStreaming:
+    """This class handles all app.streaming module test cases.
+    """
+
+    async def test_streaming_json_array(self) -> None:
+        """Test streaming documents as a JSON array.
+        """
+        response: StreamingResponse = await get_streaming_response(get_documents(3), StreamFormat.JSON)
+
+        assert response.media_type == "application/json"
+        assert orjson.loads(await read_body(response)) == [{"index": 0}, {"index": 1}, {"index": 2}]
+
+    async def test_streaming_empty_json_array(self) -> None:
+        """Test streaming no documents as a JSON array.
+        """
+        response: StreamingResponse = await get_streaming_response(get_documents(0), StreamFormat.JSON)
+
+        assert await read_body(response) == b"[]"
+
+    async def test_streaming_newline_delimited_json(self) -> None:
+        """Test streaming transformed documents as newline-delimited JSON.
+        """
+        async def transform(document: dict) -> None:
+            document["even"] = document.get("index") % 2 == 0
+
+        response: StreamingResponse = await get_streaming_response(get_documents(2), StreamFormat.NDJSON, transform)
+
+        assert response.media_type == "application/x-ndjson"
+        assert await read_body(response) == b'{"index":0,"even":true}\n{"index":1,"even":false}\n'
+
+    async def test_streaming_in_chunks(self, mocker) -> None:
+        """Test streaming documents in chunks of the stream chunk size.
+        """
+        mocker.patch("app.streaming.STREAM_CHUNK_SIZE", 20)
+        response: StreamingResponse = await get_streaming_response(get_documents(5), StreamFormat.JSON)
+        chunks: List[bytes] = [chunk async for chunk in response.body_iterator]
+
+        assert len(chunks) == 3
+        assert orjson.loads(b"".join(chunks)) == [{"index": index} for index in range(5)]
+
+    async def test_exporting_csv(self) -> None:
+        """Test exporting documents as a CSV attachment whose values are not evaluated as formulas.
+        """
+        async def get_items() -> AsyncIterator[dict]:
+            yield {"index": 0, "name": "Run, Mao"}
+            yield {"index": 1, "name": "=SUM(A1:A2)"}
+
+        response: StreamingResponse = await get_export_response(get_items(), ExportFormat.CSV, Item, "items")
+
+        assert response.headers.get("content-disposition") == 'attachment; filename="items.csv"'
+        assert (await read_body(response)).decode("utf-8-sig").splitlines() == [
+            "name,index",
+            '"Run, Mao",0',
+            "'=SUM(A1:A2),1"
+        ]
+
+    async def test_streaming_file(self) -> None:
+        """Test streaming a whole stored file.
+        """
+        response: StreamingResponse = await get_file_streaming_response(File(b"0123456789"), ExportFormat.NDJSON,
+                                                                        "items", "bytes=5-2"
+                                                                        )
+
+        assert response.status_code == 200
+        assert response.headers.get("content-length") == "10"
+        assert response.headers.get("content-disposition") == 'attachment; filename="items.ndjson"'
+        assert await read_body(response) == b"0123456789"
+
+    @pytest.mark.parametrize("range_header,content_range,body", [
+        ("bytes=2-4", "bytes 2-4/10", b"234"),
+        ("bytes=7-", "bytes 7-9/10", b"789"),
+        ("bytes=-2", "bytes 8-9/10", b"89"),
+        ("bytes=8-20", "bytes 8-9/10", b"89")
+    ])
+    async def test_streaming_file_range(self, range_header: str, content_range: str, body: bytes) -> None:
+        """Test streaming a byte range of a stored file.
+        """
+        response: StreamingResponse = await get_file_streaming_response(File(b"0123456789"), ExportFormat.CSV,
+                                                                        "items", range_header
+                                                                        )
+
+        assert response.status_code == 206
+        assert response.headers.get("content-range") == content_range
+        assert await read_body(response) == body
+
+    async def test_streaming_unsatisfiable_file_range(self) -> None:
+        """Test streaming a byte range which starts after the end of a stored file.
+        """
+        with pytest.raises(HTTPResponseException) as exception_information:
+            await get_file_streaming_response(File(b"0123456789"), ExportFormat.CSV, "items", "bytes=10-")
+
+        assert exception_information.value.status_code == 416
+        assert exception_information.value.headers == {"Content-Range": "bytes */10"}
@@ -0,0 +1,78 @@
+import asyncio
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+from pymongo.errors import BulkWriteError, WriteError, AutoReconnect
+
+from app.write_buffer import WriteBuffer
+
+pytestmark = pytest.mark.asyncio
+
+
+class TestWriteBuffer:
+    """This class handles all app.write_buffer.WriteBuffer class test cases.
+    """
+
+    async def test_inserting_documents_with_one_bulk_insert(self) -> None:
+        """Test inserting concurrent documents with one bulk insert after the maximum delay.
+        """
+        collection: MagicMock = MagicMock()
+        collection.insert_many = AsyncMock()
+        write_buffer: WriteBuffer = WriteBuffer(collection, 0.01, 10)
+        documents: list = [{"message": "First"}, {"message": "Second"}, {"message": "Third"}]
+
+        inserted_ids: list = await asyncio.gather(*map(write_buffer.insert, documents))
+
+        collection.insert_many.assert_awaited_once_with(documents, ordered=False)
+        assert inserted_ids == [document.get("_id") for document in documents]
+
+    async def test_inserting_documents_up_to_maximum_size(self) -> None:
+        """Test inserting documents which are flushed when the buffer reaches the maximum size.
+        """
+        collection: MagicMock = MagicMock()
+        collection.insert_many = AsyncMock()
+        write_buffer: WriteBuffer = WriteBuffer(collection, 60, 2)
+
+        await asyncio.wait_for(asyncio.gather(*map(write_buffer.insert, [{}, {}, {}, {}])), timeout=1)
+
+        assert collection.insert_many.await_count == 2
+
+    async def test_inserting_documents_with_write_error(self) -> None:
+        """Test inserting documents when one of them could not be inserted.
+        """
+        collection: MagicMock = MagicMock()
+        collection.insert_many = AsyncMock(side_effect=BulkWriteError({
+            "writeErrors": [{"index": 1, "code": 11000, "errmsg": "E11000 duplicate key error"}]
+        }))
+        write_buffer: WriteBuffer = WriteBuffer(collection, 0.01, 10)
+
+        results: list = await asyncio.gather(write_buffer.insert({"_id": 1}), write_buffer.insert({"_id": 2}),
+                                             return_exceptions=True
+                                             )
+
+        assert results[0] == 1
+        assert isinstance(results[1], WriteError)
+        assert results[1].code == 11000
+
+    async def test_inserting_documents_with_database_server_error(self) -> None:
+        """Test inserting documents when the bulk insert failed.
+        """
+        collection: MagicMock = MagicMock()
+        collection.insert_many = AsyncMock(side_effect=AutoReconnect("Connection refused"))
+        write_buffer: WriteBuffer = WriteBuffer(collection, 0.01, 10)
+
+        with pytest.raises(AutoReconnect):
+            await write_buffer.insert({})
+
+    async def test_closing_write_buffer(self) -> None:
+        """Test closing a write buffer which flushes all pending inserts.
+        """
+        collection: MagicMock = MagicMock()
+        collection.insert_many = AsyncMock()
+        write_buffer: WriteBuffer = WriteBuffer(collection, 60, 10)
+        insert: asyncio.Task = asyncio.ensure_future(write_buffer.insert({"_id": 1}))
+
+        await asyncio.sleep(0)
+        await write_buffer.close()
+
+        assert await insert == 1